@@ -1,5 +1,6 @@
 #!/bin/bash
-pipenv run scrapy list | xargs -I {} pipenv run scrapy crawl {} -s LOG_ENABLED=False &
+# Run every spider concurrently in one process
+pipenv run scrapy crawlall -s LOG_ENABLED=False &
 
 # Output to the screen every 9 minutes to prevent a travis timeout
 # https://stackoverflow.com/a/40800348
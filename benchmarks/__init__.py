@@ -0,0 +1,27 @@
+"""Offline benchmarks for spiders and shared parsing code, run against the test
+fixtures with ``python -m benchmarks.<module>``.
+"""
+
+import time
+from os.path import dirname, join
+
+from city_scrapers_core.utils import file_response
+
+FILES_DIR = join(dirname(dirname(__file__)), "tests", "files")
+
+
+def fixture_response(file_name, url=None):
+    """Load a fixture from tests/files as a response"""
+    return file_response(join(FILES_DIR, file_name), url=url)
+
+
+def best_time(func, number=10, repeat=5):
+    """Best average seconds per call of func over several repeats"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = (time.perf_counter() - start) / number
+        best = elapsed if best is None else min(best, elapsed)
+    return best
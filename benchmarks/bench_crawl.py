@@ -0,0 +1,121 @@
+"""Load test a full crawl end to end against the mock agency server, reporting items per
+second, the most concurrent requests reached and how long the reactor sat idle.
+
+The server from ``benchmarks.mock_agency`` and ``scrapy crawlall`` with the
+``city_scrapers.settings.mock`` settings are each started in a new process, with state
+like learned throttling limits kept in a temporary directory so every run starts cold.
+Options other than the server's are passed to ``crawlall``::
+
+    python -m benchmarks.bench_crawl --scale 10 --latency 0.5 --error-rate 0.05
+    python -m benchmarks.bench_crawl --bandwidth 256 -- -s AUTOTHROTTLE_START_DELAY=0
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from os.path import dirname, join
+
+ROOT_DIR = dirname(dirname(__file__))
+
+
+def start_server(args):
+    """Start the mock agency server on a free port, returning the process and URL"""
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.mock_agency",
+            "--port",
+            "0",
+            "--scale",
+            str(args.scale),
+            "--latency",
+            str(args.latency),
+            "--bandwidth",
+            str(args.bandwidth),
+            "--error-rate",
+            str(args.error_rate),
+            "--seed",
+            "0",
+        ],
+        cwd=ROOT_DIR,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    line = server.stdout.readline()
+    if not line:
+        sys.exit("Mock agency server failed to start")
+    return server, line.split()[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--bandwidth", type=float, default=0, help="KB/s")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("crawlall_args", nargs="*", help="Arguments for crawlall")
+    args = parser.parse_args()
+
+    server, url = start_server(args)
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            report_path = join(tmp_dir, "report.json")
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "scrapy",
+                    "crawlall",
+                    "-L",
+                    "WARNING",
+                    *args.crawlall_args,
+                ],
+                cwd=ROOT_DIR,
+                env={
+                    **os.environ,
+                    "SCRAPY_SETTINGS_MODULE": "city_scrapers.settings.mock",
+                    "CITY_SCRAPERS_MOCK_AGENCY_URL": url,
+                    "CITY_SCRAPERS_MOCK_AGENCY_REPORT": report_path,
+                    "CITY_SCRAPERS_MOCK_AGENCY_DIR": join(tmp_dir, "state"),
+                },
+            )
+            with open(report_path) as f:
+                report = json.load(f)
+    finally:
+        server.terminate()
+        server_stats = json.loads(server.communicate()[0].strip().splitlines()[-1])
+
+    print(f"{'spider':<32}{'items':>8}  finish reason")
+    for name, spider in sorted(report["spiders"].items()):
+        print(f"{name:<32}{spider['items']:>8}  {spider['finish_reason']}")
+    print()
+    idle = report["reactor_idle_seconds"]
+    for label, value in [
+        ("Items", report["items"]),
+        ("Seconds", report["seconds"]),
+        ("Items/s", report["items_per_sec"]),
+        ("Requests", report["requests"]),
+        ("Download errors", report["exceptions"]),
+        ("Max concurrent requests", report["max_concurrency"]),
+        (
+            "Reactor idle",
+            (
+                "n/a"
+                if idle is None
+                else f"{idle}s ({report['reactor_idle_fraction']:.0%})"
+            ),
+        ),
+        ("Server requests", server_stats["requests"]),
+        ("Server errors injected", server_stats["errors"]),
+        ("Server unknown paths", server_stats["not_found"]),
+        ("Server KB sent", round(server_stats["bytes"] / 1024)),
+    ]:
+        print(f"{label:<32}{value}")
+
+
+if __name__ == "__main__":
+    main()
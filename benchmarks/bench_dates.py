@@ -0,0 +1,49 @@
+"""Compare dateutil with DateParser on PrimeGov and Board of Supervisors dates"""
+
+from datetime import datetime, timedelta
+
+from dateutil.parser import parse
+
+from benchmarks import best_time
+from city_scrapers.dates import DateParser
+from city_scrapers.spiders.losca_Board_of_Supervisors import (
+    LoscaBoardOfSupervisorsSpider,
+)
+
+
+def main():
+    # 15 years of weekly PrimeGov meetings at a few different times of day, about
+    # the number of dates in a multi-year backfill
+    start = datetime(2010, 1, 4, 10)
+    iso_dates = [
+        (start + timedelta(days=7 * week, hours=hour)).isoformat()
+        for week in range(52 * 15)
+        for hour in range(0, 12)
+    ]
+    bos_dates = [
+        (start + timedelta(days=week * 7)).strftime("%A, %B %d, %Y %I:%M %p")
+        for week in range(52 * 15)
+    ]
+    print(f"{'source':<22}{'dates':>7}{'dateutil µs':>13}{'DateParser µs':>15}")
+    for name, dates, parser_factory in [
+        ("PrimeGov ISO", iso_dates, lambda: DateParser(iso=True)),
+        (
+            "Board of Supervisors",
+            bos_dates,
+            lambda: DateParser(*LoscaBoardOfSupervisorsSpider.date_parser.formats),
+        ),
+    ]:
+        dateutil_time = best_time(lambda: [parse(d) for d in dates], number=1)
+        # Use a fresh parser each time so the cache isn't warm between repeats
+        parser_time = best_time(
+            lambda: [p(d) for p in [parser_factory()] for d in dates], number=1
+        )
+        print(
+            f"{name:<22}{len(dates):>7}{dateutil_time / len(dates) * 1e6:>13.2f}"
+            f"{parser_time / len(dates) * 1e6:>15.2f}"
+            f"  ({dateutil_time / parser_time:.0f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
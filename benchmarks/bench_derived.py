@@ -0,0 +1,81 @@
+"""Compare deriving meeting fields with and without caching on a 10k-meeting City
+Council backfill, from parsing through MeetingPipeline and OpenCivicDataPipeline.
+
+Meetings are repeated from the test fixture with a different start time each, so
+times aren't shared between meetings but titles repeat like they do in a backfill.
+"""
+
+import json
+from datetime import datetime, timedelta
+from itertools import cycle, islice
+
+from city_scrapers_core.pipelines import MeetingPipeline
+from city_scrapers_core.pipelines import OpenCivicDataPipeline as BaseOCDPipeline
+from city_scrapers_core.spiders import CityScrapersSpider
+from freezegun import freeze_time
+from scrapy.http import TextResponse
+
+from benchmarks import best_time, fixture_response
+from city_scrapers.mixins import PrimeGovMixin
+from city_scrapers.pipelines import OpenCivicDataPipeline
+from city_scrapers.spiders.losca_City_Council import LoscaCityCouncilSpider
+
+COUNCIL_URL = "https://lacity.primegov.com/api/v2/PublicPortal/ListArchivedMeetings"
+MEETINGS = 10000
+
+# The same spider without DerivedFieldsMixin
+UncachedCouncilSpider = type(
+    "UncachedCouncilSpider",
+    (PrimeGovMixin, CityScrapersSpider),
+    {
+        key: value
+        for key, value in vars(LoscaCityCouncilSpider).items()
+        if not key.startswith("__")
+    },
+)
+
+
+def backfill_response():
+    response = fixture_response("losca_City_Council.json", url=COUNCIL_URL)
+    start = datetime(2010, 1, 4, 10)
+    items = []
+    for idx, item in enumerate(islice(cycle(json.loads(response.body)), MEETINGS)):
+        item = dict(item)
+        item["dateTime"] = (start + timedelta(hours=13 * idx)).isoformat()
+        items.append(item)
+    return TextResponse(url=COUNCIL_URL, body=json.dumps(items).encode())
+
+
+def run(spider, pipelines, response):
+    for item in spider.parse(response):
+        for pipeline in pipelines:
+            item = pipeline.process_item(item, spider)
+
+
+def main():
+    response = backfill_response()
+    print(f"{'fields':<10}{'meetings':>10}{'ms':>10}{'µs/meeting':>12}")
+    results = {}
+    for name, spidercls, ocd_pipeline_cls in [
+        ("uncached", UncachedCouncilSpider, BaseOCDPipeline),
+        ("cached", LoscaCityCouncilSpider, OpenCivicDataPipeline),
+    ]:
+        with freeze_time("2024-09-30", tick=True):
+            # Use a fresh spider and pipelines each time so caches aren't warm
+            # between repeats
+            seconds = best_time(
+                lambda: run(
+                    spidercls(), [MeetingPipeline(), ocd_pipeline_cls()], response
+                ),
+                number=1,
+            )
+        results[name] = seconds
+        print(
+            f"{name:<10}{MEETINGS:>10}{seconds * 1000:>10.0f}"
+            f"{seconds / MEETINGS * 1e6:>12.1f}"
+        )
+    print(f"Saved {1 - results['cached'] / results['uncached']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Compare per-row field extraction with .css() calls against RowExtractor"""
+
+from benchmarks import best_time, fixture_response
+from city_scrapers.spiders.losca_Board_of_Supervisors import (
+    LoscaBoardOfSupervisorsSpider,
+)
+from city_scrapers.spiders.losca_Housing_Authority import LoscaHousingAuthoritySpider
+
+
+def bos_css(rows):
+    for row in rows:
+        row.css(".card-title::text").get()
+        row.css(".calendar-date time::text").get()
+        row.css(".clock-time time::text").get()
+        for link in row.css("a"):
+            link.css("span::text").get()
+            link.css("::attr(href)").get()
+
+
+def bos_extractor(rows):
+    for row in rows:
+        LoscaBoardOfSupervisorsSpider.meeting_extractor.extract(row)
+
+
+def hacla_css(rows):
+    for row in rows:
+        row.css(".views-field-title .field-content::text").get()
+        for selector in [
+            ".views-field-field-action-minutes a",
+            ".views-field-field-audio a",
+        ]:
+            for link in row.css(selector):
+                link.css("::text").get()
+                link.css("::attr(href)").get()
+
+
+def hacla_extractor(rows):
+    for row in rows:
+        LoscaHousingAuthoritySpider.title_extractor.extract(row)
+        LoscaHousingAuthoritySpider.links_extractor.extract(row)
+
+
+def main():
+    bos_rows = fixture_response("losca_Board_of_Supervisors.html").css(
+        ".upcoming-meeting"
+    )
+    hacla_rows = fixture_response("losca_Housing_Authority.html").css(
+        ".views-element-container .views-row"
+    )
+    print(f"{'fixture':<30}{'rows':>6}{'css µs/row':>14}{'compiled µs/row':>18}")
+    for name, rows, css_func, extractor_func in [
+        ("losca_Board_of_Supervisors", bos_rows, bos_css, bos_extractor),
+        ("losca_Housing_Authority", hacla_rows, hacla_css, hacla_extractor),
+    ]:
+        css_time = best_time(lambda: css_func(rows)) / len(rows) * 1e6
+        extractor_time = best_time(lambda: extractor_func(rows)) / len(rows) * 1e6
+        print(
+            f"{name:<30}{len(rows):>6}{css_time:>14.1f}{extractor_time:>18.1f}"
+            f"  ({css_time / extractor_time:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
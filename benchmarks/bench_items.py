@@ -0,0 +1,69 @@
+"""Compare memory held by scraped meetings with plain dict locations and links against
+compact items, keeping every meeting from enlarged fixtures like a backfill would.
+
+Memory is measured with tracemalloc as the size of the kept meetings, not including
+the responses they're parsed from.
+"""
+
+import gc
+import tracemalloc
+
+from freezegun import freeze_time
+from scrapy.utils.test import get_crawler
+
+from benchmarks import best_time
+from benchmarks.bench_spiders import CASES
+
+CASE_NAMES = [
+    "losca_City_Council_10k",
+    "losca_Health_Commission_10k",
+    "losca_Housing_Authority_x100",
+]
+
+
+def parse_meetings(spidercls, response, compact):
+    crawler = get_crawler(
+        spidercls, settings_dict={"CITY_SCRAPERS_COMPACT_ITEMS": compact}
+    )
+    return list(spidercls.from_crawler(crawler).parse(response))
+
+
+def measure(spidercls, response, frozen_date, compact):
+    """Memory held by parsed meetings in bytes and seconds to parse them"""
+    with freeze_time(frozen_date, tick=True):
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        meetings = parse_meetings(spidercls, response, compact)
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        seconds = best_time(
+            lambda: parse_meetings(spidercls, response, compact), number=1, repeat=3
+        )
+    return len(meetings), size, seconds
+
+
+def main():
+    print(
+        f"{'case':<32}{'items':>7}{'dict KB':>10}{'compact KB':>12}{'saved':>7}"
+        f"{'dict ms':>9}{'compact ms':>12}"
+    )
+    for name in CASE_NAMES:
+        spidercls, factory, args, frozen_date = CASES[name]
+        response = factory(*args)
+        items, dict_size, dict_seconds = measure(
+            spidercls, response, frozen_date, False
+        )
+        _, compact_size, compact_seconds = measure(
+            spidercls, response, frozen_date, True
+        )
+        print(
+            f"{name:<32}{items:>7}{dict_size / 1024:>10.0f}{compact_size / 1024:>12.0f}"
+            f"{1 - compact_size / dict_size:>7.0%}{dict_seconds * 1000:>9.0f}"
+            f"{compact_seconds * 1000:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
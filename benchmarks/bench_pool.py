@@ -0,0 +1,101 @@
+"""Compare parsing responses inline on the reactor thread against parsing them in a
+process pool with ``in_process_pool``, measuring worker start-up and pickling costs.
+
+For each case this reports:
+
+- inline: parsing the response in the current process
+- cold: the first response sent to a new single-worker pool, including spawning the
+  worker and importing the spider there
+- warm: each response sent to a worker that's already running
+- pickle: pickling the response to send it and unpickling the items sent back, which
+  is the work left in the crawling process (holding the GIL) when the pool is used
+
+::
+
+    python -m benchmarks.bench_pool
+"""
+
+import multiprocessing
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from freezegun import freeze_time
+
+from benchmarks import best_time
+from benchmarks.bench_spiders import CASES
+from city_scrapers.pool import get_response_args, get_spider_state, parse_in_worker
+
+CASE_NAMES = [
+    "losca_Board_of_Supervisors",
+    "losca_Housing_Authority",
+    "losca_Housing_Authority_x10",
+]
+
+
+def frozen_parse_in_worker(frozen_date, *args):
+    """Run parse_in_worker with time frozen, like the inline parse"""
+    with freeze_time(frozen_date, tick=True):
+        return parse_in_worker(*args)
+
+
+def run_case(name):
+    spidercls, factory, args, frozen_date = CASES[name]
+    response = factory(*args)
+    spider = spidercls()
+    worker_args = (
+        frozen_date,
+        spidercls,
+        get_spider_state(spider),
+        "parse",
+        get_response_args(response),
+        {},
+    )
+
+    with freeze_time(frozen_date, tick=True):
+        inline = best_time(lambda: list(spider.parse(response)), number=5)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        1, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        results = executor.submit(frozen_parse_in_worker, *worker_args).result()
+        cold = time.perf_counter() - start
+        warm = best_time(
+            lambda: executor.submit(frozen_parse_in_worker, *worker_args).result(),
+            number=5,
+        )
+
+    sent = pickle.dumps(worker_args)
+    received = pickle.dumps(results)
+    pickle_time = best_time(lambda: pickle.dumps(worker_args)) + best_time(
+        lambda: pickle.loads(received)
+    )
+    return {
+        "items": len(results),
+        "sent_kb": len(sent) / 1024,
+        "received_kb": len(received) / 1024,
+        "inline": inline,
+        "cold": cold,
+        "warm": warm,
+        "pickle": pickle_time,
+    }
+
+
+def main():
+    print(
+        f"{'case':<32}{'items':>7}{'sent KB':>9}{'recv KB':>9}{'inline ms':>11}"
+        f"{'cold ms':>9}{'warm ms':>9}{'pickle ms':>11}"
+    )
+    for name in CASE_NAMES:
+        result = run_case(name)
+        print(
+            f"{name:<32}{result['items']:>7}{result['sent_kb']:>9.0f}"
+            f"{result['received_kb']:>9.0f}{result['inline'] * 1000:>11.2f}"
+            f"{result['cold'] * 1000:>9.0f}{result['warm'] * 1000:>9.2f}"
+            f"{result['pickle'] * 1000:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""Measure parse throughput of each spider against its test fixture and against
+synthetically enlarged fixtures.
+
+Each case runs in a fresh process so its peak RSS isn't affected by earlier cases.
+Results are compared against ``benchmarks/baseline.json`` if it exists, and saved to it
+with ``--save``::
+
+    python -m benchmarks.bench_spiders
+    python -m benchmarks.bench_spiders --save
+    python -m benchmarks.bench_spiders --case losca_Housing_Authority
+"""
+
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+from copy import deepcopy
+from itertools import cycle, islice
+from os.path import dirname, exists, join
+
+from freezegun import freeze_time
+from lxml import etree
+from scrapy.http import HtmlResponse, TextResponse
+
+from benchmarks import best_time, fixture_response
+from city_scrapers.extract import compile_css
+from city_scrapers.spiders.losca_Board_of_ed import LoscaBoardOfEdSpider
+from city_scrapers.spiders.losca_Board_of_Supervisors import (
+    LoscaBoardOfSupervisorsSpider,
+)
+from city_scrapers.spiders.losca_City_Council import LoscaCityCouncilSpider
+from city_scrapers.spiders.losca_Health_Commission import LoscaHealthCommissionSpider
+from city_scrapers.spiders.losca_Housing_Authority import LoscaHousingAuthoritySpider
+
+BASELINE_PATH = join(dirname(__file__), "baseline.json")
+
+# Minimum seconds to spend timing each repeat of a case
+MIN_TIME = 0.2
+
+BOS_URL = "https://bos.lacounty.gov/board-meeting-agendas/"
+BOARD_OF_ED_URL = "https://www.lausd.org/site/RSS.aspx?DomainID=1057&ModuleInstanceID=73805&PageID=18628&PMIID=0"  # noqa
+COUNCIL_URL = "https://lacity.primegov.com/api/v2/PublicPortal/ListUpcomingMeetings"
+HEALTH_URL = "https://lacity.primegov.com/api/v2/PublicPortal/ListArchivedMeetings?year=2024"  # noqa
+HACLA_URL = "https://www.hacla.org/en/bocfiles"
+
+
+def repeat_rows(response, row_css, copies):
+    """HTML response with the rows matching a selector repeated in their container"""
+    if copies == 1:
+        return response
+    root = response.selector.root
+    rows = compile_css(row_css)(root)
+    container = rows[0].getparent()
+    for _ in range(copies - 1):
+        container.extend(deepcopy(row) for row in rows)
+    body = etree.tostring(root.getroottree(), method="html", encoding="utf-8")
+    return HtmlResponse(url=response.url, body=body, encoding="utf-8")
+
+
+def bos_response(copies=1):
+    """Board of Supervisors page with its meetings repeated"""
+    response = fixture_response("losca_Board_of_Supervisors.html", url=BOS_URL)
+    return repeat_rows(response, ".upcoming-meeting", copies)
+
+
+def hacla_response(copies=1):
+    """HACLA page with its meeting rows repeated"""
+    response = fixture_response("losca_Housing_Authority.html", url=HACLA_URL)
+    return repeat_rows(response, ".views-element-container .views-row", copies)
+
+
+def board_of_ed_response(copies=1):
+    """LAUSD RSS feed with its items repeated"""
+    response = fixture_response("losca_Board_of_ed.html", url=BOARD_OF_ED_URL)
+    if copies == 1:
+        return response
+    root = etree.fromstring(response.body)
+    channel = root.find("channel")
+    items = channel.findall("item")
+    for _ in range(copies - 1):
+        channel.extend(deepcopy(item) for item in items)
+    body = etree.tostring(root, xml_declaration=True, encoding="utf-8")
+    return HtmlResponse(url=BOARD_OF_ED_URL, body=body, encoding="utf-8")
+
+
+def primegov_response(file_name, url, meetings=None):
+    """PrimeGov API response with its meetings repeated up to a number of meetings"""
+    response = fixture_response(file_name, url=url)
+    if meetings is None:
+        return response
+    items = json.loads(response.body)
+    body = json.dumps(list(islice(cycle(items), meetings))).encode()
+    return TextResponse(url=url, body=body, encoding="utf-8")
+
+
+# Case name: (spider class, response factory, factory args, frozen date). Enlarged
+# HACLA pages are frozen before every row's date so the whole page is parsed.
+CASES = {
+    "losca_Board_of_Supervisors": (
+        LoscaBoardOfSupervisorsSpider,
+        fixture_response,
+        ("losca_Board_of_Supervisors.html", BOS_URL),
+        "2024-09-17",
+    ),
+    "losca_Board_of_Supervisors_x10": (
+        LoscaBoardOfSupervisorsSpider,
+        bos_response,
+        (10,),
+        "2024-09-17",
+    ),
+    "losca_Board_of_ed": (
+        LoscaBoardOfEdSpider,
+        board_of_ed_response,
+        (),
+        "2024-09-19",
+    ),
+    "losca_Board_of_ed_x100": (
+        LoscaBoardOfEdSpider,
+        board_of_ed_response,
+        (100,),
+        "2024-09-19",
+    ),
+    "losca_Board_of_ed_x1000": (
+        LoscaBoardOfEdSpider,
+        board_of_ed_response,
+        (1000,),
+        "2024-09-19",
+    ),
+    "losca_City_Council": (
+        LoscaCityCouncilSpider,
+        primegov_response,
+        ("losca_City_Council.json", COUNCIL_URL),
+        "2024-09-30",
+    ),
+    "losca_City_Council_10k": (
+        LoscaCityCouncilSpider,
+        primegov_response,
+        ("losca_City_Council.json", COUNCIL_URL, 10000),
+        "2024-09-30",
+    ),
+    "losca_Health_Commission": (
+        LoscaHealthCommissionSpider,
+        primegov_response,
+        ("losca_Health_Commission.json", HEALTH_URL),
+        "2024-10-22",
+    ),
+    "losca_Health_Commission_10k": (
+        LoscaHealthCommissionSpider,
+        primegov_response,
+        ("losca_Health_Commission.json", HEALTH_URL, 10000),
+        "2024-10-22",
+    ),
+    "losca_Housing_Authority": (
+        LoscaHousingAuthoritySpider,
+        hacla_response,
+        (),
+        "2025-01-08",
+    ),
+    "losca_Housing_Authority_x10": (
+        LoscaHousingAuthoritySpider,
+        hacla_response,
+        (10,),
+        "2000-01-01",
+    ),
+    "losca_Housing_Authority_x100": (
+        LoscaHousingAuthoritySpider,
+        hacla_response,
+        (100,),
+        "2000-01-01",
+    ),
+}
+
+
+def peak_rss_mb():
+    """Peak resident set size of the current process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_case(name):
+    """Time parsing a case's response, returning a dict of results"""
+    spidercls, factory, args, frozen_date = CASES[name]
+    response = factory(*args)
+    spider = spidercls()
+
+    def parse():
+        # Copied so text, selectors and JSON cached on the response aren't reused
+        return list(spider.parse(response.replace()))
+
+    # Ticking so that timers still advance
+    with freeze_time(frozen_date, tick=True):
+        items = len(parse())
+        once = best_time(parse, number=1, repeat=1)
+        number = max(1, int(MIN_TIME / once))
+        seconds = best_time(parse, number=number)
+    return {
+        "items": items,
+        "bytes": len(response.body),
+        "ms_per_response": round(seconds * 1000, 3),
+        "items_per_sec": round(items / seconds),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def compare(result, baseline, threshold):
+    """Describe the change in time per response from the baseline"""
+    if not baseline:
+        return ""
+    change = result["ms_per_response"] / baseline["ms_per_response"] - 1
+    flag = "  REGRESSION" if change > threshold else ""
+    return f"{change:+.0%}{flag}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--case", action="append", choices=sorted(CASES), help="Case to run"
+    )
+    parser.add_argument("--save", action="store_true", help="Save results as baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Fraction slower than the baseline to report as a regression",
+    )
+    args = parser.parse_args()
+
+    baseline = {}
+    if exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+
+    names = args.case or list(CASES)
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    print(
+        f"{'case':<32}{'items':>7}{'KB':>8}{'ms/resp':>10}{'items/s':>10}"
+        f"{'RSS MB':>8}  vs baseline"
+    )
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        for name in names:
+            result = pool.apply(run_case, (name,))
+            results[name] = result
+            print(
+                f"{name:<32}{result['items']:>7}{result['bytes'] / 1024:>8.0f}"
+                f"{result['ms_per_response']:>10.2f}{result['items_per_sec']:>10.0f}"
+                f"{result['peak_rss_mb']:>8.1f}  "
+                + compare(result, baseline.get(name), args.threshold)
+            )
+
+    if args.save:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump({**baseline, **results}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Saved baseline to {BASELINE_PATH}")
+    elif any(
+        compare(result, baseline.get(name), args.threshold).endswith("REGRESSION")
+        for name, result in results.items()
+    ):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Compare startup time of ``scrapy list`` and ``scrapy crawl`` for one spider with
+Scrapy's SpiderLoader, which imports every spider, against ManifestSpiderLoader as the
+number of spiders grows.
+
+Larger projects are simulated by copying each spider in city_scrapers/spiders under new
+names into a temporary package. Crawls disable HTTP downloads so they finish as soon as
+the spider's first requests fail, and each command is timed in a new process::
+
+    python -m benchmarks.bench_startup
+"""
+
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from glob import glob
+from os.path import basename, dirname, join
+
+from city_scrapers.spiderloader import update_manifest
+
+ROOT_DIR = dirname(dirname(__file__))
+SPIDERS_DIR = join(ROOT_DIR, "city_scrapers", "spiders")
+
+LOADERS = {
+    "scrapy": "scrapy.spiderloader.SpiderLoader",
+    "manifest": "city_scrapers.spiderloader.ManifestSpiderLoader",
+}
+COPIES = [1, 10, 40, 100]
+CRAWL_SPIDER = "losca_Board_of_Supervisors_0"
+
+
+def create_package(path, package, copies):
+    """Create a package with copies of every spider, returning the number of spiders"""
+    os.makedirs(join(path, package))
+    open(join(path, package, "__init__.py"), "w").close()
+    count = 0
+    for spider_path in glob(join(SPIDERS_DIR, "losca_*.py")):
+        spider_name = basename(spider_path)[:-3]
+        with open(spider_path) as f:
+            source = f.read()
+        for idx in range(copies):
+            with open(join(path, package, f"{spider_name}_{idx}.py"), "w") as f:
+                f.write(
+                    re.sub(
+                        r'^    name = "(\w+)"',
+                        rf'    name = "\1_{idx}"',
+                        source,
+                        flags=re.M,
+                    )
+                )
+            count += 1
+    update_manifest(package)
+    return count
+
+
+def run_scrapy(path, args, package, loader, repeat=5):
+    """Best wall-clock seconds to run a scrapy command in a new process"""
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([ROOT_DIR, path]),
+        "SCRAPY_SETTINGS_MODULE": "city_scrapers.settings.base",
+    }
+    command = [
+        sys.executable,
+        "-m",
+        "scrapy",
+        *args,
+        "-s",
+        f"SPIDER_MODULES={package}",
+        "-s",
+        f"SPIDER_LOADER_CLASS={LOADERS[loader]}",
+        "-s",
+        "LOG_ENABLED=False",
+    ]
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=path, env=env, check=True, capture_output=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    commands = {
+        "list": ["list"],
+        "crawl": [
+            "crawl",
+            CRAWL_SPIDER,
+            "-s",
+            "ROBOTSTXT_OBEY=False",
+            "-s",
+            'DOWNLOAD_HANDLERS={"http": null, "https": null}',
+        ],
+    }
+    print(
+        f"{'spiders':>8}{'command':>9}{'scrapy ms':>11}{'manifest ms':>13}{'saved':>7}"
+    )
+    with tempfile.TemporaryDirectory() as path:
+        sys.path.insert(0, path)
+        for copies in COPIES:
+            package = f"bench_spiders_{copies}"
+            count = create_package(path, package, copies)
+            for command, args in commands.items():
+                times = {
+                    loader: run_scrapy(path, args, package, loader)
+                    for loader in LOADERS
+                }
+                print(
+                    f"{count:>8}{command:>9}{times['scrapy'] * 1000:>11.0f}"
+                    f"{times['manifest'] * 1000:>13.0f}"
+                    f"{1 - times['manifest'] / times['scrapy']:>7.0%}"
+                )
+
+
+if __name__ == "__main__":
+    main()
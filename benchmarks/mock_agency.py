@@ -0,0 +1,189 @@
+"""Local server standing in for the agency sites scraped by ``city_scrapers.spiders``,
+for load testing crawls end to end without requesting the real sites.
+
+Pages are served at each spider's real URL paths from the test fixtures, with their
+meetings repeated ``--scale`` times using the same factories as ``bench_spiders``.
+Responses can be delayed, sent at a limited bandwidth or replaced with errors. Crawls
+are pointed at the server with the ``city_scrapers.settings.mock`` settings, which send
+every request through it as an HTTP proxy with ``MockAgencyMiddleware`` and log a
+report with ``LoadReportExtension``::
+
+    python -m benchmarks.mock_agency --port 8600 --scale 10 --latency 0.2
+    CITY_SCRAPERS_MOCK_AGENCY_URL=http://127.0.0.1:8600 \\
+        SCRAPY_SETTINGS_MODULE=city_scrapers.settings.mock scrapy crawlall
+
+``python -m benchmarks.bench_crawl`` runs both and reports the results. Spiders with a
+cutoff relative to today, like ``losca_Housing_Authority``, stop at fixture meetings
+that have since fallen past it and may scrape no items.
+"""
+
+import argparse
+import json
+import random
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from twisted.internet import reactor
+from twisted.web.resource import Resource
+from twisted.web.server import NOT_DONE_YET, Site
+
+from benchmarks import fixture_response
+from benchmarks.bench_spiders import (
+    COUNCIL_URL,
+    HEALTH_URL,
+    board_of_ed_response,
+    bos_response,
+    hacla_response,
+    primegov_response,
+)
+
+ROBOTS_TXT = b"User-agent: *\nDisallow:\n"
+PRIMEGOV_PATH = "/api/v2/PublicPortal/"
+# Seconds between chunks of a response sent at a limited bandwidth
+SEND_INTERVAL = 0.05
+
+Routes = Dict[Tuple[str, str], Tuple[bytes, bytes]]
+
+
+def get_routes(scale: int = 1) -> Routes:
+    """Content type and body by host and path of each page requested by the spiders,
+    with query strings ignored
+    """
+    council = primegov_body("losca_City_Council.json", COUNCIL_URL, scale)
+    health = primegov_body("losca_Health_Commission.json", HEALTH_URL, scale)
+    html = b"text/html; charset=utf-8"
+    json_type = b"application/json; charset=utf-8"
+    return {
+        ("bos.lacounty.gov", "/board-meeting-agendas/"): (
+            html,
+            bos_response(scale).body,
+        ),
+        ("www.lausd.org", "/site/RSS.aspx"): (
+            b"application/rss+xml; charset=utf-8",
+            board_of_ed_response(scale).body,
+        ),
+        ("www.hacla.org", "/en/bocfiles"): (html, hacla_response(scale).body),
+        ("lacity.primegov.com", PRIMEGOV_PATH + "ListUpcomingMeetings"): (
+            json_type,
+            council,
+        ),
+        ("lacity.primegov.com", PRIMEGOV_PATH + "ListArchivedMeetings"): (
+            json_type,
+            health,
+        ),
+        (
+            "lacity.primegov.com",
+            PRIMEGOV_PATH + "ListArchivedMeetingsByCommitteeId",
+        ): (json_type, health),
+    }
+
+
+def primegov_body(file_name: str, url: str, scale: int) -> bytes:
+    meetings = len(json.loads(fixture_response(file_name).body))
+    return primegov_response(file_name, url, meetings * scale).body
+
+
+class MockAgencyResource(Resource):
+    """Resource serving every route, as a proxy sent absolute URLs or as a server
+    sent the route's host in the Host header. Each response is delayed by ``latency``
+    seconds and sent at ``bandwidth`` bytes per second if set, and ``error_rate`` of
+    requests are answered with ``error_status`` instead.
+    """
+
+    isLeaf = True
+
+    def __init__(
+        self,
+        routes: Routes,
+        latency: float = 0.0,
+        bandwidth: int = 0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: Optional[int] = None,
+        clock=reactor,
+    ):
+        super().__init__()
+        self.routes = routes
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.clock = clock
+        self.stats = {"requests": 0, "errors": 0, "not_found": 0, "bytes": 0}
+
+    def render(self, request):
+        url = urlparse(request.uri.decode("latin-1"))
+        host = url.hostname or request.getRequestHostname().decode("latin-1")
+        self.stats["requests"] += 1
+        if self.random.random() < self.error_rate:
+            self.stats["errors"] += 1
+            status, content_type, body = self.error_status, b"text/plain", b""
+        elif url.path == "/robots.txt":
+            status, content_type, body = 200, b"text/plain", ROBOTS_TXT
+        elif (host, url.path) in self.routes:
+            status = 200
+            content_type, body = self.routes[(host, url.path)]
+        else:
+            self.stats["not_found"] += 1
+            status, content_type, body = 404, b"text/plain", b""
+        request.setResponseCode(status)
+        request.setHeader(b"Content-Type", content_type)
+        request.setHeader(b"Content-Length", str(len(body)).encode())
+        self.clock.callLater(self.latency, self._send, request, body)
+        return NOT_DONE_YET
+
+    def _send(self, request, body: bytes):
+        if request.channel is None:
+            # The client disconnected
+            return
+        size = int(self.bandwidth * SEND_INTERVAL) if self.bandwidth else len(body)
+        chunk, rest = body[: max(size, 1)], body[max(size, 1) :]
+        request.write(chunk)
+        self.stats["bytes"] += len(chunk)
+        if rest:
+            self.clock.callLater(SEND_INTERVAL, self._send, request, rest)
+        else:
+            request.finish()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8600, help="0 for any free port")
+    parser.add_argument(
+        "--scale", type=int, default=1, help="Times to repeat each page's meetings"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds before each response"
+    )
+    parser.add_argument(
+        "--bandwidth", type=float, default=0, help="KB/s per response, 0 for no limit"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of requests to fail"
+    )
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--seed", type=int, help="Random seed for errors")
+    args = parser.parse_args()
+
+    resource = MockAgencyResource(
+        get_routes(args.scale),
+        latency=args.latency,
+        bandwidth=int(args.bandwidth * 1024),
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+    )
+    port = reactor.listenTCP(args.port, Site(resource), interface="127.0.0.1")
+    print(
+        f"Serving mock agencies at http://127.0.0.1:{port.getHost().port}", flush=True
+    )
+    # Server counts are printed as JSON when stopped
+    reactor.addSystemEventTrigger(
+        "before", "shutdown", lambda: print(json.dumps(resource.stats), flush=True)
+    )
+    reactor.run()
+
+
+if __name__ == "__main__":
+    main()
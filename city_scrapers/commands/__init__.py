@@ -0,0 +1,2 @@
+# Scrapy only reads commands from a single COMMANDS_MODULE, so the commands from
+# city_scrapers_core are subclassed here alongside the project's own commands
@@ -0,0 +1,45 @@
+from scrapy.exceptions import UsageError
+
+
+def add_cache_options(parser):
+    """Add --record and --replay options for running against the HTTP cache"""
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="cache responses, reusing ones cached within HTTPCACHE_EXPIRATION_SECS",
+    )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="run offline against cached responses, ignoring uncached requests",
+    )
+
+
+def set_cache_mode(settings, opts):
+    """Update settings for the cache mode selected in the command's options"""
+    if opts.record and opts.replay:
+        raise UsageError("--record and --replay can't be used together")
+    if not (opts.record or opts.replay):
+        return
+    for name, value in [
+        ("HTTPCACHE_ENABLED", True),
+        # Full responses are needed to parse them again, so conditional requests are
+        # disabled and any 304 responses aren't cached
+        ("CITY_SCRAPERS_CONDITIONAL_ENABLED", False),
+        (
+            "HTTPCACHE_IGNORE_HTTP_CODES",
+            sorted({*settings.getlist("HTTPCACHE_IGNORE_HTTP_CODES"), 304}),
+        ),
+    ]:
+        settings.set(name, value, priority="cmdline")
+    if opts.replay:
+        for name, value in [
+            ("HTTPCACHE_IGNORE_MISSING", True),
+            ("HTTPCACHE_EXPIRATION_SECS", 0),
+            # Nothing is downloaded, so there's no need to throttle requests or stop
+            # requesting hosts that failed while online
+            ("AUTOTHROTTLE_ENABLED", False),
+            ("DOWNLOAD_DELAY", 0),
+            ("CITY_SCRAPERS_CIRCUIT_BREAKER_ENABLED", False),
+        ]:
+            settings.set(name, value, priority="cmdline")
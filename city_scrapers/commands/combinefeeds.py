@@ -0,0 +1,5 @@
+from city_scrapers_core.commands import combinefeeds
+
+
+class Command(combinefeeds.Command):
+    pass
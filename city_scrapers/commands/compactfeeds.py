@@ -0,0 +1,114 @@
+import os
+from typing import List
+
+from scrapy.commands import ScrapyCommand
+from scrapy.exceptions import UsageError
+
+from city_scrapers.exporters import meeting_schema
+
+FORMATS = {".parquet": "parquet", ".arrow": "ipc"}
+
+
+class Command(ScrapyCommand):
+    requires_project = True
+
+    def syntax(self):
+        return "[options] <file or directory> ..."
+
+    def short_desc(self):
+        return (
+            "Merge Parquet or Arrow feeds into a dataset partitioned by spider and year"
+        )
+
+    def add_options(self, parser):
+        ScrapyCommand.add_options(self, parser)
+        parser.add_argument(
+            "-o",
+            "--output",
+            dest="output",
+            metavar="DIR",
+            help="directory of the partitioned Parquet dataset to write to",
+        )
+
+    def run(self, args, opts):
+        if not args or not opts.output:
+            raise UsageError()
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+
+        self.pa = pa
+        self.ds = ds
+        self.schema = meeting_schema()
+        self.partitioning = ds.partitioning(
+            pa.schema([("spider", pa.string()), ("year", pa.int32())]), flavor="hive"
+        )
+        paths = self.get_feed_paths(args, opts.output)
+        if not paths:
+            raise UsageError("No .parquet or .arrow feeds found", print_help=False)
+        # Files are sorted by path so meetings from later daily feeds replace earlier
+        # versions of the same meeting
+        feeds = [self.ds.dataset(path, format=FORMATS[ext]) for path, ext in paths]
+        spiders = set()
+        for feed in feeds:
+            spiders.update(feed.to_table(columns=["spider"])["spider"].to_pylist())
+
+        # Each spider is merged separately to limit how much is held in memory, and
+        # is merged with what's already in the output so earlier meetings are kept
+        for spider in sorted(filter(None, spiders)):
+            spider_filter = ds.field("spider") == spider
+            tables = [self.read_existing(opts.output, spider_filter)]
+            tables.extend(
+                feed.to_table(filter=spider_filter).cast(self.schema) for feed in feeds
+            )
+            table = self.dedupe(pa.concat_tables(tables))
+            table = table.append_column(
+                "year", pc.year(table["start"]).cast(pa.int32())
+            )
+            ds.write_dataset(
+                table,
+                opts.output,
+                format="parquet",
+                partitioning=self.partitioning,
+                existing_data_behavior="delete_matching",
+                basename_template="part-{i}.parquet",
+            )
+            print(f"{spider}: {table.num_rows} meetings")
+
+    def get_feed_paths(self, args: List[str], output: str) -> List[tuple]:
+        """Get paths and extensions of feeds from files and directories, excluding
+        the output dataset
+        """
+        output = os.path.join(os.path.abspath(output), "")
+        paths = []
+        for arg in args:
+            if os.path.isdir(arg):
+                files = [
+                    os.path.join(root, filename)
+                    for root, _, filenames in os.walk(arg)
+                    for filename in filenames
+                ]
+            else:
+                files = [arg]
+            for path in files:
+                ext = os.path.splitext(path)[1]
+                if ext in FORMATS and not os.path.abspath(path).startswith(output):
+                    paths.append((path, ext))
+        return sorted(paths)
+
+    def read_existing(self, output: str, spider_filter):
+        if not os.path.isdir(output):
+            return self.schema.empty_table()
+        existing = self.ds.dataset(
+            output, format="parquet", partitioning=self.partitioning
+        )
+        return existing.to_table(columns=self.schema.names, filter=spider_filter).cast(
+            self.schema
+        )
+
+    def dedupe(self, table):
+        """Keep the last row for each meeting ID, along with every row without one"""
+        last_rows = {}
+        for idx, meeting_id in enumerate(table["id"].to_pylist()):
+            last_rows[idx if meeting_id is None else meeting_id] = idx
+        return table.take(sorted(last_rows.values()))
@@ -0,0 +1,13 @@
+from scrapy.commands import crawl
+
+from ._httpcache import add_cache_options, set_cache_mode
+
+
+class Command(crawl.Command):
+    def add_options(self, parser):
+        crawl.Command.add_options(self, parser)
+        add_cache_options(parser)
+
+    def process_options(self, args, opts):
+        crawl.Command.process_options(self, args, opts)
+        set_cache_mode(self.settings, opts)
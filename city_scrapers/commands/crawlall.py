@@ -0,0 +1,170 @@
+import json
+import logging
+from collections import Counter
+
+from scrapy import signals
+from scrapy.commands import BaseRunSpiderCommand
+from scrapy.exceptions import UsageError
+from scrapy.utils.misc import load_object
+from twisted.python.failure import Failure
+
+from ..exporters import ArrowItemExporter
+from ._httpcache import add_cache_options, set_cache_mode
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseRunSpiderCommand):
+    requires_project = True
+
+    def syntax(self):
+        return "[options] [<spider> ...]"
+
+    def short_desc(self):
+        return "Run all spiders (or the ones given) concurrently in one process"
+
+    def long_desc(self):
+        return (
+            "Run all spiders (or the ones given) concurrently in one process. "
+            "Arguments given with -a are passed to every spider."
+        )
+
+    def add_options(self, parser):
+        BaseRunSpiderCommand.add_options(self, parser)
+        parser.add_argument(
+            "--max-requests",
+            dest="max_requests",
+            type=int,
+            metavar="N",
+            help="cap on concurrent requests across all spiders",
+        )
+        parser.add_argument(
+            "--max-requests-per-domain",
+            dest="max_requests_per_domain",
+            type=int,
+            metavar="N",
+            help="cap on concurrent requests to one domain across all spiders",
+        )
+        parser.add_argument(
+            "--status-file",
+            dest="status_file",
+            metavar="FILE",
+            help="write the finish status of each spider to FILE as JSON",
+        )
+        add_cache_options(parser)
+
+    def process_options(self, args, opts):
+        BaseRunSpiderCommand.process_options(self, args, opts)
+        set_cache_mode(self.settings, opts)
+        if opts.max_requests is not None:
+            self.settings.set(
+                "CITY_SCRAPERS_MAX_CONCURRENT_REQUESTS",
+                opts.max_requests,
+                priority="cmdline",
+            )
+        if opts.max_requests_per_domain is not None:
+            self.settings.set(
+                "CITY_SCRAPERS_MAX_CONCURRENT_REQUESTS_PER_DOMAIN",
+                opts.max_requests_per_domain,
+                priority="cmdline",
+            )
+        # Every spider shares the same settings, so feeds need to be templated by
+        # spider name to keep each spider's output separate
+        exporters = self.settings.getwithbase("FEED_EXPORTERS")
+        for feed_uri, feed_options in self.settings.getdict("FEEDS").items():
+            if "%(name)s" not in str(feed_uri):
+                raise UsageError(
+                    f"Feed URI {feed_uri} must include %(name)s when running multiple "
+                    "spiders",
+                    print_help=False,
+                )
+            # Arrow and Parquet files are corrupted by appending another run's output
+            exporter = exporters.get(feed_options.get("format"))
+            if (
+                exporter
+                and issubclass(load_object(exporter), ArrowItemExporter)
+                and not feed_options.get("overwrite")
+            ):
+                raise UsageError(
+                    f"Feed URI {feed_uri} must set overwrite to True (or use -O) for "
+                    f"the {feed_options['format']} format",
+                    print_help=False,
+                )
+
+    def run(self, args, opts):
+        spider_list = self.crawler_process.spider_loader.list()
+        unknown = [spider for spider in args if spider not in spider_list]
+        if unknown:
+            raise UsageError(f"Unknown spiders: {', '.join(unknown)}", print_help=False)
+        spiders = args or spider_list
+        self._set_primegov_archive_mode(spiders)
+        crawlers = {}
+        # Errors are counted from each crawler's signals because log_count/ERROR is
+        # shared by every crawler logging in the same process
+        self.error_counts = Counter()
+        for spider in spiders:
+            crawler = self.crawler_process.create_crawler(spider)
+            for signal in [signals.spider_error, signals.item_error]:
+                crawler.signals.connect(self._count_error, signal=signal)
+            crawlers[spider] = (
+                crawler,
+                self.crawler_process.crawl(crawler, **opts.spargs),
+            )
+        self.crawler_process.start()
+
+        statuses = {
+            spider: self._get_status(spider, crawler, crawl_defer)
+            for spider, (crawler, crawl_defer) in crawlers.items()
+        }
+        for spider, status in statuses.items():
+            log = logger.info if status["ok"] else logger.error
+            log(f"{spider}: {status['finish_reason']} ({status['item_count']} items)")
+        if opts.status_file:
+            with open(opts.status_file, "w") as f:
+                json.dump(statuses, f, indent=2)
+        if not all(status["ok"] for status in statuses.values()):
+            self.exitcode = 1
+
+    def _set_primegov_archive_mode(self, spiders):
+        """Share one yearly archive download between PrimeGov committee spiders if
+        there is more than one of them, since the responses are shared in-process
+        """
+        # Imported here since every command module is imported on startup
+        from city_scrapers.mixins import PrimeGovMixin
+
+        spider_classes = [
+            self.crawler_process.spider_loader.load(spider) for spider in spiders
+        ]
+        committee_spiders = [
+            spidercls
+            for spidercls in spider_classes
+            if issubclass(spidercls, PrimeGovMixin) and spidercls.committee_id
+        ]
+        if len(committee_spiders) > 1:
+            self.settings.set(
+                "CITY_SCRAPERS_PRIMEGOV_ARCHIVE_BY_YEAR", True, priority="cmdline"
+            )
+
+    def _count_error(self, failure, spider, **kwargs):
+        self.error_counts[spider.name] += 1
+
+    def _get_status(self, spider, crawler, crawl_defer):
+        """Summarize how a spider's crawl finished from its stats and errors"""
+        stats = crawler.stats.get_stats() if crawler.stats else {}
+        failed = isinstance(getattr(crawl_defer, "result", None), Failure)
+        finish_reason = stats.get("finish_reason", "failed to start")
+        error_count = self.error_counts[spider]
+        status = {
+            "ok": not failed and finish_reason == "finished" and error_count == 0,
+            "finish_reason": finish_reason,
+            "item_count": stats.get("item_scraped_count", 0),
+            "error_count": error_count,
+        }
+        timing = {
+            key[len("timing/") :]: value
+            for key, value in stats.items()
+            if key.startswith("timing/")
+        }
+        if timing:
+            status["timing"] = timing
+        return status
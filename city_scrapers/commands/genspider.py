@@ -0,0 +1,12 @@
+from city_scrapers_core.commands import genspider
+
+from city_scrapers.spiderloader import update_manifest
+
+
+class Command(genspider.Command):
+    def run(self, args, opts):
+        super().run(args, opts)
+        # Add the new spider to the manifest so it can be listed and loaded
+        spider_module = self.settings.get("NEWSPIDER_MODULE")
+        if spider_module:
+            update_manifest(spider_module)
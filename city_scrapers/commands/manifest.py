@@ -0,0 +1,33 @@
+from scrapy.commands import ScrapyCommand
+from scrapy.exceptions import UsageError
+
+from city_scrapers.spiderloader import get_manifest_path, update_manifest
+
+
+class Command(ScrapyCommand):
+    requires_project = True
+    default_settings = {"LOG_ENABLED": False}
+
+    def short_desc(self):
+        return "Write the manifest of spiders used to load them without importing all"
+
+    def add_options(self, parser):
+        ScrapyCommand.add_options(self, parser)
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="exit with an error if a manifest is out of date rather than write it",
+        )
+
+    def run(self, args, opts):
+        for spider_module in self.settings.getlist("SPIDER_MODULES"):
+            try:
+                changed = update_manifest(spider_module, check=opts.check)
+            except ValueError as e:
+                raise UsageError(str(e), print_help=False)
+            manifest_path = get_manifest_path(spider_module)
+            if changed and opts.check:
+                print(f"{manifest_path} is out of date, run 'scrapy manifest'")
+                self.exitcode = 1
+            elif changed:
+                print(f"Updated {manifest_path}")
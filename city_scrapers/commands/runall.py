@@ -0,0 +1,5 @@
+from city_scrapers_core.commands import runall
+
+
+class Command(runall.Command):
+    pass
@@ -0,0 +1,5 @@
+from city_scrapers_core.commands import validate
+
+
+class Command(validate.Command):
+    pass
@@ -0,0 +1,50 @@
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+
+from dateutil.parser import parse
+
+
+class DateParser:
+    """Parses datetime strings with a source's known formats before falling back to
+    dateutil, which is much slower since it has to guess the format.
+
+    Results are memoized in an LRU cache since the same strings often repeat, and
+    counts of how each string was parsed are kept in ``stats`` so that sources falling
+    back to dateutil often can be given better formats.
+
+    :param formats: ``strptime`` formats to try in order
+    :param iso: Whether to try ISO 8601 with ``datetime.fromisoformat`` first
+    :param cache_size: Maximum number of parsed strings to keep
+    """
+
+    def __init__(self, *formats: str, iso: bool = False, cache_size: int = 1024):
+        self.formats = formats
+        self.iso = iso
+        self.stats = Counter()
+        self._parse_cached = lru_cache(maxsize=cache_size)(self._parse)
+
+    def __call__(self, value: str) -> datetime:
+        hits = self._parse_cached.cache_info().hits
+        result = self._parse_cached(value)
+        if self._parse_cached.cache_info().hits > hits:
+            self.stats["cached"] += 1
+        return result
+
+    def _parse(self, value: str) -> datetime:
+        if self.iso:
+            try:
+                result = datetime.fromisoformat(value)
+                self.stats["fast"] += 1
+                return result
+            except (ValueError, TypeError):
+                pass
+        for date_format in self.formats:
+            try:
+                result = datetime.strptime(value, date_format)
+                self.stats["fast"] += 1
+                return result
+            except (ValueError, TypeError):
+                continue
+        self.stats["fallback"] += 1
+        return parse(value)
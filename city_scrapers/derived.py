@@ -0,0 +1,56 @@
+from datetime import date, datetime, time, timedelta, tzinfo
+from functools import lru_cache
+from typing import Any, Callable, Mapping, Optional
+
+from pytz import timezone
+
+
+def get_derived(item: Mapping, key: str, compute: Callable[[], Any], *deps) -> Any:
+    """Get a value derived from a meeting, which is cached on the meeting along with the
+    values it was derived from so that later pipeline stages can reuse it. It's only
+    recomputed if those values have changed.
+
+    Plain dicts don't have anywhere to keep the cache, so values are always computed.
+
+    :param item: Meeting the value is derived from
+    :param key: Name of the derived value
+    :param compute: Function returning the value
+    :param deps: Values from the meeting the derived value depends on
+    :return: Derived value
+    """
+    try:
+        cache = item.__dict__.setdefault("_derived", {})
+    except AttributeError:
+        return compute()
+    cached = cache.get(key)
+    if cached is not None and cached[0] == deps:
+        return cached[1]
+    value = compute()
+    cache[key] = (deps, value)
+    return value
+
+
+def local_isoformat(tz_name: str, value: datetime) -> str:
+    """Localize a naive datetime to a timezone as an ISO 8601 string with an offset,
+    matching ``pytz`` ``localize``.
+
+    Localizing with ``pytz`` is slow, so the UTC offset of each day is cached and only
+    days when the offset changes are localized with ``pytz``.
+    """
+    day_tzinfo = _get_day_tzinfo(tz_name, value.date())
+    if day_tzinfo is None:
+        localized = timezone(tz_name).localize(value)
+    else:
+        localized = value.replace(tzinfo=day_tzinfo)
+    return localized.isoformat(timespec="seconds")
+
+
+@lru_cache(maxsize=4096)
+def _get_day_tzinfo(tz_name: str, day: date) -> Optional[tzinfo]:
+    """Get the tzinfo for every time on a day, or None if the offset changes that day"""
+    tz = timezone(tz_name)
+    start = tz.localize(datetime.combine(day, time()))
+    end = tz.localize(datetime.combine(day + timedelta(days=1), time()))
+    if start.utcoffset() != end.utcoffset():
+        return None
+    return start.tzinfo
@@ -0,0 +1,175 @@
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional
+
+from scrapy.crawler import Crawler
+from scrapy.exporters import BaseItemExporter
+
+
+def meeting_schema():
+    """Arrow schema for meetings exported by ``ParquetItemExporter`` and
+    ``ArrowItemExporter``
+    """
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("id", pa.string()),
+            ("spider", pa.string()),
+            ("agency", pa.string()),
+            ("title", pa.string()),
+            ("description", pa.string()),
+            ("classification", pa.string()),
+            ("status", pa.string()),
+            ("start", pa.timestamp("ms")),
+            ("end", pa.timestamp("ms")),
+            ("all_day", pa.bool_()),
+            ("time_notes", pa.string()),
+            ("location_name", pa.string()),
+            ("location_address", pa.string()),
+            (
+                "links",
+                pa.list_(pa.struct([("href", pa.string()), ("title", pa.string())])),
+            ),
+            ("source", pa.string()),
+        ]
+    )
+
+
+class ArrowItemExporter(BaseItemExporter):
+    """Exporter for writing meetings to an Arrow IPC file with a fixed schema.
+
+    Accepts both ``Meeting`` items and items in the Open Civic Data format from
+    ``OpenCivicDataPipeline``. Start and end times are stored as timestamps in the
+    agency's local time, the spider name is taken from the meeting ID, and the agency
+    of ``Meeting`` items is taken from the spider. Items are buffered and written in
+    batches of ``batch_size`` (set in a feed's ``item_export_kwargs``), so memory use
+    doesn't grow with the number of items. Requires ``pyarrow``.
+
+    The file format can't be appended to, so feeds need ``overwrite`` set to True (or
+    ``-O`` instead of ``-o``), and exporting to a file that already has data raises a
+    ``ValueError`` instead of corrupting it.
+    """
+
+    def __init__(
+        self, file, *, batch_size: int = 1000, agency: Optional[str] = None, **kwargs
+    ):
+        import pyarrow as pa
+
+        super().__init__(dont_fail=True, **kwargs)
+        self.pa = pa
+        self.file = file
+        self.batch_size = batch_size
+        self.agency = agency
+        self.schema = meeting_schema()
+        self.rows: List[Dict[str, Any]] = []
+        self.writer = None
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler, file, *args, **kwargs):
+        kwargs.setdefault("agency", getattr(crawler.spider, "agency", None))
+        return cls(file, *args, **kwargs)
+
+    def start_exporting(self):
+        if self.file.tell():
+            raise ValueError(
+                "Can't append to an existing file, set overwrite to True for the feed"
+            )
+        self.writer = self._open_writer()
+
+    def export_item(self, item: Mapping):
+        self.rows.append(self.to_row(item))
+        if len(self.rows) >= self.batch_size:
+            self._write_rows()
+
+    def finish_exporting(self):
+        self._write_rows()
+        self.writer.close()
+
+    def _open_writer(self):
+        return self.pa.ipc.new_file(self.file, self.schema)
+
+    def _write_rows(self):
+        if self.rows:
+            self.writer.write_batch(
+                self.pa.RecordBatch.from_pylist(self.rows, schema=self.schema)
+            )
+            self.rows = []
+
+    def to_row(self, item: Mapping) -> Dict[str, Any]:
+        """Flatten a meeting into a row matching the schema"""
+        if "_type" in item:
+            return self._ocd_to_row(item)
+        location = item.get("location") or {}
+        return {
+            "id": item.get("id"),
+            "spider": self._get_spider(item.get("id")),
+            "agency": self.agency,
+            "title": item.get("title"),
+            "description": item.get("description"),
+            "classification": item.get("classification"),
+            "status": item.get("status"),
+            "start": item.get("start"),
+            "end": item.get("end"),
+            "all_day": item.get("all_day"),
+            "time_notes": item.get("time_notes"),
+            "location_name": location.get("name"),
+            "location_address": location.get("address"),
+            "links": [
+                {"href": link.get("href"), "title": link.get("title")}
+                for link in item.get("links") or []
+            ],
+            "source": item.get("source"),
+        }
+
+    def _ocd_to_row(self, item: Mapping) -> Dict[str, Any]:
+        extras = item.get("extras") or {}
+        meeting_id = extras.get("cityscrapers/id")
+        sources = item.get("sources") or [{}]
+        return {
+            "id": meeting_id,
+            "spider": self._get_spider(meeting_id),
+            "agency": extras.get("cityscrapers/agency"),
+            "title": item.get("name"),
+            "description": item.get("description"),
+            "classification": item.get("classification"),
+            "status": item.get("status"),
+            "start": self._parse_local_time(item.get("start_time")),
+            "end": self._parse_local_time(item.get("end_time")),
+            "all_day": item.get("all_day"),
+            "time_notes": extras.get("cityscrapers/time_notes"),
+            "location_name": (item.get("location") or {}).get("name"),
+            "location_address": extras.get("cityscrapers/address"),
+            "links": [
+                {"href": link.get("url"), "title": link.get("note")}
+                for link in item.get("links") or []
+            ],
+            "source": sources[0].get("url"),
+        }
+
+    def _get_spider(self, meeting_id: Optional[str]) -> Optional[str]:
+        return meeting_id.split("/")[0] if meeting_id else None
+
+    def _parse_local_time(self, value: Optional[str]) -> Optional[datetime]:
+        """Parse an ISO datetime with an offset as a naive local datetime"""
+        if not value:
+            return None
+        return datetime.fromisoformat(value).replace(tzinfo=None)
+
+
+class ParquetItemExporter(ArrowItemExporter):
+    """Exporter for writing meetings to a Parquet file with the same schema as
+    ``ArrowItemExporter``, with each batch written as a row group
+    """
+
+    def _open_writer(self):
+        import pyarrow.parquet as pq
+
+        return pq.ParquetWriter(self.file, self.schema)
+
+    def _write_rows(self):
+        if self.rows:
+            self.writer.write_table(
+                self.pa.Table.from_pylist(self.rows, schema=self.schema),
+                row_group_size=self.batch_size,
+            )
+            self.rows = []
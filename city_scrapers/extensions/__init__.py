@@ -0,0 +1,11 @@
+from .dates import DateParserStatsExtension  # noqa
+from .load_report import LoadReportExtension  # noqa
+from .throttle import HostThrottle  # noqa
+from .timing import TimingStatsExtension  # noqa
+
+__all__ = [
+    "DateParserStatsExtension",
+    "HostThrottle",
+    "LoadReportExtension",
+    "TimingStatsExtension",
+]
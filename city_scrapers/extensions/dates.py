@@ -0,0 +1,48 @@
+from collections import Counter
+from typing import Iterator
+
+from scrapy import Spider, signals
+from scrapy.crawler import Crawler
+from scrapy.statscollectors import StatsCollector
+
+from ..dates import DateParser
+
+
+class DateParserStatsExtension:
+    """Extension for adding counts of how dates were parsed by a spider's
+    ``DateParser`` attributes to its stats as ``date_parser/fast``,
+    ``date_parser/cached`` and ``date_parser/fallback``.
+    """
+
+    def __init__(self, stats: StatsCollector):
+        self.stats = stats
+        self.initial_counts = Counter()
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler):
+        ext = cls(crawler.stats)
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        return ext
+
+    def _get_counts(self, spider: Spider) -> Counter:
+        counts = Counter()
+        for parser in self._get_parsers(spider):
+            counts.update(parser.stats)
+        return counts
+
+    def _get_parsers(self, spider: Spider) -> Iterator[DateParser]:
+        for attr in dir(type(spider)):
+            value = getattr(type(spider), attr, None)
+            if isinstance(value, DateParser):
+                yield value
+
+    def spider_opened(self, spider: Spider):
+        # Parsers are class attributes, so only count what's parsed during this crawl
+        self.initial_counts = self._get_counts(spider)
+
+    def spider_closed(self, spider: Spider):
+        counts = self._get_counts(spider)
+        counts.subtract(self.initial_counts)
+        for key, count in counts.items():
+            self.stats.set_value(f"date_parser/{key}", count, spider=spider)
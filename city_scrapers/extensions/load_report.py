@@ -0,0 +1,135 @@
+import json
+import logging
+from time import perf_counter
+from typing import Dict, List, Optional
+
+from scrapy import signals
+from scrapy.crawler import Crawler
+from scrapy.exceptions import NotConfigured
+
+logger = logging.getLogger(__name__)
+
+
+class TimedPoller:
+    """Wrapper for a reactor's poller adding up the time spent waiting for I/O"""
+
+    def __init__(self, poller):
+        self.poller = poller
+        self.idle = 0.0
+
+    def poll(self, *args, **kwargs):
+        start = perf_counter()
+        try:
+            return self.poller.poll(*args, **kwargs)
+        finally:
+            self.idle += perf_counter() - start
+
+    def __getattr__(self, name):
+        return getattr(self.poller, name)
+
+
+class LoadReport:
+    """Measurements shared by every crawler in the process, reported when the reactor
+    shuts down
+    """
+
+    def __init__(self, path: Optional[str], reactor=None):
+        if reactor is None:
+            from twisted.internet import reactor
+        self.path = path
+        self.reactor = reactor
+        self.crawlers: List[Crawler] = []
+        self.active = 0
+        self.max_active = 0
+        self.start = reactor.seconds()
+        self.poller = None
+        if hasattr(reactor, "_poller"):
+            # Only poll-based reactors like the default epoll reactor can be measured
+            self.poller = reactor._poller = TimedPoller(reactor._poller)
+        reactor.callWhenRunning(self._started)
+        reactor.addSystemEventTrigger("before", "shutdown", self.finish)
+
+    def _started(self):
+        self.start = self.reactor.seconds()
+        if self.poller is not None:
+            self.poller.idle = 0.0
+
+    def request_reached_downloader(self):
+        self.active += 1
+        self.max_active = max(self.active, self.max_active)
+
+    def request_left_downloader(self):
+        self.active -= 1
+
+    def get_report(self) -> Dict:
+        seconds = self.reactor.seconds() - self.start
+        spiders = {}
+        totals = {"items": 0, "requests": 0, "responses": 0, "exceptions": 0}
+        for crawler in self.crawlers:
+            stats = crawler.stats.get_stats()
+            spiders[crawler.spider.name] = {
+                "finish_reason": stats.get("finish_reason"),
+                "items": stats.get("item_scraped_count", 0),
+            }
+            totals["items"] += stats.get("item_scraped_count", 0)
+            totals["requests"] += stats.get("downloader/request_count", 0)
+            totals["responses"] += stats.get("downloader/response_count", 0)
+            totals["exceptions"] += stats.get("downloader/exception_count", 0)
+        report = {
+            "seconds": round(seconds, 3),
+            **totals,
+            "items_per_sec": round(totals["items"] / seconds, 1) if seconds else None,
+            "max_concurrency": self.max_active,
+            "reactor_idle_seconds": None,
+            "reactor_idle_fraction": None,
+            "spiders": spiders,
+        }
+        if self.poller is not None and seconds:
+            report["reactor_idle_seconds"] = round(self.poller.idle, 3)
+            report["reactor_idle_fraction"] = round(self.poller.idle / seconds, 3)
+        return report
+
+    def finish(self):
+        report = self.get_report()
+        logger.info(
+            f"Load report: {report['items']} items in {report['seconds']}s "
+            f"({report['items_per_sec']} items/s), max concurrency "
+            f"{report['max_concurrency']}, reactor idle "
+            f"{report['reactor_idle_seconds']}s"
+        )
+        if self.path:
+            with open(self.path, "w") as f:
+                json.dump(report, f, indent=2)
+
+
+class LoadReportExtension:
+    """Extension reporting end-to-end throughput of every crawler in the process when
+    the reactor stops, for load tests against ``benchmarks.mock_agency``: items per
+    second, the most requests in the downloaders at once and the time the reactor
+    spent idle waiting for I/O. The report is logged and written as JSON to
+    CITY_SCRAPERS_MOCK_AGENCY_REPORT if it's set.
+    """
+
+    report: Optional[LoadReport] = None
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler):
+        if not crawler.settings.get("CITY_SCRAPERS_MOCK_AGENCY_URL"):
+            raise NotConfigured
+        if cls.report is None:
+            cls.report = LoadReport(
+                crawler.settings.get("CITY_SCRAPERS_MOCK_AGENCY_REPORT")
+            )
+        report = cls.report
+        report.crawlers.append(crawler)
+        crawler.signals.connect(
+            lambda **kwargs: report.request_reached_downloader(),
+            signal=signals.request_reached_downloader,
+            weak=False,
+        )
+        crawler.signals.connect(
+            lambda **kwargs: report.request_left_downloader(),
+            signal=signals.request_left_downloader,
+            weak=False,
+        )
+        return cls()
@@ -0,0 +1,174 @@
+import logging
+import os
+import sqlite3
+from time import time
+from typing import Dict, Mapping, Optional, Tuple
+
+from scrapy import Request, Spider, signals
+from scrapy.core.downloader import Slot
+from scrapy.crawler import Crawler
+from scrapy.extensions.throttle import AutoThrottle
+from scrapy.http import Response
+from scrapy.utils.httpobj import urlparse_cached
+from scrapy.utils.project import data_path
+
+logger = logging.getLogger(__name__)
+
+THROTTLED_STATUSES = {429, 503}
+
+
+class HostThrottle(AutoThrottle):
+    """Replacement for AutoThrottle adjusting the concurrency as well as the delay of
+    each host separately, within the target latency and concurrency bounds for the host
+    in CITY_SCRAPERS_HOST_THROTTLE (falling back to the ``"*"`` entry).
+
+    After each response from a host:
+
+    - A 429 or 503 response halves its concurrency and doubles its delay, waiting at
+      least as long as any ``Retry-After`` header
+    - A response slower than the target latency reduces its concurrency by one and
+      moves its delay towards spreading requests over the latency
+    - Once as many successful responses as its concurrency have been faster than the
+      target latency, its concurrency is increased by one and its delay halved
+
+    Each host's concurrency and delay are saved in an SQLite file relative to the
+    project's .scrapy directory when the spider closes, and the next run starts from
+    them rather than AUTOTHROTTLE_START_DELAY if they were saved within
+    CITY_SCRAPERS_HOST_THROTTLE_TTL seconds. Requests with their own ``download_slot``
+    like PrimeGov backfills keep the limits they're configured with.
+    """
+
+    _connections: Dict[str, sqlite3.Connection] = {}
+
+    def __init__(self, crawler: Crawler):
+        super().__init__(crawler)
+        settings = crawler.settings
+        self.host_settings: Mapping[str, Mapping] = settings.getdict(
+            "CITY_SCRAPERS_HOST_THROTTLE"
+        )
+        self.ttl = settings.getint("CITY_SCRAPERS_HOST_THROTTLE_TTL")
+        self.start_delay = settings.getfloat("AUTOTHROTTLE_START_DELAY")
+        self.conn = self.connect(
+            data_path(settings.get("CITY_SCRAPERS_HOST_THROTTLE_DB"))
+        )
+        self.slots: Dict[str, Slot] = {}
+        self.limits: Dict[str, Tuple[int, float]] = {}
+        self.successes: Dict[str, int] = {}
+        crawler.signals.connect(
+            self._request_reached_downloader, signal=signals.request_reached_downloader
+        )
+        crawler.signals.connect(self._spider_closed, signal=signals.spider_closed)
+
+    @classmethod
+    def connect(cls, path: str) -> sqlite3.Connection:
+        """Get a connection to the store, shared by crawlers in the same process"""
+        if path not in cls._connections:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            conn = sqlite3.connect(path)
+            with conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS hosts (
+                        host TEXT PRIMARY KEY,
+                        concurrency INTEGER NOT NULL,
+                        delay REAL NOT NULL,
+                        timestamp REAL NOT NULL
+                    )
+                    """
+                )
+            cls._connections[path] = conn
+        return cls._connections[path]
+
+    def get_host_settings(self, host: str) -> Dict:
+        return {
+            "target_latency": 2.0,
+            "min_concurrency": 1,
+            "max_concurrency": 4,
+            **self.host_settings.get("*", {}),
+            **self.host_settings.get(host, {}),
+        }
+
+    def _request_reached_downloader(self, request: Request, spider: Spider):
+        """Start a host's slot from its saved limits, or from its minimum concurrency
+        and the start delay, before its first request is sent. Slots removed by the
+        downloader while idle are recreated with the limits they had.
+        """
+        key, slot = self._get_slot(request, spider)
+        if slot is None or self.slots.get(key) is slot:
+            return
+        self.slots[key] = slot
+        if key not in self.limits:
+            row = self.conn.execute(
+                "SELECT concurrency, delay FROM hosts WHERE host = ? "
+                "AND timestamp >= ?",
+                (key, time() - self.ttl),
+            ).fetchone()
+            self.limits[key] = row or (
+                self.get_host_settings(key)["min_concurrency"],
+                slot.delay,
+            )
+        self._set_limits(key, slot, *self.limits[key])
+
+    def _get_slot(self, request: Request, spider: Spider) -> Tuple[str, Optional[Slot]]:
+        key, slot = super()._get_slot(request, spider)
+        if key != urlparse_cached(request).hostname:
+            return key, None
+        return key, slot
+
+    def _adjust_delay(self, slot: Slot, latency: float, response: Response):
+        key = urlparse_cached(response).hostname
+        host_settings = self.get_host_settings(key)
+        concurrency, delay = slot.concurrency, slot.delay
+        if response.status in THROTTLED_STATUSES:
+            self.crawler.stats.inc_value("throttle/throttled")
+            concurrency = self._bound_concurrency(concurrency // 2, host_settings)
+            delay = max(delay * 2, self.start_delay, self._get_retry_after(response))
+            self.successes[key] = 0
+        elif latency > host_settings["target_latency"]:
+            concurrency = self._bound_concurrency(concurrency - 1, host_settings)
+            # Spread requests over the latency like AutoThrottle
+            target_delay = latency / concurrency
+            delay = max(target_delay, (delay + target_delay) / 2)
+            self.successes[key] = 0
+        elif response.status < 400:
+            self.successes[key] = self.successes.get(key, 0) + 1
+            if self.successes[key] >= concurrency:
+                concurrency = self._bound_concurrency(concurrency + 1, host_settings)
+                delay /= 2
+                self.successes[key] = 0
+        self._set_limits(key, slot, concurrency, delay)
+
+    def _bound_concurrency(self, concurrency: int, host_settings: Mapping) -> int:
+        return min(
+            max(concurrency, host_settings["min_concurrency"], 1),
+            host_settings["max_concurrency"],
+        )
+
+    def _set_limits(self, key: str, slot: Slot, concurrency: int, delay: float):
+        slot.concurrency = concurrency
+        slot.delay = min(max(delay, self.mindelay), self.maxdelay)
+        self.limits[key] = (slot.concurrency, slot.delay)
+        if self.debug:
+            logger.info(
+                f"Host {key}: concurrency {slot.concurrency}, delay {slot.delay:.2f}s"
+            )
+
+    def _get_retry_after(self, response: Response) -> float:
+        try:
+            return float(response.headers.get("Retry-After", 0))
+        except ValueError:
+            # HTTP dates aren't used by the sites scraped, so they're ignored
+            return 0
+
+    def _spider_closed(self, spider: Spider):
+        rows = [
+            (key, concurrency, delay, time())
+            for key, (concurrency, delay) in self.limits.items()
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO hosts VALUES (?, ?, ?, ?)", rows
+            )
+        for key, concurrency, delay, _ in rows:
+            self.crawler.stats.set_value(f"throttle/{key}/concurrency", concurrency)
+            self.crawler.stats.set_value(f"throttle/{key}/delay", round(delay, 3))
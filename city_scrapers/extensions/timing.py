@@ -0,0 +1,166 @@
+import inspect
+from collections import defaultdict, deque
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Dict, Generator, List
+
+from scrapy import Request, Spider, signals
+from scrapy.crawler import Crawler
+from scrapy.exceptions import NotConfigured
+from scrapy.http import Response
+from scrapy.statscollectors import StatsCollector
+from twisted.internet.defer import Deferred
+
+from ..dates import DateParser
+
+REACHED_META_KEY = "_timing_reached_downloader"
+
+
+class TimingStatsExtension:
+    """Extension for timing where a crawl spends its time, enabled with
+    CITY_SCRAPERS_TIMING_ENABLED.
+
+    Spider methods named ``parse*`` or ``_parse*``, ``DateParser`` attributes and each
+    item pipeline's ``process_item`` are wrapped on the running instances, and request
+    timings are taken from signals. ``download`` is the download latency and
+    ``download_wait`` is time spent in the downloader before being sent, which includes
+    AutoThrottle delays. Each is added to the stats when the spider closes as
+    ``timing/<name>/count``, ``total_ms``, ``p50_ms``, ``p95_ms`` and ``max_ms``.
+
+    Time for generator methods, and for methods returning a generator like callbacks
+    decorated with ``in_process_pool``, is only counted while they're running, not while
+    they're suspended at a ``yield``. Methods that call each other are timed separately,
+    so a callback's time includes the helpers it calls.
+    """
+
+    def __init__(self, crawler: Crawler, stats: StatsCollector):
+        self.crawler = crawler
+        self.stats = stats
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler):
+        if not crawler.settings.getbool("CITY_SCRAPERS_TIMING_ENABLED"):
+            raise NotConfigured
+        ext = cls(crawler, crawler.stats)
+        # Extensions are created after the spider but before its start requests, so
+        # requests are created with the wrapped callbacks
+        if crawler.spider is not None:
+            ext.wrap_spider(crawler.spider)
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(
+            ext.request_reached_downloader, signal=signals.request_reached_downloader
+        )
+        crawler.signals.connect(
+            ext.response_downloaded, signal=signals.response_downloaded
+        )
+        return ext
+
+    def record(self, name: str, seconds: float):
+        self.samples[name].append(seconds)
+
+    def wrap_spider(self, spider: Spider):
+        """Replace parse methods and date parsers on the spider instance with timed
+        versions
+        """
+        for attr in dir(type(spider)):
+            if attr.startswith(("parse", "_parse")):
+                method = getattr(spider, attr)
+                if inspect.ismethod(method):
+                    setattr(spider, attr, self.timed(method, f"spider/{attr}"))
+            elif isinstance(getattr(type(spider), attr, None), DateParser):
+                parser = getattr(spider, attr)
+                setattr(spider, attr, self.timed(parser, f"dates/{attr}"))
+
+    def wrap_pipelines(self):
+        """Replace each pipeline's process_item with a timed version"""
+        itemproc = self.crawler.engine.scraper.itemproc
+        pipelines = [
+            pipeline
+            for pipeline in itemproc.middlewares
+            if hasattr(pipeline, "process_item")
+        ]
+        itemproc.methods["process_item"] = deque(
+            self.timed(method, f"pipeline/{type(pipeline).__name__}")
+            for pipeline, method in zip(pipelines, itemproc.methods["process_item"])
+        )
+
+    def timed(self, func: Callable, name: str) -> Callable:
+        """Wrap a function, generator function or function returning a generator or
+        Deferred to record how long it runs
+        """
+        if inspect.isgeneratorfunction(func):
+
+            @wraps(func)
+            def timed_generator(*args, **kwargs):
+                return (yield from self._time_generator(func(*args, **kwargs), name))
+
+            return timed_generator
+
+        @wraps(func)
+        def timed_func(*args, **kwargs):
+            start = perf_counter()
+            result = func(*args, **kwargs)
+            if isinstance(result, Deferred):
+                return result.addBoth(self._record_deferred, name, start)
+            if inspect.isgenerator(result):
+                # Decorated generator functions, like callbacks using the process pool
+                return self._time_generator(result, name, perf_counter() - start)
+            self.record(name, perf_counter() - start)
+            return result
+
+        return timed_func
+
+    def _time_generator(self, generator: Generator, name: str, elapsed: float = 0.0):
+        """Iterate a generator, recording the time spent running it"""
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    value = next(generator)
+                except StopIteration as e:
+                    return e.value
+                finally:
+                    elapsed += perf_counter() - start
+                yield value
+        finally:
+            self.record(name, elapsed)
+
+    def _record_deferred(self, result, name: str, start: float):
+        self.record(name, perf_counter() - start)
+        return result
+
+    def spider_opened(self, spider: Spider):
+        self.wrap_pipelines()
+
+    def request_reached_downloader(self, request: Request, spider: Spider):
+        request.meta[REACHED_META_KEY] = perf_counter()
+
+    def response_downloaded(self, response: Response, request: Request, spider: Spider):
+        latency = request.meta.get("download_latency")
+        reached = request.meta.pop(REACHED_META_KEY, None)
+        if latency is None:
+            return
+        self.record("download", latency)
+        if reached is not None:
+            self.record("download_wait", max(perf_counter() - reached - latency, 0))
+
+    def spider_closed(self, spider: Spider):
+        for name, samples in self.samples.items():
+            samples.sort()
+            prefix = f"timing/{name}"
+            self.stats.set_value(f"{prefix}/count", len(samples), spider=spider)
+            for key, value in [
+                ("total_ms", sum(samples)),
+                ("p50_ms", self._percentile(samples, 0.5)),
+                ("p95_ms", self._percentile(samples, 0.95)),
+                ("max_ms", samples[-1]),
+            ]:
+                self.stats.set_value(
+                    f"{prefix}/{key}", round(value * 1000, 3), spider=spider
+                )
+
+    def _percentile(self, samples: List[float], fraction: float) -> float:
+        """Nearest-rank percentile of sorted samples"""
+        return samples[max(int(len(samples) * fraction + 0.5) - 1, 0)]
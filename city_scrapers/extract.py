@@ -0,0 +1,76 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Mapping, Tuple, Union
+
+from lxml import etree
+from parsel import Selector
+from parsel.csstranslator import HTMLTranslator
+from scrapy.http import TextResponse
+
+translator = HTMLTranslator()
+
+
+@lru_cache(maxsize=None)
+def compile_css(css: str) -> etree.XPath:
+    """Translate a CSS selector (including the ``::text`` and ``::attr()`` pseudo
+    elements supported by Scrapy) to a compiled XPath expression, once per process
+    """
+    return etree.XPath(translator.css_to_xpath(css))
+
+
+class RowExtractor:
+    """Extracts a set of fields from each row of a page with CSS selectors that are
+    compiled to XPath once, rather than translated on each ``.css()`` call.
+
+    Fields are a mapping of field names to one of:
+
+    - a CSS selector string, returning the first match like ``.css().get()``
+    - a list with one CSS selector, returning every match like ``.css().getall()``
+    - a tuple of a CSS selector and a nested ``RowExtractor``, returning a list of
+      dicts extracted from each matching element
+
+    ``extract`` accepts parsel selectors as well as lxml elements, so it can be used on
+    rows from ``response.css`` or from an incremental parser.
+    """
+
+    def __init__(self, fields: Mapping[str, Any], row: str = ""):
+        self.row = compile_css(row) if row else None
+        self.fields: List[Tuple[str, str, etree.XPath, Any]] = []
+        for name, spec in fields.items():
+            if isinstance(spec, tuple):
+                css, nested = spec
+                self.fields.append((name, "nested", compile_css(css), nested))
+            elif isinstance(spec, list):
+                self.fields.append((name, "all", compile_css(spec[0]), None))
+            else:
+                self.fields.append((name, "first", compile_css(spec), None))
+
+    def extract(self, row: Union[Selector, etree._Element]) -> Dict[str, Any]:
+        """Extract all fields from a single row"""
+        if isinstance(row, Selector):
+            row = row.root
+        data = {}
+        for name, kind, xpath, nested in self.fields:
+            matches = xpath(row)
+            if kind == "first":
+                data[name] = self._to_str(matches[0]) if matches else None
+            elif kind == "all":
+                data[name] = [self._to_str(match) for match in matches]
+            else:
+                data[name] = [nested.extract(match) for match in matches]
+        return data
+
+    def rows(self, response: TextResponse) -> List[etree._Element]:
+        """Get elements in a response matching the row selector"""
+        return self.row(response.selector.root)
+
+    def extract_rows(self, response: TextResponse) -> Iterator[Dict[str, Any]]:
+        """Extract fields from each row of a response matching the row selector"""
+        for row in self.rows(response):
+            yield self.extract(row)
+
+    def _to_str(self, match: Any) -> str:
+        if isinstance(match, etree._Element):
+            return etree.tostring(
+                match, encoding="unicode", method="html", with_tail=False
+            )
+        return str(match)
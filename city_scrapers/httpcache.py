@@ -0,0 +1,160 @@
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+from time import time
+from typing import Optional
+
+from scrapy import Request, Spider
+from scrapy.http import Headers, Response
+from scrapy.responsetypes import responsetypes
+from scrapy.settings import Settings
+from scrapy.utils.project import data_path
+from w3lib.http import headers_dict_to_raw, headers_raw_to_dict
+
+logger = logging.getLogger(__name__)
+
+
+class CompressedCacheStorage:
+    """HTTP cache storage keeping gzipped response bodies in a content-addressed store,
+    so identical bodies are stored once, and an SQLite index of responses keyed by
+    spider name and request fingerprint.
+
+    Entries older than HTTPCACHE_EXPIRATION_SECS aren't returned, and when a spider
+    closes they're evicted along with the oldest entries needed to bring the store
+    under CITY_SCRAPERS_HTTPCACHE_MAX_MB.
+    """
+
+    def __init__(self, settings: Settings):
+        self.cachedir = data_path(settings["HTTPCACHE_DIR"])
+        self.expiration_secs = settings.getint("HTTPCACHE_EXPIRATION_SECS")
+        self.max_bytes = settings.getint("CITY_SCRAPERS_HTTPCACHE_MAX_MB") * 1024 * 1024
+        self.conn = None
+
+    def open_spider(self, spider: Spider):
+        os.makedirs(self.cachedir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(self.cachedir, "index.db"))
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    spider TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    status INTEGER NOT NULL,
+                    headers BLOB NOT NULL,
+                    body_hash TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    timestamp REAL NOT NULL,
+                    PRIMARY KEY (spider, fingerprint)
+                )
+                """
+            )
+        self._fingerprinter = spider.crawler.request_fingerprinter
+
+    def close_spider(self, spider: Spider):
+        self.evict()
+        self.conn.close()
+
+    def retrieve_response(self, spider: Spider, request: Request) -> Optional[Response]:
+        row = self.conn.execute(
+            "SELECT url, status, headers, body_hash, timestamp FROM responses "
+            "WHERE spider = ? AND fingerprint = ?",
+            (spider.name, self._get_key(request)),
+        ).fetchone()
+        if row is None:
+            return None
+        url, status, raw_headers, body_hash, timestamp = row
+        if 0 < self.expiration_secs < time() - timestamp:
+            return None
+        try:
+            with open(self._get_object_path(body_hash), "rb") as f:
+                body = gzip.decompress(f.read())
+        except FileNotFoundError:
+            return None
+        headers = Headers(headers_raw_to_dict(raw_headers))
+        respcls = responsetypes.from_args(headers=headers, url=url, body=body)
+        return respcls(url=url, headers=headers, status=status, body=body)
+
+    def store_response(self, spider: Spider, request: Request, response: Response):
+        body_hash = hashlib.sha256(response.body).hexdigest()
+        path = self._get_object_path(body_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Written to a temporary file first so a partial object is never read
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(gzip.compress(response.body))
+            os.replace(tmp_path, path)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    spider.name,
+                    self._get_key(request),
+                    response.url,
+                    response.status,
+                    headers_dict_to_raw(response.headers),
+                    body_hash,
+                    os.path.getsize(path),
+                    time(),
+                ),
+            )
+
+    def evict(self):
+        """Remove expired entries and the oldest entries over the size cap, then any
+        bodies no longer referenced
+        """
+        with self.conn:
+            if self.expiration_secs > 0:
+                self.conn.execute(
+                    "DELETE FROM responses WHERE timestamp < ?",
+                    (time() - self.expiration_secs,),
+                )
+            if self.max_bytes > 0:
+                self._evict_oldest()
+        referenced = {
+            body_hash
+            for (body_hash,) in self.conn.execute("SELECT body_hash FROM responses")
+        }
+        objects_dir = os.path.join(self.cachedir, "objects")
+        for dirpath, _, filenames in os.walk(objects_dir):
+            for filename in filenames:
+                if filename not in referenced:
+                    os.remove(os.path.join(dirpath, filename))
+
+    def _evict_oldest(self):
+        sizes = dict(
+            self.conn.execute(
+                "SELECT body_hash, MAX(size) FROM responses GROUP BY body_hash"
+            )
+        )
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+        rows = self.conn.execute(
+            "SELECT spider, fingerprint, body_hash FROM responses ORDER BY timestamp"
+        ).fetchall()
+        remaining = {}
+        for _, _, body_hash in rows:
+            remaining[body_hash] = remaining.get(body_hash, 0) + 1
+        for spider, fingerprint, body_hash in rows:
+            if total <= self.max_bytes:
+                break
+            self.conn.execute(
+                "DELETE FROM responses WHERE spider = ? AND fingerprint = ?",
+                (spider, fingerprint),
+            )
+            remaining[body_hash] -= 1
+            # Bodies are shared between entries, so space is only freed once the last
+            # entry referencing a body is removed
+            if remaining[body_hash] == 0:
+                total -= sizes[body_hash]
+        logger.debug(f"Evicted HTTP cache entries down to {total} bytes")
+
+    def _get_key(self, request: Request) -> str:
+        return self._fingerprinter.fingerprint(request).hex()
+
+    def _get_object_path(self, body_hash: str) -> str:
+        return os.path.join(self.cachedir, "objects", body_hash[:2], body_hash)
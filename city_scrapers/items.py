@@ -0,0 +1,83 @@
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Iterator, Optional
+
+from itemadapter import ItemAdapter
+from itemadapter.adapter import DictAdapter
+
+
+class CompactRecord(Mapping):
+    """Read-only mapping storing its fields in ``__slots__`` rather than a dict, for
+    nested meeting values like locations and links.
+
+    Records compare equal to dicts with the same values and are converted to dicts
+    when items are exported, since they're registered with ``ItemAdapter``.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        values = dict(zip(self.__slots__, args), **kwargs)
+        for key in self.__slots__:
+            object.__setattr__(self, key, values.get(key))
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{self.__class__.__name__} is read-only")
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def __reduce__(self):
+        return (self.__class__, tuple(getattr(self, key) for key in self.__slots__))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self)!r})"
+
+
+class Location(CompactRecord):
+    """Meeting location, which is usually shared by every meeting from an agency. Use
+    ``get_location`` to get a shared instance.
+    """
+
+    __slots__ = ("name", "address")
+
+    def __reduce__(self):
+        # Unpickled locations are shared as well
+        return (get_location, (self.name, self.address))
+
+
+class Link(CompactRecord):
+    """Meeting link"""
+
+    __slots__ = ("href", "title")
+
+
+@lru_cache(maxsize=1024)
+def get_location(name: Optional[str], address: Optional[str]) -> Location:
+    """Get a shared ``Location`` for a name and address"""
+    return Location(name, address)
+
+
+class CompactRecordAdapter(DictAdapter):
+    """Adapter so exporters and ``ItemAdapter.asdict`` convert compact records to
+    dicts
+    """
+
+    @classmethod
+    def is_item(cls, item: Any) -> bool:
+        return isinstance(item, CompactRecord)
+
+    @classmethod
+    def is_item_class(cls, item_class: type) -> bool:
+        return issubclass(item_class, CompactRecord)
+
+
+ItemAdapter.ADAPTER_CLASSES.appendleft(CompactRecordAdapter)
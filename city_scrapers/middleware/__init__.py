@@ -0,0 +1,18 @@
+from .circuit import CircuitBreakerMiddleware  # noqa
+from .concurrency import ProcessConcurrencyMiddleware  # noqa
+from .conditional import CachedItemsMiddleware, ConditionalRequestMiddleware  # noqa
+from .mock import MockAgencyMiddleware  # noqa
+from .robotstxt import CachedRobotsTxtMiddleware  # noqa
+from .shared import SharedResponseMiddleware  # noqa
+from .wayback import CityScrapersWaybackMiddleware  # noqa
+
+__all__ = [
+    "CachedItemsMiddleware",
+    "CachedRobotsTxtMiddleware",
+    "CircuitBreakerMiddleware",
+    "CityScrapersWaybackMiddleware",
+    "ConditionalRequestMiddleware",
+    "MockAgencyMiddleware",
+    "ProcessConcurrencyMiddleware",
+    "SharedResponseMiddleware",
+]
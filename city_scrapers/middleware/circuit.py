@@ -0,0 +1,237 @@
+import logging
+import os
+import sqlite3
+from collections import deque
+from time import time
+from typing import Deque, Dict, List, Mapping, Optional, Set
+
+from scrapy import Request, Spider, signals
+from scrapy.crawler import Crawler
+from scrapy.exceptions import IgnoreRequest, NotConfigured
+from scrapy.http import Response
+from scrapy.utils.httpobj import urlparse_cached
+from scrapy.utils.project import data_path
+from twisted.internet.defer import Deferred
+
+logger = logging.getLogger(__name__)
+
+PROBE_META_KEY = "_circuit_breaker_probe"
+CLOSE_REASON = "circuit_breaker_open"
+
+
+class CircuitBreakerMiddleware:
+    """Downloader middleware that stops requesting a host once too many of its recent
+    requests have failed, so one unresponsive site doesn't keep a run going through
+    retries and throttling delays.
+
+    Each host's last ``window`` requests are tracked with the settings for the host in
+    CITY_SCRAPERS_CIRCUIT_BREAKER (falling back to the ``"*"`` entry). Download errors,
+    429 and 5xx responses and responses slower than ``max_latency`` seconds are
+    failures, and once at least ``min_requests`` have been made with a failure rate of
+    ``failure_rate`` or more the host's circuit is opened. Requests to the host are
+    then ignored and the spider is closed with the reason ``circuit_breaker_open``.
+
+    Open hosts are saved in an SQLite file relative to the project's .scrapy directory.
+    On the next run they're half-open: the first request to the host is sent on its own
+    and closes the circuit if it succeeds, while a failure opens it again. Other
+    requests to the host wait for it. Each host's failure rate and average latency are
+    added to the stats when the spider closes as ``circuit_breaker/<host>/*``.
+    """
+
+    _connections: Dict[str, sqlite3.Connection] = {}
+
+    def __init__(self, crawler: Crawler):
+        self.crawler = crawler
+        self.stats = crawler.stats
+        settings = crawler.settings
+        self.host_settings: Mapping[str, Mapping] = settings.getdict(
+            "CITY_SCRAPERS_CIRCUIT_BREAKER"
+        )
+        self.conn = self.connect(
+            data_path(settings.get("CITY_SCRAPERS_CIRCUIT_BREAKER_DB"))
+        )
+        self.outcomes: Dict[str, Deque[bool]] = {}
+        self.latencies: Dict[str, List[float]] = {}
+        self.open_hosts: Set[str] = set()
+        # Half-open hosts, with requests waiting for the probe once it's been sent
+        self.half_open: Dict[str, Optional[List[Deferred]]] = {}
+        crawler.signals.connect(self._spider_closed, signal=signals.spider_closed)
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler):
+        if not crawler.settings.getbool("CITY_SCRAPERS_CIRCUIT_BREAKER_ENABLED"):
+            raise NotConfigured
+        return cls(crawler)
+
+    @classmethod
+    def connect(cls, path: str) -> sqlite3.Connection:
+        """Get a connection to the store, shared by crawlers in the same process"""
+        if path not in cls._connections:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            conn = sqlite3.connect(path)
+            with conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS circuits (
+                        host TEXT PRIMARY KEY,
+                        timestamp REAL NOT NULL
+                    )
+                    """
+                )
+            cls._connections[path] = conn
+        return cls._connections[path]
+
+    def get_host_settings(self, host: str) -> Dict:
+        return {
+            "window": 20,
+            "min_requests": 5,
+            "failure_rate": 0.5,
+            "max_latency": 30.0,
+            **self.host_settings.get("*", {}),
+            **self.host_settings.get(host, {}),
+        }
+
+    def process_request(self, request: Request, spider: Spider):
+        host = urlparse_cached(request).hostname
+        if not host:
+            return None
+        if host not in self.outcomes:
+            self._load_host(host)
+        if host in self.open_hosts:
+            self.stats.inc_value("circuit_breaker/ignored", spider=spider)
+            raise IgnoreRequest(f"Circuit breaker open for {host}")
+        if host not in self.half_open:
+            return None
+        waiting = self.half_open[host]
+        if waiting is None:
+            self.half_open[host] = []
+            self.stats.inc_value("circuit_breaker/probes", spider=spider)
+            request.meta[PROBE_META_KEY] = True
+            return None
+        # Check again once the probe has finished
+        dfd = Deferred()
+        dfd.addCallback(lambda _: self.process_request(request, spider))
+        waiting.append(dfd)
+        return dfd
+
+    def process_response(
+        self, request: Request, response: Response, spider: Spider
+    ) -> Response:
+        host = urlparse_cached(request).hostname
+        latency = request.meta.get("download_latency")
+        if "cached" in response.flags or latency is None:
+            # Not downloaded, like responses from the HTTP cache or shared responses
+            self._release_probe(host, request)
+            return response
+        failed = (
+            response.status == 429
+            or response.status >= 500
+            or latency > self.get_host_settings(host)["max_latency"]
+        )
+        self._record(host, failed, latency, request, spider)
+        return response
+
+    def process_exception(
+        self, request: Request, exception: Exception, spider: Spider
+    ) -> None:
+        host = urlparse_cached(request).hostname
+        if isinstance(exception, IgnoreRequest):
+            self._release_probe(host, request)
+            return
+        self._record(host, True, request.meta.get("download_latency"), request, spider)
+
+    def _load_host(self, host: str):
+        """Start tracking a host, half-opening its circuit if it was left open"""
+        self.outcomes[host] = deque(maxlen=self.get_host_settings(host)["window"])
+        self.latencies[host] = []
+        row = self.conn.execute(
+            "SELECT timestamp FROM circuits WHERE host = ?", (host,)
+        ).fetchone()
+        if row:
+            logger.info(f"Circuit breaker for {host} is half-open")
+            self.half_open[host] = None
+
+    def _record(
+        self,
+        host: str,
+        failed: bool,
+        latency: Optional[float],
+        request: Request,
+        spider: Spider,
+    ):
+        if host in self.open_hosts or host not in self.outcomes:
+            return
+        self.stats.inc_value(f"circuit_breaker/{host}/requests", spider=spider)
+        if failed:
+            self.stats.inc_value(f"circuit_breaker/{host}/failures", spider=spider)
+        if latency is not None:
+            self.latencies[host].append(latency)
+        if request.meta.get(PROBE_META_KEY) and host in self.half_open:
+            if failed:
+                self._open(host, spider, "half-open request failed")
+            else:
+                logger.info(f"Closing circuit breaker for {host}")
+                with self.conn:
+                    self.conn.execute("DELETE FROM circuits WHERE host = ?", (host,))
+            self._resume(host)
+            return
+        outcomes = self.outcomes[host]
+        outcomes.append(failed)
+        host_settings = self.get_host_settings(host)
+        failure_rate = sum(outcomes) / len(outcomes)
+        if (
+            len(outcomes) >= host_settings["min_requests"]
+            and failure_rate >= host_settings["failure_rate"]
+        ):
+            self._open(
+                host,
+                spider,
+                f"{sum(outcomes)} of the last {len(outcomes)} requests failed",
+            )
+
+    def _open(self, host: str, spider: Spider, reason: str):
+        logger.error(f"Opening circuit breaker for {host}: {reason}")
+        self.open_hosts.add(host)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO circuits VALUES (?, ?)", (host, time())
+            )
+        self.stats.inc_value("circuit_breaker/opened", spider=spider)
+        self.crawler.engine.close_spider(spider, CLOSE_REASON)
+
+    def _release_probe(self, host: Optional[str], request: Request):
+        """Let the next request be the probe if the probe wasn't downloaded"""
+        if request.meta.get(PROBE_META_KEY) and host in self.half_open:
+            self._resume(host, half_open=True)
+
+    def _resume(self, host: str, half_open: bool = False):
+        """Check requests waiting for a half-open host's probe again once the circuit
+        has been closed or opened, or with the first of them as the new probe
+        """
+        waiting = self.half_open.pop(host) or []
+        if half_open:
+            self.half_open[host] = None
+        for dfd in waiting:
+            dfd.callback(None)
+
+    def _spider_closed(self, spider: Spider):
+        for host, latencies in self.latencies.items():
+            prefix = f"circuit_breaker/{host}"
+            requests = self.stats.get_value(f"{prefix}/requests", spider=spider)
+            if not requests:
+                continue
+            failures = self.stats.get_value(f"{prefix}/failures", 0, spider=spider)
+            self.stats.set_value(
+                f"{prefix}/state",
+                "open" if host in self.open_hosts else "closed",
+                spider=spider,
+            )
+            self.stats.set_value(
+                f"{prefix}/failure_rate", round(failures / requests, 3), spider=spider
+            )
+            if latencies:
+                self.stats.set_value(
+                    f"{prefix}/latency_avg",
+                    round(sum(latencies) / len(latencies), 3),
+                    spider=spider,
+                )
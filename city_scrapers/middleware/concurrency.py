@@ -0,0 +1,76 @@
+from typing import Dict, Optional, Tuple
+
+from scrapy import Request, Spider
+from scrapy.crawler import Crawler
+from scrapy.exceptions import NotConfigured
+from scrapy.http import Response
+from scrapy.utils.defer import maybe_deferred_to_future
+from scrapy.utils.httpobj import urlparse_cached
+from twisted.internet.defer import DeferredSemaphore
+
+META_KEY = "_process_concurrency_slots"
+
+
+class ProcessConcurrencyMiddleware:
+    """Downloader middleware for capping concurrent requests across every crawler
+    running in the same process.
+
+    Scrapy's CONCURRENT_REQUESTS settings only apply within a single crawler, so when
+    all spiders are run together with ``scrapy crawlall`` their limits add up. The
+    semaphores here are shared at the class level so that the global and per-domain
+    caps hold for the process as a whole.
+    """
+
+    _semaphores: Dict[Tuple[str, int], DeferredSemaphore] = {}
+
+    def __init__(self, max_requests: int = 0, max_requests_per_domain: int = 0):
+        self.max_requests = max_requests
+        self.max_requests_per_domain = max_requests_per_domain
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler):
+        max_requests = crawler.settings.getint("CITY_SCRAPERS_MAX_CONCURRENT_REQUESTS")
+        max_requests_per_domain = crawler.settings.getint(
+            "CITY_SCRAPERS_MAX_CONCURRENT_REQUESTS_PER_DOMAIN"
+        )
+        if not max_requests and not max_requests_per_domain:
+            raise NotConfigured
+        return cls(
+            max_requests=max_requests, max_requests_per_domain=max_requests_per_domain
+        )
+
+    def _get_semaphore(self, key: str, limit: int) -> DeferredSemaphore:
+        if (key, limit) not in self._semaphores:
+            self._semaphores[(key, limit)] = DeferredSemaphore(limit)
+        return self._semaphores[(key, limit)]
+
+    def _release(self, request: Request):
+        for semaphore in request.meta.pop(META_KEY, []):
+            semaphore.release()
+
+    async def process_request(self, request: Request, spider: Spider) -> None:
+        """Wait for a free slot for the request's domain and then a global slot"""
+        semaphores = []
+        if self.max_requests_per_domain:
+            domain = urlparse_cached(request).hostname or ""
+            semaphores.append(self._get_semaphore(domain, self.max_requests_per_domain))
+        if self.max_requests:
+            semaphores.append(self._get_semaphore("*", self.max_requests))
+        # Acquired slots are stored on the request so they're released exactly once,
+        # and are popped before retry or redirect middleware can copy the meta
+        request.meta[META_KEY] = []
+        for semaphore in semaphores:
+            await maybe_deferred_to_future(semaphore.acquire())
+            request.meta[META_KEY].append(semaphore)
+
+    def process_response(
+        self, request: Request, response: Response, spider: Spider
+    ) -> Response:
+        self._release(request)
+        return response
+
+    def process_exception(
+        self, request: Request, exception: Exception, spider: Spider
+    ) -> Optional[Response]:
+        self._release(request)
+        return None
@@ -0,0 +1,220 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from city_scrapers_core.constants import CANCELLED
+from city_scrapers_core.items import Meeting
+from scrapy import Request, Spider
+from scrapy.crawler import Crawler
+from scrapy.exceptions import NotConfigured
+from scrapy.http import Response
+from scrapy.statscollectors import StatsCollector
+from scrapy.utils.project import data_path
+
+UNCHANGED_META_KEY = "conditional_unchanged"
+VALIDATORS_META_KEY = "_conditional_validators"
+# Set in a request's meta to always download and parse it in full
+DONT_CONDITIONAL_META_KEY = "dont_conditional"
+
+
+def skip_conditional(request: Request) -> bool:
+    """Check if a request is excluded from conditional requests and cached items"""
+    return (
+        request.method != "GET"
+        or request.meta.get("dont_cache", False)
+        or request.meta.get(DONT_CONDITIONAL_META_KEY, False)
+    )
+
+
+class StoredResponse(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body_hash: str
+    items: bytes
+
+
+class ValidatorStore:
+    """SQLite store of response validators, body hashes and the items each response
+    produced, keyed by spider name and URL.
+    """
+
+    _stores: Dict[str, "ValidatorStore"] = {}
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path)
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    spider TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body_hash TEXT NOT NULL,
+                    items BLOB NOT NULL,
+                    PRIMARY KEY (spider, url)
+                )
+                """
+            )
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "ValidatorStore":
+        """Get the store for the crawler's settings, shared between middlewares and
+        between crawlers in the same process
+        """
+        path = data_path(crawler.settings.get("CITY_SCRAPERS_CONDITIONAL_DB"))
+        if path not in cls._stores:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            cls._stores[path] = cls(path)
+        return cls._stores[path]
+
+    def get(self, spider: str, url: str) -> Optional[StoredResponse]:
+        row = self.conn.execute(
+            "SELECT etag, last_modified, body_hash, items FROM responses "
+            "WHERE spider = ? AND url = ?",
+            (spider, url),
+        ).fetchone()
+        return StoredResponse(*row) if row else None
+
+    def set(self, spider: str, url: str, response: StoredResponse):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (spider, url, *response),
+            )
+
+    def delete(self, spider: str, url: str):
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM responses WHERE spider = ? AND url = ?", (spider, url)
+            )
+
+
+class ConditionalRequestMiddleware:
+    """Downloader middleware for sending conditional requests with the ETag and
+    Last-Modified validators stored from the previous run.
+
+    Responses that are either a 304 or have the same body as the previous run are
+    marked as unchanged in their meta so that ``CachedItemsMiddleware`` can skip
+    parsing them. New validators are only saved by ``CachedItemsMiddleware`` once the
+    response's items have been stored, so a failed parse is retried on the next run.
+    Requests with ``dont_cache`` or ``dont_conditional`` set in their meta are left
+    alone.
+    """
+
+    def __init__(self, store: ValidatorStore, stats: StatsCollector):
+        self.store = store
+        self.stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler):
+        if not crawler.settings.getbool("CITY_SCRAPERS_CONDITIONAL_ENABLED"):
+            raise NotConfigured
+        return cls(ValidatorStore.from_crawler(crawler), crawler.stats)
+
+    def process_request(self, request: Request, spider: Spider) -> None:
+        if skip_conditional(request):
+            return
+        stored = self.store.get(spider.name, request.url)
+        if not stored:
+            return
+        if stored.etag:
+            request.headers.setdefault("If-None-Match", stored.etag)
+        if stored.last_modified:
+            request.headers.setdefault("If-Modified-Since", stored.last_modified)
+        request.meta["handle_httpstatus_list"] = [
+            *request.meta.get("handle_httpstatus_list", []),
+            304,
+        ]
+
+    def process_response(
+        self, request: Request, response: Response, spider: Spider
+    ) -> Response:
+        if skip_conditional(request):
+            return response
+        if response.status == 304:
+            self.stats.inc_value("conditional/not_modified", spider=spider)
+            request.meta[UNCHANGED_META_KEY] = True
+            return response
+        if response.status != 200:
+            return response
+        body_hash = hashlib.sha256(response.body).hexdigest()
+        stored = self.store.get(spider.name, response.url)
+        if stored and stored.body_hash == body_hash:
+            self.stats.inc_value("conditional/identical", spider=spider)
+            request.meta[UNCHANGED_META_KEY] = True
+            return response
+        self.stats.inc_value("conditional/miss", spider=spider)
+        request.meta[VALIDATORS_META_KEY] = (
+            self._get_header(response, "ETag"),
+            self._get_header(response, "Last-Modified"),
+            body_hash,
+        )
+        return response
+
+    def _get_header(self, response: Response, header: str) -> Optional[str]:
+        value = response.headers.get(header)
+        return value.decode("latin-1") if value else None
+
+
+class CachedItemsMiddleware:
+    """Spider middleware for storing the items parsed from each response and emitting
+    them again without parsing when ``ConditionalRequestMiddleware`` finds the response
+    is unchanged.
+
+    Responses whose callbacks yield requests aren't stored, since only items can be
+    emitted again. Statuses of re-emitted meetings are refreshed since meetings may
+    have passed since the last run.
+    """
+
+    def __init__(self, store: ValidatorStore, stats: StatsCollector):
+        self.store = store
+        self.stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler):
+        if not crawler.settings.getbool("CITY_SCRAPERS_CONDITIONAL_ENABLED"):
+            raise NotConfigured
+        return cls(ValidatorStore.from_crawler(crawler), crawler.stats)
+
+    def process_spider_output(
+        self, response: Response, result: Iterable, spider: Spider
+    ) -> Iterable:
+        if response.meta.get(UNCHANGED_META_KEY):
+            stored = self.store.get(spider.name, response.url)
+            if stored:
+                # The callback's output is a generator that's never iterated, so the
+                # response isn't parsed
+                yield from self._replay(stored, spider)
+                return
+        validators = response.meta.get(VALIDATORS_META_KEY)
+        if not validators:
+            yield from result
+            return
+        items = []
+        cacheable = True
+        for output in result:
+            if isinstance(output, Request):
+                cacheable = False
+            else:
+                items.append(pickle.dumps(output))
+            yield output
+        if cacheable:
+            self.store.set(
+                spider.name,
+                response.url,
+                StoredResponse(*validators, pickle.dumps(items)),
+            )
+        else:
+            self.store.delete(spider.name, response.url)
+
+    def _replay(self, stored: StoredResponse, spider: Spider) -> Iterable:
+        self.stats.inc_value("conditional/hit", spider=spider)
+        for item_bytes in pickle.loads(stored.items):
+            item = pickle.loads(item_bytes)
+            if isinstance(item, Meeting) and item.get("status") != CANCELLED:
+                item["status"] = spider._get_status(item)
+            self.stats.inc_value("conditional/items_replayed", spider=spider)
+            yield item
@@ -0,0 +1,27 @@
+from scrapy import Request, Spider
+from scrapy.crawler import Crawler
+from scrapy.exceptions import NotConfigured
+
+
+class MockAgencyMiddleware:
+    """Downloader middleware sending every request through the mock agency server at
+    CITY_SCRAPERS_MOCK_AGENCY_URL as an HTTP proxy, for load testing crawls with
+    ``benchmarks.mock_agency``. HTTPS URLs are requested over HTTP instead since the
+    server can't terminate TLS for the agencies' hosts.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler):
+        url = crawler.settings.get("CITY_SCRAPERS_MOCK_AGENCY_URL")
+        if not url:
+            raise NotConfigured
+        return cls(url)
+
+    def process_request(self, request: Request, spider: Spider):
+        if request.url.startswith("https://"):
+            return request.replace(url="http://" + request.url[len("https://") :])
+        request.meta["proxy"] = self.url
+        return None
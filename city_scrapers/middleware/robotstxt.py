@@ -0,0 +1,115 @@
+import os
+import sqlite3
+from time import time
+from typing import Dict, Optional
+
+from scrapy import Request, Spider
+from scrapy.crawler import Crawler
+from scrapy.downloadermiddlewares.robotstxt import RobotsTxtMiddleware
+from scrapy.extensions.httpcache import parse_cachecontrol, rfc1123_to_epoch
+from scrapy.http import Response
+from scrapy.utils.httpobj import urlparse_cached
+from scrapy.utils.project import data_path
+
+
+class RobotsTxtStore:
+    """SQLite store of robots.txt bodies and when they expire, keyed by netloc"""
+
+    _stores: Dict[str, "RobotsTxtStore"] = {}
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path)
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS robots (
+                    netloc TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    expires REAL NOT NULL
+                )
+                """
+            )
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "RobotsTxtStore":
+        """Get the store for the crawler's settings, shared between crawlers in the
+        same process
+        """
+        path = data_path(crawler.settings.get("CITY_SCRAPERS_ROBOTSTXT_DB"))
+        if path not in cls._stores:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            cls._stores[path] = cls(path)
+        return cls._stores[path]
+
+    def get(self, netloc: str) -> Optional[bytes]:
+        row = self.conn.execute(
+            "SELECT body FROM robots WHERE netloc = ? AND expires > ?",
+            (netloc, time()),
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, netloc: str, body: bytes, expires: float):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO robots VALUES (?, ?, ?)",
+                (netloc, body, expires),
+            )
+
+
+class CachedRobotsTxtMiddleware(RobotsTxtMiddleware):
+    """Replacement for Scrapy's RobotsTxtMiddleware storing each host's robots.txt in
+    an SQLite file relative to the project's .scrapy directory, so runs in other
+    processes use it without downloading it again.
+
+    Files are kept for as long as their ``Cache-Control`` or ``Expires`` headers allow,
+    up to CITY_SCRAPERS_ROBOTSTXT_TTL seconds, which is also used when they have
+    neither. Files sent with ``no-store`` or ``no-cache`` and server errors aren't
+    stored. Hosts loaded from the store are counted in the ``robotstxt/cache_hit``
+    stat instead of ``robotstxt/request_count``.
+    """
+
+    def __init__(self, crawler: Crawler):
+        super().__init__(crawler)
+        self.store = RobotsTxtStore.from_crawler(crawler)
+        self.ttl = crawler.settings.getint("CITY_SCRAPERS_ROBOTSTXT_TTL")
+
+    def robot_parser(self, request: Request, spider: Spider):
+        netloc = urlparse_cached(request).netloc
+        if netloc not in self._parsers:
+            body = self.store.get(netloc)
+            if body is not None:
+                self.crawler.stats.inc_value("robotstxt/cache_hit")
+                self._parsers[netloc] = self._parserimpl.from_crawler(
+                    self.crawler, body
+                )
+        return super().robot_parser(request, spider)
+
+    def _parse_robots(self, response: Response, netloc: str, spider: Spider):
+        lifetime = self.get_lifetime(response)
+        if lifetime > 0 and response.status < 500:
+            self.store.set(netloc, response.body, time() + lifetime)
+        return super()._parse_robots(response, netloc, spider)
+
+    def get_lifetime(self, response: Response) -> float:
+        """Seconds a robots.txt response can be reused for, capped at the TTL"""
+        cache_control = parse_cachecontrol(response.headers.get("Cache-Control", b""))
+        if b"no-store" in cache_control or b"no-cache" in cache_control:
+            return 0
+        age = self._get_seconds(response.headers.get("Age")) or 0
+        for directive in [b"s-maxage", b"max-age"]:
+            max_age = self._get_seconds(cache_control.get(directive))
+            if max_age is not None:
+                return min(max_age - age, self.ttl)
+        expires = response.headers.get("Expires")
+        if expires is not None:
+            # Invalid dates mean the response has already expired
+            expires_at = rfc1123_to_epoch(expires) or 0
+            date = rfc1123_to_epoch(response.headers.get("Date")) or time()
+            return min(expires_at - date - age, self.ttl)
+        return self.ttl
+
+    def _get_seconds(self, value: Optional[bytes]) -> Optional[int]:
+        try:
+            return max(0, int(value))
+        except (TypeError, ValueError):
+            return None
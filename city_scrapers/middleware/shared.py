@@ -0,0 +1,107 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set
+
+from scrapy import Request, Spider, signals
+from scrapy.crawler import Crawler
+from scrapy.http import Response
+from scrapy.statscollectors import StatsCollector
+from scrapy.utils.defer import maybe_deferred_to_future
+from twisted.internet.defer import Deferred
+
+META_KEY = "share_response"
+OWNER_META_KEY = "_share_response_owner"
+
+
+class SharedResponseMiddleware:
+    """Downloader middleware for sharing responses between crawlers in the same process.
+
+    Requests with ``share_response`` set in their meta are downloaded once per process.
+    Identical requests from other spiders wait for the first download to finish and
+    receive a copy of its response instead of downloading it again. If the first
+    download fails, waiting requests fall through and are downloaded as usual.
+
+    Only the CITY_SCRAPERS_SHARED_RESPONSE_MAX most recently used responses are kept,
+    and they're dropped once every crawler that was running has closed, so a later
+    crawl in the same process starts with an empty cache.
+    """
+
+    _responses: "OrderedDict[str, Response]" = OrderedDict()
+    _waiters: Dict[str, List[Deferred]] = {}
+    _open_crawlers: Set[Crawler] = set()
+
+    def __init__(self, crawler: Crawler, stats: StatsCollector, max_responses: int):
+        self.crawler = crawler
+        self.stats = stats
+        self.max_responses = max_responses
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler):
+        mw = cls(
+            crawler,
+            crawler.stats,
+            crawler.settings.getint("CITY_SCRAPERS_SHARED_RESPONSE_MAX"),
+        )
+        crawler.signals.connect(mw.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(mw.spider_closed, signal=signals.spider_closed)
+        return mw
+
+    def spider_opened(self, spider: Spider):
+        self._open_crawlers.add(self.crawler)
+
+    def spider_closed(self, spider: Spider):
+        self._open_crawlers.discard(self.crawler)
+        if not self._open_crawlers:
+            self._responses.clear()
+
+    def _get_key(self, request: Request) -> str:
+        return self.crawler.request_fingerprinter.fingerprint(request).hex()
+
+    async def process_request(
+        self, request: Request, spider: Spider
+    ) -> Optional[Response]:
+        if not request.meta.get(META_KEY):
+            return None
+        key = self._get_key(request)
+        shared = self._responses.get(key)
+        if shared is not None:
+            self._responses.move_to_end(key)
+        elif key in self._waiters:
+            waiter = Deferred()
+            self._waiters[key].append(waiter)
+            shared = await maybe_deferred_to_future(waiter)
+            if shared is None:
+                self.stats.inc_value("shared_response/fallback", spider=spider)
+                return None
+        else:
+            # Nothing downloaded or in flight yet, so this request fills the cache
+            self._waiters[key] = []
+            request.meta[OWNER_META_KEY] = True
+            self.stats.inc_value("shared_response/miss", spider=spider)
+            return None
+        self.stats.inc_value("shared_response/hit", spider=spider)
+        return shared.replace(request=request)
+
+    def process_response(
+        self, request: Request, response: Response, spider: Spider
+    ) -> Response:
+        if request.meta.pop(OWNER_META_KEY, False):
+            self._finish(
+                self._get_key(request), response if response.status == 200 else None
+            )
+        return response
+
+    def process_exception(
+        self, request: Request, exception: Exception, spider: Spider
+    ) -> None:
+        if request.meta.pop(OWNER_META_KEY, False):
+            self._finish(self._get_key(request), None)
+
+    def _finish(self, key: str, response: Optional[Response]):
+        """Store the owner's response and pass it to any requests waiting on it"""
+        waiters = self._waiters.pop(key, [])
+        if response is not None:
+            self._responses[key] = response
+            while len(self._responses) > self.max_responses:
+                self._responses.popitem(last=False)
+        for waiter in waiters:
+            waiter.callback(response)
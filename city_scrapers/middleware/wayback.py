@@ -0,0 +1,294 @@
+import logging
+import os
+import random
+import sqlite3
+from time import time
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import quote
+
+from city_scrapers_core.items import Meeting
+from scrapy import Spider, signals
+from scrapy.crawler import Crawler
+from scrapy.http import Response
+from scrapy.statscollectors import StatsCollector
+from scrapy.utils.project import data_path
+from twisted.internet import defer, task
+from twisted.python.failure import Failure
+from twisted.web.client import Agent, HTTPConnectionPool, readBody
+from twisted.web.http_headers import Headers
+
+logger = logging.getLogger(__name__)
+
+
+class WaybackArchiver:
+    """Queue of URLs submitted to the Wayback Machine in the background, shared by
+    every crawler in the process.
+
+    URLs are deduplicated against URLs already queued and URLs archived within
+    CITY_SCRAPERS_WAYBACK_TTL, which are stored in an SQLite file relative to the
+    project's .scrapy directory. New URLs are released for submission in batches of
+    CITY_SCRAPERS_WAYBACK_BATCH_SIZE, then submitted to CITY_SCRAPERS_WAYBACK_ENDPOINT
+    with up to CITY_SCRAPERS_WAYBACK_CONCURRENCY requests at a time and at least
+    CITY_SCRAPERS_WAYBACK_DELAY seconds between requests. URLs that aren't archived by
+    the end of the run stay pending and are submitted on the next run. URLs rejected
+    with a 4xx status other than 429 are dropped, and URLs are dropped after
+    CITY_SCRAPERS_WAYBACK_MAX_ATTEMPTS server errors or failed requests.
+    """
+
+    _archivers: Dict[str, "WaybackArchiver"] = {}
+
+    # Seconds to pause submissions after a 429 response
+    rate_limit_backoff = 60
+
+    def __init__(
+        self,
+        path: str,
+        endpoint: str,
+        concurrency: int = 2,
+        delay: float = 5.0,
+        ttl: int = 7 * 24 * 60 * 60,
+        batch_size: int = 50,
+        max_attempts: int = 3,
+        user_agent: Optional[str] = None,
+        clock=None,
+    ):
+        if clock is None:
+            from twisted.internet import reactor as clock
+        self.clock = clock
+        self.endpoint = endpoint
+        self.delay = delay
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.user_agent = user_agent
+        self.semaphore = defer.DeferredSemaphore(concurrency)
+        self.next_submit = 0.0
+        self.in_flight: Dict[str, defer.Deferred] = {}
+        self._agent = None
+
+        self.conn = sqlite3.connect(path)
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS archived "
+                "(url TEXT PRIMARY KEY, timestamp REAL NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS pending "
+                "(url TEXT PRIMARY KEY, attempts INTEGER NOT NULL DEFAULT 0)"
+            )
+            columns = [
+                row[1] for row in self.conn.execute("PRAGMA table_info(pending)")
+            ]
+            if "attempts" not in columns:
+                self.conn.execute(
+                    "ALTER TABLE pending ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0"
+                )
+            self.conn.execute(
+                "DELETE FROM archived WHERE timestamp < ?", (time() - ttl,)
+            )
+        self.known = {url for (url,) in self.conn.execute("SELECT url FROM archived")}
+        # URLs left over from an earlier run are submitted first
+        self.batch: List[str] = [
+            url for (url,) in self.conn.execute("SELECT url FROM pending")
+        ]
+        self.known.update(self.batch)
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "WaybackArchiver":
+        """Get the archiver for the crawler's settings, shared between crawlers in the
+        same process so limits apply to the process as a whole
+        """
+        settings = crawler.settings
+        path = data_path(settings.get("CITY_SCRAPERS_WAYBACK_DB"))
+        if path not in cls._archivers:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            cls._archivers[path] = cls(
+                path,
+                settings.get("CITY_SCRAPERS_WAYBACK_ENDPOINT"),
+                concurrency=settings.getint("CITY_SCRAPERS_WAYBACK_CONCURRENCY"),
+                delay=settings.getfloat("CITY_SCRAPERS_WAYBACK_DELAY"),
+                ttl=settings.getint("CITY_SCRAPERS_WAYBACK_TTL"),
+                batch_size=settings.getint("CITY_SCRAPERS_WAYBACK_BATCH_SIZE"),
+                max_attempts=settings.getint("CITY_SCRAPERS_WAYBACK_MAX_ATTEMPTS"),
+                user_agent=settings.get("USER_AGENT"),
+            )
+        return cls._archivers[path]
+
+    def add(self, urls: Iterable[str]) -> int:
+        """Queue URLs that haven't been queued or archived recently, returning the
+        number of URLs queued
+        """
+        new_urls = [
+            url
+            for url in dict.fromkeys(urls)
+            if url and url not in self.known and "web.archive.org" not in url
+        ]
+        self.known.update(new_urls)
+        self.batch.extend(new_urls)
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+        return len(new_urls)
+
+    def flush(self):
+        """Release the current batch for submission"""
+        batch, self.batch = self.batch, []
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO pending (url) VALUES (?)",
+                [(url,) for url in batch],
+            )
+        for url in batch:
+            self.in_flight[url] = self.semaphore.run(self._submit_when_ready, url)
+            self.in_flight[url].addBoth(self._finish, url)
+
+    def drain(self, timeout: float) -> defer.Deferred:
+        """Flush the current batch and wait for submissions to finish, for up to
+        ``timeout`` seconds
+        """
+        self.flush()
+        if not self.in_flight:
+            return defer.succeed(None)
+        waiting = defer.DeferredList(list(self.in_flight.values()), consumeErrors=True)
+        timer = self.clock.callLater(timeout, waiting.cancel)
+        waiting.addBoth(self._stop_timer, timer)
+        return waiting
+
+    def submit(self, url: str) -> defer.Deferred:
+        """Submit a URL to the endpoint, returning a Deferred firing with the status"""
+        if self._agent is None:
+            self._agent = Agent(self.clock, pool=HTTPConnectionPool(self.clock))
+        headers = Headers()
+        if self.user_agent:
+            headers.addRawHeader(b"User-Agent", self.user_agent.encode())
+        d = self._agent.request(
+            b"GET",
+            self.endpoint.format(url=quote(url, safe=":/?&=%")).encode(),
+            headers,
+        )
+        d.addCallback(self._read_status)
+        return d
+
+    def _read_status(self, response) -> defer.Deferred:
+        d = readBody(response)
+        # The body isn't needed, so a download cut short doesn't matter
+        d.addBoth(lambda _: response.code)
+        return d
+
+    def _submit_when_ready(self, url: str) -> defer.Deferred:
+        now = self.clock.seconds()
+        wait = max(self.next_submit - now, 0)
+        self.next_submit = now + wait + self.delay
+        d = task.deferLater(self.clock, wait, self.submit, url)
+        d.addCallback(self._handle_status, url)
+        return d
+
+    def _handle_status(self, status: int, url: str):
+        if status == 429:
+            logger.info(f"Wayback Machine rate limited, pausing submissions: {url}")
+            self.next_submit = self.clock.seconds() + self.rate_limit_backoff
+            return self._submit_when_ready(url)
+        if 200 <= status < 400:
+            with self.conn:
+                self.conn.execute("DELETE FROM pending WHERE url = ?", (url,))
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO archived VALUES (?, ?)", (url, time())
+                )
+        elif status < 500:
+            logger.warning(f"Wayback Machine returned {status} for {url}, dropping it")
+            self._drop(url)
+        else:
+            logger.warning(f"Wayback Machine returned {status} for {url}")
+            self._count_attempt(url)
+
+    def _finish(self, result, url: str):
+        self.in_flight.pop(url, None)
+        if isinstance(result, Failure) and not result.check(defer.CancelledError):
+            logger.warning(f"Failed to submit {url} to Wayback Machine: {result.value}")
+            self._count_attempt(url)
+
+    def _count_attempt(self, url: str):
+        """Count a failed attempt at a pending URL, dropping it after max_attempts"""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE pending SET attempts = attempts + 1 WHERE url = ?", (url,)
+            )
+            row = self.conn.execute(
+                "SELECT attempts FROM pending WHERE url = ?", (url,)
+            ).fetchone()
+        if row is not None and row[0] >= self.max_attempts:
+            logger.warning(f"Dropping {url} after {row[0]} failed attempts")
+            self._drop(url)
+
+    def _drop(self, url: str):
+        with self.conn:
+            self.conn.execute("DELETE FROM pending WHERE url = ?", (url,))
+
+    def _stop_timer(self, result, timer):
+        if timer.active():
+            timer.cancel()
+        else:
+            logger.warning(
+                "Timed out waiting on Wayback Machine submissions, unfinished URLs "
+                "will be submitted on the next run"
+            )
+        return None
+
+
+class CityScrapersWaybackMiddleware:
+    """Spider middleware for archiving scraped pages and a sample of each meeting's
+    links in the Wayback Machine through a background ``WaybackArchiver``, so the crawl
+    doesn't wait on archive requests.
+
+    When the spider closes, it waits up to CITY_SCRAPERS_WAYBACK_DRAIN_TIMEOUT seconds
+    for queued URLs to be submitted.
+    """
+
+    MAX_LINKS = 3
+
+    def __init__(
+        self, archiver: WaybackArchiver, stats: StatsCollector, timeout: float
+    ):
+        self.archiver = archiver
+        self.stats = stats
+        self.timeout = timeout
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler):
+        mw = cls(
+            WaybackArchiver.from_crawler(crawler),
+            crawler.stats,
+            crawler.settings.getfloat("CITY_SCRAPERS_WAYBACK_DRAIN_TIMEOUT"),
+        )
+        crawler.signals.connect(mw.spider_closed, signal=signals.spider_closed)
+        return mw
+
+    def process_spider_output(
+        self, response: Response, result: Iterable, spider: Spider
+    ) -> Iterable:
+        urls = []
+        if response.request is not None and response.request.method == "GET":
+            urls.append(response.url)
+        for item in result:
+            urls.extend(self.get_item_urls(item))
+            yield item
+        queued = self.archiver.add(urls)
+        self.stats.inc_value("wayback/queued", queued, spider=spider)
+        self.stats.inc_value("wayback/skipped", len(urls) - queued, spider=spider)
+
+    def spider_closed(self, spider: Spider) -> defer.Deferred:
+        return self.archiver.drain(self.timeout)
+
+    def get_item_urls(self, item) -> List[str]:
+        if isinstance(item, Meeting):
+            links = []
+            if "legistar" in item["source"] and "Calendar.aspx" not in item["source"]:
+                links = [item["source"]]
+            links.extend(
+                self._sample([link.get("href") for link in item.get("links", [])])
+            )
+            return links
+        if isinstance(item, dict):
+            return self._sample([doc.get("url") for doc in item.get("documents", [])])
+        return []
+
+    def _sample(self, urls: List[str]) -> List[str]:
+        return random.sample(urls, min(len(urls), self.MAX_LINKS))
@@ -0,0 +1,6 @@
+from .compact import CompactItemsMixin  # noqa
+from .derived import DerivedFieldsMixin  # noqa
+from .feed import FeedMixin  # noqa
+from .primegov import PrimeGovMixin  # noqa
+
+__all__ = ["CompactItemsMixin", "DerivedFieldsMixin", "FeedMixin", "PrimeGovMixin"]
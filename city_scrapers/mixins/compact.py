@@ -0,0 +1,32 @@
+from typing import Mapping, Optional
+
+from city_scrapers.items import Link, get_location
+
+
+class CompactItemsMixin:
+    """Mixin for spiders building meeting locations and links, which are built as
+    compact records when CITY_SCRAPERS_COMPACT_ITEMS is enabled.
+
+    Compact locations are shared between every meeting with the same location and
+    links are stored in ``__slots__``, which reduces memory use in large backfills.
+    They're converted to dicts when items are exported. Otherwise locations and links
+    are plain dicts.
+    """
+
+    compact_items = False
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider.compact_items = crawler.settings.getbool("CITY_SCRAPERS_COMPACT_ITEMS")
+        return spider
+
+    def _location(self, name: Optional[str], address: Optional[str]) -> Mapping:
+        if self.compact_items:
+            return get_location(name, address)
+        return {"name": name, "address": address}
+
+    def _link(self, href: str, title: Optional[str]) -> Mapping:
+        if self.compact_items:
+            return Link(href, title)
+        return {"href": href, "title": title}
@@ -0,0 +1,66 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Mapping, Optional
+
+from city_scrapers_core.constants import CANCELLED, PASSED, TENTATIVE
+
+from city_scrapers.derived import get_derived
+
+# Words in a meeting's details that mean it isn't happening as scheduled, matching
+# CityScrapersSpider._get_status
+CANCELLED_WORDS = ["cancel", "rescheduled", "postpone"]
+
+
+class DerivedFieldsMixin:
+    """Mixin for ``CityScrapersSpider`` subclasses caching derived meeting fields.
+
+    Cleaned titles and checks of meeting text for cancellations are memoized, since
+    the same titles repeat across many meetings in a backfill and ``MeetingPipeline``
+    cleans each title again. Meeting IDs and whether a meeting's text mentions a
+    cancellation are cached on the meeting with ``get_derived``, so they're only
+    recomputed if the fields they're based on change.
+    """
+
+    # Maximum number of titles and meeting texts to keep
+    cache_size = 1024
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._clean_title = lru_cache(maxsize=self.cache_size)(super()._clean_title)
+        self._has_cancelled_words = lru_cache(maxsize=self.cache_size)(
+            self._has_cancelled_words
+        )
+
+    def _get_id(self, item: Mapping, identifier: Optional[str] = None) -> str:
+        return get_derived(
+            item,
+            "id",
+            lambda: super(DerivedFieldsMixin, self)._get_id(
+                item, identifier=identifier
+            ),
+            item["title"],
+            item["start"],
+            identifier,
+        )
+
+    def _get_status(self, item: Mapping, text: str = "") -> str:
+        title, description = item.get("title", ""), item.get("description", "")
+        # Only whether the text mentions a cancellation is cached, since whether the
+        # meeting has passed depends on when the status is checked
+        cancelled = get_derived(
+            item,
+            "cancelled",
+            lambda: self._has_cancelled_words(" ".join([title, description, text])),
+            title,
+            description,
+            text,
+        )
+        if cancelled:
+            return CANCELLED
+        if item["start"] < datetime.now():
+            return PASSED
+        return TENTATIVE
+
+    def _has_cancelled_words(self, text: str) -> bool:
+        text = text.lower()
+        return any(word in text for word in CANCELLED_WORDS)
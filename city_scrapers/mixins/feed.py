@@ -0,0 +1,107 @@
+from typing import Dict, Iterator, Optional
+
+from city_scrapers_core.items import Meeting
+from lxml import etree
+from scrapy.http import Response
+
+from .compact import CompactItemsMixin
+
+# RSS items and Atom entries in any namespace, which includes RSS 1.0
+ENTRY_TAGS = ["{*}item", "{*}entry"]
+
+
+class FeedMixin(CompactItemsMixin):
+    """Mixin for spiders scraping meetings from RSS or Atom feeds, like the Blackboard
+    and Finalsite calendars used by many agencies.
+
+    The response body is fed to lxml's XML pull parser in chunks, and each ``<item>``
+    or ``<entry>`` is passed to ``parse_entry`` as soon as its closing tag is parsed.
+    Entries are removed from the tree once they've been handled, so memory stays
+    constant however large the feed is.
+
+    Spiders implement ``parse_entry``, which receives a dict of each child element's
+    text by tag name without its namespace and returns a meeting or None to skip the
+    entry. Atom entries have ``link`` set to the href of their alternate link and
+    ``description``, ``pubDate`` and ``guid`` set from their summary or content,
+    published or updated, and id, so the same names work for both formats. Meetings
+    get a status and id if ``parse_entry`` doesn't set them.
+    """
+
+    chunk_size = 64 * 1024
+
+    def parse(self, response: Response) -> Iterator[Meeting]:
+        for entry in self.iter_entries(response):
+            meeting = self.parse_entry(entry, response)
+            if meeting is None:
+                continue
+            if "status" not in meeting:
+                meeting["status"] = self._get_status(meeting)
+            if "id" not in meeting:
+                meeting["id"] = self._get_id(meeting)
+            yield meeting
+
+    def parse_entry(
+        self, entry: Dict[str, str], response: Response
+    ) -> Optional[Meeting]:
+        raise NotImplementedError
+
+    def iter_entries(self, response: Response) -> Iterator[Dict[str, str]]:
+        """Parse feed entries from a response incrementally, in document order"""
+        parser = etree.XMLPullParser(
+            events=("end",),
+            tag=ENTRY_TAGS,
+            recover=True,
+            resolve_entities=False,
+            no_network=True,
+        )
+        body = response.body
+        if not body.strip():
+            return
+        for offset in range(0, len(body), self.chunk_size):
+            parser.feed(body[offset : offset + self.chunk_size])
+            yield from self._read_entries(parser)
+        parser.close()
+        yield from self._read_entries(parser)
+
+    def _read_entries(self, parser: etree.XMLPullParser) -> Iterator[Dict[str, str]]:
+        for _, element in parser.read_events():
+            entry = self._get_entry(element)
+            # Remove handled entries and anything before them from the tree
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+            yield entry
+
+    def _get_entry(self, element: etree._Element) -> Dict[str, str]:
+        entry = {}
+        alternate_link = False
+        for child in element:
+            if not isinstance(child.tag, str):
+                # Comments and processing instructions
+                continue
+            tag = child.tag.rpartition("}")[2]
+            if tag == "link" and child.get("href") is not None:
+                # Atom links are in attributes, preferring the first alternate link
+                is_alternate = child.get("rel", "alternate") == "alternate"
+                if tag not in entry or (is_alternate and not alternate_link):
+                    entry[tag] = child.get("href").strip()
+                    alternate_link = alternate_link or is_alternate
+            elif tag not in entry:
+                entry[tag] = (child.text or "").strip()
+        for name, atom_names in [
+            ("description", ["summary", "content"]),
+            ("pubDate", ["published", "updated"]),
+            ("guid", ["id"]),
+        ]:
+            if name not in entry:
+                entry[name] = next(
+                    (
+                        entry[atom_name]
+                        for atom_name in atom_names
+                        if atom_name in entry
+                    ),
+                    "",
+                )
+        entry.setdefault("title", "")
+        entry.setdefault("link", "")
+        return entry
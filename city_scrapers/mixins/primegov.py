@@ -0,0 +1,409 @@
+import codecs
+import json
+import os
+import re
+import resource
+import sys
+from collections import Counter
+from datetime import datetime
+from time import process_time
+from typing import Dict, Iterator, List, Mapping, Optional, Set
+
+import scrapy
+from city_scrapers_core.constants import CANCELLED
+from scrapy import signals
+from scrapy.http import TextResponse
+from scrapy.utils.project import data_path
+
+from ..middleware.conditional import DONT_CONDITIONAL_META_KEY
+from .compact import CompactItemsMixin
+
+# JSON whitespace between array elements
+WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+
+
+class PrimeGovMixin(CompactItemsMixin):
+    """Mixin for spiders scraping meetings from the PrimeGov public portal API used by
+    the City of Los Angeles.
+
+    Requests are built with the ``*_request`` methods and flagged to be shared through
+    ``SharedResponseMiddleware``, so identical API calls made by different spiders in
+    the same process are only downloaded once. Spiders for a single committee set
+    ``committee_id`` and only receive that committee's meetings from
+    ``parse_primegov_meetings``.
+
+    When CITY_SCRAPERS_PRIMEGOV_ARCHIVE_BY_YEAR is enabled (``crawlall`` does this when
+    more than one committee spider is scheduled), archived meetings for every committee
+    are served from one ``ListArchivedMeetings`` download per year instead of one
+    ``ListArchivedMeetingsByCommitteeId`` download per committee per year.
+
+    Spiders run with ``-a since=YEAR`` (and optionally ``-a until=YEAR``) backfill
+    archived meetings with ``backfill_requests``. Years are requested concurrently up to
+    ``-a backfill_concurrency`` or CITY_SCRAPERS_PRIMEGOV_BACKFILL_CONCURRENCY, and each
+    year is recorded in a checkpoint file once all of its meetings have been through
+    the item pipelines, so that an interrupted backfill skips finished years when it's
+    run again. The checkpoint is removed once every year has finished.
+
+    Meeting objects missing a title or date are skipped and counted in the
+    ``primegov/invalid_items`` stat. When CITY_SCRAPERS_PRIMEGOV_STREAM_JSON is enabled,
+    the default, API responses are decoded one meeting object at a time from chunks of
+    the body instead of decoding the whole body to text and building the full list
+    first. The CPU time spent decoding is added to the stats as ``primegov/decode_ms``,
+    and the process's peak memory afterwards as ``primegov/process_peak_rss_mb``. That
+    includes memory used by any other spiders in the same process.
+    """
+
+    primegov_url = "https://lacity.primegov.com"
+    committee_id: Optional[int] = None
+
+    since: Optional[str] = None
+    until: Optional[str] = None
+    backfill_concurrency: Optional[str] = None
+    checkpoint: Optional[str] = None
+    backfill_slot = "primegov-backfill"
+    # Bytes of the response body decoded at a time when streaming
+    json_chunk_size = 64 * 1024
+
+    document_urls = {
+        3: "{primegov_url}/Portal/Meeting?meetingTemplateId={template_id}",
+        1: "{primegov_url}/Public/CompiledDocument?meetingTemplateId={template_id}&compileOutputType=1",  # noqa
+    }
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        if spider.since is not None:
+            spider._configure_backfill(crawler)
+        return spider
+
+    def _configure_backfill(self, crawler):
+        """Give backfill requests their own download slot limited to the backfill
+        concurrency with no delay. HostThrottle leaves slots set with ``download_slot``
+        alone, so the limits hold for the whole backfill.
+        """
+        concurrency = int(
+            self.backfill_concurrency
+            or crawler.settings.getint("CITY_SCRAPERS_PRIMEGOV_BACKFILL_CONCURRENCY")
+        )
+        slots = crawler.settings.getdict("DOWNLOAD_SLOTS")
+        slots[self.backfill_slot] = {
+            "concurrency": concurrency,
+            "delay": 0,
+            **slots.get(self.backfill_slot, {}),
+        }
+        crawler.settings.set("DOWNLOAD_SLOTS", slots, priority="spider")
+        # Meetings yielded and processed by the item pipelines for each year
+        self._backfill_yielded: Dict[int, int] = {}
+        self._backfill_processed: Counter = Counter()
+        for signal in [signals.item_scraped, signals.item_dropped]:
+            crawler.signals.connect(self._backfill_item_processed, signal=signal)
+        crawler.signals.connect(self._close_backfill, signal=signals.spider_closed)
+
+    def backfill_years(self) -> List[int]:
+        """Years from ``since`` through ``until``, or the current year if not set"""
+        until = int(self.until) if self.until else datetime.now().year
+        return list(range(int(self.since), until + 1))
+
+    def backfill_requests(self, **kwargs) -> Iterator[scrapy.Request]:
+        """Requests for each backfill year that isn't in the checkpoint yet"""
+        completed = self._load_checkpoint()
+        for year in self.backfill_years():
+            if year in completed:
+                self.logger.info(f"Skipping {year}, already in backfill checkpoint")
+                continue
+            yield self.archive_request(
+                year,
+                callback=self._parse_backfill,
+                meta={
+                    "download_slot": self.backfill_slot,
+                    "primegov_year": year,
+                    # Items replayed for unchanged responses skip _parse_backfill
+                    # and wouldn't be counted towards the checkpoint
+                    DONT_CONDITIONAL_META_KEY: True,
+                },
+                **kwargs,
+            )
+
+    def _parse_backfill(self, response: TextResponse):
+        """Parse a year of archived meetings, counting them so that the year is only
+        recorded in the checkpoint once each has been scraped or dropped
+        """
+        year = response.meta["primegov_year"]
+        count = 0
+        for result in self.parse(response):
+            if not isinstance(result, scrapy.Request):
+                count += 1
+            yield result
+        self._backfill_yielded[year] = count
+        self._check_backfill_year(year)
+
+    def _backfill_item_processed(self, item, response, spider, **kwargs):
+        request = getattr(response, "request", None)
+        year = request.meta.get("primegov_year") if request is not None else None
+        if year is not None:
+            self._backfill_processed[year] += 1
+            self._check_backfill_year(year)
+
+    def _check_backfill_year(self, year: int):
+        if self._backfill_yielded.get(year) == self._backfill_processed[year]:
+            completed = self._load_checkpoint()
+            completed.add(year)
+            self._save_checkpoint(completed)
+
+    def _close_backfill(self, spider, reason: str):
+        completed = self._load_checkpoint()
+        if (
+            reason == "finished"
+            and completed
+            and completed.issuperset(self.backfill_years())
+        ):
+            os.remove(self._checkpoint_path())
+
+    def _checkpoint_path(self) -> str:
+        return self.checkpoint or data_path(
+            os.path.join("backfill", f"{self.name}.json")
+        )
+
+    def _load_checkpoint(self) -> Set[int]:
+        try:
+            with open(self._checkpoint_path()) as f:
+                return set(json.load(f)["years"])
+        except FileNotFoundError:
+            return set()
+
+    def _save_checkpoint(self, completed: Set[int]):
+        path = self._checkpoint_path()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"years": sorted(completed)}, f)
+
+    def upcoming_request(self, **kwargs) -> scrapy.Request:
+        """Request for upcoming meetings across all committees"""
+        return self._primegov_request("ListUpcomingMeetings", **kwargs)
+
+    def archived_request(self, year: int, **kwargs) -> scrapy.Request:
+        """Request for archived meetings in a year across all committees"""
+        return self._primegov_request(f"ListArchivedMeetings?year={year}", **kwargs)
+
+    def archived_committee_request(
+        self, year: int, committee_id: int, **kwargs
+    ) -> scrapy.Request:
+        """Request for archived meetings in a year for a single committee"""
+        return self._primegov_request(
+            "ListArchivedMeetingsByCommitteeId"
+            f"?year={year}&committeeId={committee_id}",
+            **kwargs,
+        )
+
+    def archive_request(self, year: int, **kwargs) -> scrapy.Request:
+        """Request for a year of archived meetings for the spider's committee, using
+        whichever endpoint is cheaper for the current run
+        """
+        if self.committee_id is None or self.settings.getbool(
+            "CITY_SCRAPERS_PRIMEGOV_ARCHIVE_BY_YEAR"
+        ):
+            return self.archived_request(year, **kwargs)
+        return self.archived_committee_request(year, self.committee_id, **kwargs)
+
+    def _primegov_request(self, path: str, **kwargs) -> scrapy.Request:
+        kwargs.setdefault("callback", self.parse)
+        kwargs["meta"] = {"share_response": True, **kwargs.get("meta", {})}
+        return scrapy.Request(
+            f"{self.primegov_url}/api/v2/PublicPortal/{path}", **kwargs
+        )
+
+    def parse_primegov_meetings(self, response: TextResponse) -> Iterator[Mapping]:
+        """Yield meeting objects from an API response, filtered to the spider's
+        committee if one is set
+        """
+        settings = getattr(self, "settings", None)
+        if settings is None or settings.getbool(
+            "CITY_SCRAPERS_PRIMEGOV_STREAM_JSON", True
+        ):
+            items = self._stream_primegov_items(response)
+        else:
+            items = self._load_primegov_items(response)
+        for item in items:
+            if self.committee_id is not None and item.get("committeeId") not in [
+                None,
+                self.committee_id,
+            ]:
+                continue
+            yield item
+
+    def _load_primegov_items(self, response: TextResponse) -> Iterator[Mapping]:
+        try:
+            data = response.json()
+        except ValueError as e:
+            self.logger.error(f"Failed to parse JSON response: {e}")
+            return
+        if not isinstance(data, list):
+            self.logger.error(f"Expected list of items, got {type(data)}")
+            return
+        for item in data:
+            if self._valid_primegov_item(item):
+                yield item
+
+    def _stream_primegov_items(self, response: TextResponse) -> Iterator[Mapping]:
+        """Decode the elements of a JSON array one at a time, skipping any that aren't
+        valid meeting objects. Elements before a decoding error are still yielded.
+        """
+        elapsed = 0.0
+        start = process_time()
+        try:
+            for item in self._iter_json_array(response):
+                elapsed += process_time() - start
+                if self._valid_primegov_item(item):
+                    yield item
+                start = process_time()
+            elapsed += process_time() - start
+        except ValueError as e:
+            self.logger.error(f"Failed to parse JSON response: {e}")
+        finally:
+            self._record_decode_stats(elapsed)
+
+    def _iter_json_array(self, response: TextResponse) -> Iterator:
+        """Decode the elements of a JSON array from chunks of the response body, only
+        keeping the text of the current element and the rest of its chunk
+        """
+        decoder = json.JSONDecoder()
+        chunks = self._iter_text_chunks(response)
+        text = ""
+        idx = 0
+
+        def read() -> bool:
+            """Add the next chunk to the unparsed text, if there is one"""
+            nonlocal text, idx
+            chunk = next(chunks, None)
+            if chunk is None:
+                return False
+            text = text[idx:] + chunk
+            idx = 0
+            return True
+
+        def peek() -> str:
+            """Skip whitespace, returning the next character or "" at the end"""
+            nonlocal idx
+            while True:
+                idx = WHITESPACE_RE.match(text, idx).end()
+                if idx < len(text) or not read():
+                    return text[idx : idx + 1]
+
+        def decode():
+            nonlocal idx
+            while True:
+                try:
+                    item, end = decoder.raw_decode(text, idx)
+                except json.JSONDecodeError:
+                    # The element may continue in the next chunk
+                    if not read():
+                        raise
+                    continue
+                # Numbers and literals could also continue in the next chunk
+                if end < len(text) or not read():
+                    idx = end
+                    return item
+
+        if peek() != "[":
+            # Decode the whole response for the same error as a full decode
+            data = response.json()
+            self.logger.error(f"Expected list of items, got {type(data)}")
+            return
+        idx += 1
+        if peek() == "]":
+            idx += 1
+        else:
+            while True:
+                peek()
+                yield decode()
+                char = peek()
+                idx += 1
+                if char == "]":
+                    break
+                if char != ",":
+                    raise json.JSONDecodeError("Expecting ',' delimiter", text, idx - 1)
+        if peek():
+            raise json.JSONDecodeError("Extra data", text, idx)
+
+    def _iter_text_chunks(self, response: TextResponse) -> Iterator[str]:
+        text_decoder = codecs.getincrementaldecoder(response.encoding)("replace")
+        body = response.body
+        started = False
+        for idx in range(0, len(body), self.json_chunk_size):
+            chunk = text_decoder.decode(body[idx : idx + self.json_chunk_size])
+            if chunk and not started:
+                # Like response.text, ignore a byte order mark
+                chunk = chunk.removeprefix("\ufeff")
+                started = True
+            yield chunk
+        yield text_decoder.decode(b"", final=True)
+
+    def _valid_primegov_item(self, item) -> bool:
+        """Check a meeting object has a title, which may be null, and a date"""
+        if (
+            isinstance(item, dict)
+            and "title" in item
+            and isinstance(item.get("dateTime"), str)
+        ):
+            return True
+        self._inc_primegov_stat("primegov/invalid_items")
+        item_id = item.get("id", "N/A") if isinstance(item, dict) else "N/A"
+        self.logger.warning(
+            f"Skipping PrimeGov item with id {item_id} missing a title or dateTime"
+        )
+        return False
+
+    def _record_decode_stats(self, elapsed: float):
+        stats = self._primegov_stats()
+        if stats is None:
+            return
+        stats.inc_value("primegov/decode_ms", round(elapsed * 1000, 3), spider=self)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Reported in bytes on macOS and in kilobytes elsewhere
+        peak /= 1024 * 1024 if sys.platform == "darwin" else 1024
+        stats.max_value("primegov/process_peak_rss_mb", round(peak, 1), spider=self)
+
+    def _inc_primegov_stat(self, key: str):
+        stats = self._primegov_stats()
+        if stats is not None:
+            stats.inc_value(key, spider=self)
+
+    def _primegov_stats(self):
+        crawler = getattr(self, "crawler", None)
+        return crawler.stats if crawler is not None else None
+
+    def _parse_video_links(self, item: Mapping, title: str) -> List[Dict]:
+        """Parse video link if present"""
+        if item.get("videoUrl"):
+            return [self._link(item["videoUrl"], title)]
+        return []
+
+    def _parse_document_links(self, item: Mapping) -> List[Dict]:
+        """Parse links to documents.
+
+        Link types:
+        - compileOutputType 3: Meeting template link
+        - compileOutputType 1: Compiled document link
+        """
+        links = []
+        for document in item.get("documentList") or []:
+            if not document:
+                continue
+            output_type = document.get("compileOutputType")
+            template_id = document.get("templateId")
+            template_name = document.get("templateName")
+            if output_type in self.document_urls and template_id and template_name:
+                href = self.document_urls[output_type].format(
+                    primegov_url=self.primegov_url, template_id=template_id
+                )
+                links.append(self._link(href, template_name))
+        return links
+
+    def _parse_primegov_status(self, meeting: Mapping, item: Mapping) -> str:
+        """Check document names for cancellation notices before checking meeting"""
+        for document in item.get("documentList") or []:
+            if not document:
+                continue
+            if "cancel" in (document.get("templateName") or "").lower():
+                return CANCELLED
+        return self._get_status(meeting)
@@ -0,0 +1,4 @@
+from .diff import LocalDiffPipeline  # noqa
+from .ocd import OpenCivicDataPipeline  # noqa
+
+__all__ = ["LocalDiffPipeline", "OpenCivicDataPipeline"]
@@ -0,0 +1,281 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+from city_scrapers_core.constants import CANCELLED
+from city_scrapers_core.decorators import ignore_processed
+from city_scrapers_core.items import Meeting
+from pytz import timezone
+from scrapy import Request, Spider, signals
+from scrapy.crawler import Crawler
+from scrapy.exceptions import DontCloseSpider, DropItem
+from scrapy.http import Response
+from scrapy.utils.project import data_path
+
+logger = logging.getLogger(__name__)
+
+NEW = "new"
+CHANGED = "changed"
+CANCELLED_CHANGE = "cancelled"
+
+
+class LocalDiffPipeline:
+    """Pipeline for emitting only meetings that are new or have changed since the last
+    run, based on an SQLite store of each meeting's content hash keyed by spider name
+    and meeting ID.
+
+    Unchanged meetings and duplicates within a run are dropped. Statuses are left out
+    of the hash and only compared for cancellations, so meetings going from tentative
+    to passed over time are unchanged. Once the spider is idle, upcoming meetings in
+    the store that weren't scraped in this run are queried by the indexed start time
+    and emitted as cancelled from the callback of one last ``data:`` request, unless
+    any request or callback failed. Each run is numbered in the store's ``runs``
+    table, and each new, changed or cancelled meeting is recorded in its ``changelog``
+    table with the fields that changed and counted in the ``diff/*`` stats.
+
+    Unlike ``city_scrapers_core.pipelines.DiffPipeline`` this doesn't need previous
+    feed output, so it should run on meetings before OpenCivicDataPipeline. The store
+    is CITY_SCRAPERS_DIFF_DB relative to the project's .scrapy directory, opened while
+    the spider is open.
+    """
+
+    # Version of the stored hashes, which no longer include the status since version 1
+    version = 1
+
+    def __init__(self, crawler: Crawler, path: str):
+        self.crawler = crawler
+        self.path = path
+        self.conn: Optional[sqlite3.Connection] = None
+        self.run = None
+        self.scraped_count = 0
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler):
+        pipeline = cls(
+            crawler, data_path(crawler.settings.get("CITY_SCRAPERS_DIFF_DB"))
+        )
+        crawler.signals.connect(pipeline.spider_idle, signal=signals.spider_idle)
+        return pipeline
+
+    @classmethod
+    def connect(cls, path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(path)
+        with conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS meetings (
+                    spider TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    start TEXT NOT NULL,
+                    status TEXT,
+                    item TEXT NOT NULL,
+                    last_run INTEGER NOT NULL,
+                    PRIMARY KEY (spider, id)
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS meetings_start ON meetings (spider, start)"
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    spider TEXT NOT NULL,
+                    start TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS changelog (
+                    spider TEXT NOT NULL,
+                    run INTEGER NOT NULL,
+                    id TEXT NOT NULL,
+                    change TEXT NOT NULL,
+                    fields TEXT
+                )
+                """
+            )
+            (version,) = conn.execute("PRAGMA user_version").fetchone()
+            if version < cls.version:
+                # Rehash meetings stored before statuses were left out of the hash
+                conn.executemany(
+                    "UPDATE meetings SET hash = ? WHERE spider = ? AND id = ?",
+                    [
+                        (cls._hash(json.loads(data)), spider, meeting_id)
+                        for spider, meeting_id, data in conn.execute(
+                            "SELECT spider, id, item FROM meetings"
+                        ).fetchall()
+                    ],
+                )
+                conn.execute(f"PRAGMA user_version = {cls.version}")
+        return conn
+
+    def open_spider(self, spider: Spider):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.conn = self.connect(self.path)
+        with self.conn:
+            self.run = self.conn.execute(
+                "INSERT INTO runs (spider, start) VALUES (?, ?)",
+                (spider.name, datetime.utcnow().isoformat(timespec="seconds")),
+            ).lastrowid
+
+    def close_spider(self, spider: Spider):
+        self.conn.close()
+
+    @ignore_processed
+    def process_item(self, item: Mapping, spider: Spider) -> Mapping:
+        if not isinstance(item, Meeting):
+            return item
+        data = self._serialize(item)
+        current = json.loads(data)
+        item_hash = self._hash(current)
+        row = self.conn.execute(
+            "SELECT hash, item, status, last_run = ? FROM meetings "
+            "WHERE spider = ? AND id = ?",
+            (self.run, spider.name, item["id"]),
+        ).fetchone()
+        if row and row[3]:
+            raise DropItem(f"Meeting {item['id']} has already been scraped")
+        self.scraped_count += 1
+        cancelled = item.get("status") == CANCELLED
+        if row is None:
+            change, fields = NEW, None
+        elif row[0] == item_hash and cancelled == (row[2] == CANCELLED):
+            # Other status changes follow from the time and aren't changes
+            with self.conn:
+                self._save(spider, item, item_hash, data)
+            self._inc_stat("unchanged", spider)
+            raise DropItem(f"Meeting {item['id']} hasn't changed")
+        else:
+            previous = json.loads(row[1])
+            fields = [
+                key
+                for key in current
+                if key != "status" and previous.get(key) != current[key]
+            ]
+            if cancelled != (row[2] == CANCELLED):
+                fields.append("status")
+            change = CANCELLED_CHANGE if cancelled and row[2] != CANCELLED else CHANGED
+        with self.conn:
+            self._save(spider, item, item_hash, data)
+            self.conn.execute(
+                "INSERT INTO changelog VALUES (?, ?, ?, ?, ?)",
+                (
+                    spider.name,
+                    self.run,
+                    item["id"],
+                    change,
+                    ",".join(fields) if fields else None,
+                ),
+            )
+        self._inc_stat(change, spider)
+        return item
+
+    def spider_idle(self, spider: Spider):
+        """Request missing upcoming meetings to be emitted as cancelled once the
+        spider's requests are done, keeping the spider open to process them
+        """
+        self.crawler.signals.disconnect(self.spider_idle, signal=signals.spider_idle)
+        if (
+            self._has_errors(spider)
+            or not self.scraped_count
+            or getattr(spider, "since", None)
+        ):
+            # Meetings could be missing because of errors, and backfills only request
+            # archived meetings
+            logger.info(
+                "Skipping cancelling missing meetings", extra={"spider": spider}
+            )
+            return
+        self.crawler.engine.crawl(
+            Request(
+                "data:,",
+                callback=self._emit_missing,
+                cb_kwargs={"spider": spider},
+                meta={"dont_cache": True},
+                dont_filter=True,
+            )
+        )
+        raise DontCloseSpider
+
+    def _has_errors(self, spider: Spider) -> bool:
+        """Whether any download failed, any callback raised an exception or any
+        response was ignored for its status
+        """
+        stats = self.crawler.stats.get_stats(spider)
+        return any(
+            value
+            for key, value in stats.items()
+            if key in ("downloader/exception_count", "httperror/response_ignored_count")
+            or key.startswith("spider_exceptions/")
+        )
+
+    def _emit_missing(self, response: Response, spider: Spider) -> Iterator[Meeting]:
+        yield from self._missing_meetings(spider)
+
+    def _missing_meetings(self, spider: Spider) -> Iterator[Meeting]:
+        now = datetime.now(timezone(spider.timezone)).replace(tzinfo=None)
+        rows = self.conn.execute(
+            "SELECT item FROM meetings WHERE spider = ? AND start > ? "
+            "AND last_run != ? AND (status IS NULL OR status != ?)",
+            (spider.name, now.isoformat(), self.run, CANCELLED),
+        )
+        for (data,) in rows.fetchall():
+            meeting = self._deserialize(data)
+            meeting["status"] = CANCELLED
+            yield meeting
+
+    def _save(self, spider: Spider, item: Meeting, item_hash: str, data: str):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meetings VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                spider.name,
+                item["id"],
+                item_hash,
+                item["start"].isoformat(),
+                item.get("status"),
+                data,
+                self.run,
+            ),
+        )
+
+    @staticmethod
+    def _hash(values: Dict[str, Any]) -> str:
+        """Hash of a serialized meeting's values other than its status"""
+        data = json.dumps(
+            {key: value for key, value in values.items() if key != "status"},
+            sort_keys=True,
+        )
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def _serialize(self, item: Meeting) -> str:
+        return json.dumps(
+            dict(item),
+            sort_keys=True,
+            default=self._serialize_value,
+        )
+
+    def _serialize_value(self, value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, Mapping):
+            # Compact locations and links
+            return dict(value)
+        return str(value)
+
+    def _deserialize(self, data: str) -> Meeting:
+        values = json.loads(data)
+        for key in ["start", "end"]:
+            if values.get(key):
+                values[key] = datetime.fromisoformat(values[key])
+        return Meeting(**values)
+
+    def _inc_stat(self, key: str, spider: Spider):
+        self.crawler.stats.inc_value(f"diff/{key}", spider=spider)
@@ -0,0 +1,88 @@
+from datetime import datetime
+from functools import lru_cache
+from time import time
+from typing import Mapping, Optional
+from uuid import uuid1
+
+from city_scrapers_core.decorators import ignore_processed
+from city_scrapers_core.pipelines import OpenCivicDataPipeline as BaseOCDPipeline
+from pytz import timezone
+from scrapy import Spider
+
+from city_scrapers.derived import get_derived, local_isoformat
+
+
+class OpenCivicDataPipeline(BaseOCDPipeline):
+    """Pipeline producing the same Open Civic Data events as
+    ``city_scrapers_core.pipelines.OpenCivicDataPipeline`` while reusing derived fields.
+
+    Localized start and end times are cached on the meeting with ``get_derived`` and
+    memoized across meetings, locations are memoized by name and address, and the
+    ``updated_at`` time is only localized once a second rather than for every meeting.
+    """
+
+    def __init__(self):
+        self._updated_at = (None, None)
+        self._location = lru_cache(maxsize=1024)(self._create_location)
+
+    @ignore_processed
+    def process_item(self, item: Mapping, spider: Spider) -> Mapping:
+        return {
+            "_type": "event",
+            "_id": item.get("_id") or "ocd-event/" + str(uuid1()),
+            "updated_at": self._get_updated_at(spider.timezone),
+            "name": item["title"],
+            "description": item["description"],
+            "classification": item["classification"],
+            "status": item["status"],
+            "all_day": item["all_day"],
+            "start_time": self._get_local_time(item, "start", spider.timezone),
+            "end_time": self._get_local_time(item, "end", spider.timezone),
+            "timezone": spider.timezone,
+            "location": self.create_location(item),
+            "documents": [],
+            "links": [
+                {"note": link["title"], "url": link["href"]} for link in item["links"]
+            ],
+            "sources": [{"url": item["source"], "note": ""}],
+            "participants": [
+                {
+                    "note": "host",
+                    "name": spider.agency,
+                    "entity_type": "organization",
+                    "entity_name": spider.agency,
+                    "entity_id": "",
+                }
+            ],
+            "extras": {
+                "cityscrapers/id": item["id"],
+                "cityscrapers/agency": spider.agency,
+                "cityscrapers/time_notes": item.get("time_notes", ""),
+                "cityscrapers/address": item["location"]["address"],
+            },
+        }
+
+    def create_location(self, item: Mapping) -> Mapping:
+        # Copied so that changes to one event's location don't affect others
+        return dict(
+            self._location(item["location"]["name"], item["location"]["address"])
+        )
+
+    def _create_location(self, name: Optional[str], address: Optional[str]) -> Mapping:
+        return super().create_location({"location": {"name": name, "address": address}})
+
+    def _get_local_time(self, item: Mapping, key: str, tz_name: str) -> str:
+        return get_derived(
+            item,
+            f"{key}_time",
+            lambda: local_isoformat(tz_name, item[key]),
+            tz_name,
+            item[key],
+        )
+
+    def _get_updated_at(self, tz_name: str) -> str:
+        second = (int(time()), tz_name)
+        if self._updated_at[0] != second:
+            updated_at = timezone(tz_name).localize(datetime.now())
+            self._updated_at = (second, updated_at.isoformat(timespec="seconds"))
+        return self._updated_at[1]
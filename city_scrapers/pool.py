@@ -0,0 +1,193 @@
+import multiprocessing
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+from scrapy import Request, Spider
+from scrapy.crawler import Crawler
+from scrapy.http import Response, TextResponse
+from scrapy.utils.request import request_from_dict
+from twisted.internet import defer
+
+from .dates import DateParser
+from .extensions.timing import TimingStatsExtension
+from .middleware.conditional import UNCHANGED_META_KEY
+
+# Types of spider attributes copied to the spider running in a worker process
+STATE_TYPES = (str, int, float, bool, type(None))
+
+# Results flagged by whether they're requests, date parser counts and timings
+WorkerOutput = Tuple[List[Tuple[bool, Any]], Dict[str, Counter], Dict[str, List[float]]]
+
+_executors: Dict[int, ProcessPoolExecutor] = {}
+
+
+def get_executor(workers: int) -> ProcessPoolExecutor:
+    """Get a process pool, shared by every spider in the process using the same
+    number of workers. Workers are spawned rather than forked since the reactor's
+    threads may be running.
+    """
+    if workers not in _executors:
+        _executors[workers] = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executors[workers]
+
+
+def in_process_pool(method: Callable) -> Callable:
+    """Decorator for spider callbacks running them in a pool of
+    CITY_SCRAPERS_PROCESS_POOL_WORKERS processes, so CPU-heavy parsing doesn't block
+    the reactor. Callbacks run normally if the setting is 0, which is the default.
+
+    The response is sent to a worker along with a copy of the spider made from its
+    class and simple public attributes like arguments passed with ``-a``, so callbacks
+    can't rely on the crawler or on the response's request. Items and requests are
+    returned through a Deferred, with request callbacks looked up by name on the
+    original spider. Counts from the spider's ``DateParser`` attributes and timings of
+    its helper methods are sent back too, while the callback itself is timed until its
+    results are returned. Since workers are spawned, scripts starting crawls themselves
+    need an ``if __name__ == "__main__":`` guard.
+
+    Responses ``ConditionalRequestMiddleware`` found unchanged are parsed in this
+    process when needed, since their stored items are usually emitted instead.
+    """
+
+    @wraps(method)
+    def wrapper(self: Spider, response: Response, **kwargs):
+        crawler = getattr(self, "crawler", None)
+        workers = 0
+        if crawler is not None:
+            workers = crawler.settings.getint("CITY_SCRAPERS_PROCESS_POOL_WORKERS")
+        if not workers or is_unchanged(response):
+            return method(self, response, **kwargs)
+        crawler.stats.inc_value("process_pool/response_count")
+        timing = get_timing_extension(crawler)
+        future = get_executor(workers).submit(
+            parse_in_worker,
+            type(self),
+            get_spider_state(self),
+            method.__name__,
+            get_response_args(response),
+            kwargs,
+            timed=timing is not None,
+        )
+        dfd = future_to_deferred(future)
+        dfd.addCallback(lambda output: list(load_output(self, output, timing)))
+        return dfd
+
+    return wrapper
+
+
+def is_unchanged(response: Response) -> bool:
+    return response.request is not None and bool(response.meta.get(UNCHANGED_META_KEY))
+
+
+def get_timing_extension(crawler: Crawler) -> Optional[TimingStatsExtension]:
+    for extension in crawler.extensions.middlewares:
+        if isinstance(extension, TimingStatsExtension):
+            return extension
+    return None
+
+
+def get_date_parsers(spidercls: Type[Spider]) -> Dict[str, DateParser]:
+    parsers = {}
+    for attr in dir(spidercls):
+        value = getattr(spidercls, attr, None)
+        if isinstance(value, DateParser):
+            parsers[attr] = value
+    return parsers
+
+
+def get_spider_state(spider: Spider) -> Dict[str, Any]:
+    return {
+        key: value
+        for key, value in vars(spider).items()
+        if not key.startswith("_") and isinstance(value, STATE_TYPES)
+    }
+
+
+def get_response_args(response: Response) -> Tuple[Type[Response], Dict[str, Any]]:
+    kwargs = {"url": response.url, "body": response.body, "headers": response.headers}
+    if isinstance(response, TextResponse):
+        kwargs["encoding"] = response.encoding
+    return type(response), kwargs
+
+
+def future_to_deferred(future: Future) -> defer.Deferred:
+    """Deferred fired in the reactor thread with the result of a future"""
+    from twisted.internet import reactor
+
+    dfd = defer.Deferred()
+
+    def done(future: Future):
+        error = future.exception()
+        if error is not None:
+            reactor.callFromThread(dfd.errback, error)
+        else:
+            reactor.callFromThread(dfd.callback, future.result())
+
+    future.add_done_callback(done)
+    return dfd
+
+
+def parse_in_worker(
+    spidercls: Type[Spider],
+    state: Dict[str, Any],
+    method_name: str,
+    response_args: Tuple[Type[Response], Dict[str, Any]],
+    kwargs: Dict[str, Any],
+    timed: bool = False,
+) -> WorkerOutput:
+    """Run a callback in a worker process, returning a list of items and requests
+    converted to dicts, flagged by whether they're requests, along with counts from
+    the spider's date parsers and timings of its helper methods if ``timed`` is set
+    """
+    spider = spidercls(**state)
+    parsers = get_date_parsers(spidercls)
+    initial_counts = {attr: Counter(parser.stats) for attr, parser in parsers.items()}
+    timing = None
+    if timed:
+        timing = TimingStatsExtension(None, None)
+        timing.wrap_spider(spider)
+    response_cls, response_kwargs = response_args
+    response = response_cls(**response_kwargs)
+    # The callback itself is timed in the original process
+    method = getattr(spidercls, method_name).__wrapped__
+    results = []
+    for result in method(spider, response, **kwargs) or []:
+        if isinstance(result, Request):
+            results.append((True, result.to_dict(spider=spider)))
+        else:
+            results.append((False, result))
+    date_counts = {}
+    for attr, parser in parsers.items():
+        counts = Counter(parser.stats)
+        counts.subtract(initial_counts[attr])
+        date_counts[attr] = +counts
+    samples = dict(timing.samples) if timing is not None else {}
+    return results, date_counts, samples
+
+
+def load_output(
+    spider: Spider, output: WorkerOutput, timing: Optional[TimingStatsExtension]
+) -> Iterator[Any]:
+    """Add a worker's date parser counts and timings to this process's, yielding its
+    items and requests
+    """
+    results, date_counts, samples = output
+    parsers = get_date_parsers(type(spider))
+    for attr, counts in date_counts.items():
+        parsers[attr].stats.update(counts)
+    if timing is not None:
+        for name, seconds in samples.items():
+            timing.samples[name].extend(seconds)
+    yield from load_results(spider, results)
+
+
+def load_results(spider: Spider, results: List[Tuple[bool, Any]]) -> Iterator[Any]:
+    for is_request, result in results:
+        if is_request:
+            yield request_from_dict(result, spider=spider)
+        else:
+            yield result
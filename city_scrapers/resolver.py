@@ -0,0 +1,80 @@
+import os
+import sqlite3
+from time import time
+from typing import Dict
+
+from scrapy.crawler import Crawler
+from scrapy.resolver import CachingThreadedResolver, dnscache
+from scrapy.utils.project import data_path
+from twisted.internet.interfaces import IResolverSimple
+from zope.interface import implementer
+
+
+@implementer(IResolverSimple)
+class PersistentCachingResolver(CachingThreadedResolver):
+    """Replacement for Scrapy's default DNS resolver also storing resolved addresses in
+    an SQLite file relative to the project's .scrapy directory, so runs in other
+    processes within CITY_SCRAPERS_DNSCACHE_TTL seconds don't resolve hosts again.
+
+    The system resolver doesn't return record TTLs, so addresses are kept for the
+    setting's TTL however long their records allow. Like Scrapy's resolver, nothing is
+    cached when DNSCACHE_ENABLED is off.
+    """
+
+    _connections: Dict[str, sqlite3.Connection] = {}
+
+    def __init__(self, reactor, cache_size, timeout, conn: sqlite3.Connection, ttl):
+        super().__init__(reactor, cache_size, timeout)
+        self.conn = conn
+        self.ttl = ttl
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler, reactor):
+        settings = crawler.settings
+        if settings.getbool("DNSCACHE_ENABLED"):
+            cache_size = settings.getint("DNSCACHE_SIZE")
+        else:
+            cache_size = 0
+        return cls(
+            reactor,
+            cache_size,
+            settings.getfloat("DNS_TIMEOUT"),
+            cls.connect(data_path(settings.get("CITY_SCRAPERS_DNSCACHE_DB"))),
+            settings.getint("CITY_SCRAPERS_DNSCACHE_TTL"),
+        )
+
+    @classmethod
+    def connect(cls, path: str) -> sqlite3.Connection:
+        """Get a connection to the store, shared by resolvers in the same process"""
+        if path not in cls._connections:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            conn = sqlite3.connect(path)
+            with conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS hosts (
+                        name TEXT PRIMARY KEY,
+                        address TEXT NOT NULL,
+                        timestamp REAL NOT NULL
+                    )
+                    """
+                )
+            cls._connections[path] = conn
+        return cls._connections[path]
+
+    def getHostByName(self, name: str, timeout=None):
+        if dnscache.limit and name not in dnscache:
+            row = self.conn.execute(
+                "SELECT address FROM hosts WHERE name = ? AND timestamp >= ?",
+                (name, time() - self.ttl),
+            ).fetchone()
+            if row:
+                dnscache[name] = row[0]
+        return super().getHostByName(name, timeout)
+
+    def _cache_result(self, result, name):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO hosts VALUES (?, ?, ?)", (name, result, time())
+            )
+        return super()._cache_result(result, name)
@@ -10,9 +10,16 @@ ITEM_PIPELINES = {
 }
 
 EXTENSIONS = {
+    "scrapy.extensions.throttle.AutoThrottle": None,
+    "city_scrapers.extensions.HostThrottle": 0,
+    "city_scrapers.extensions.DateParserStatsExtension": 500,
+    "city_scrapers.extensions.TimingStatsExtension": 500,
     "scrapy.extensions.closespider.CloseSpider": None,
 }
 
 SPIDER_MIDDLEWARES = {
     "city_scrapers.middleware.CityScrapersWaybackMiddleware": 500,
+    "city_scrapers.middleware.CachedItemsMiddleware": 950,
 }
+
+CITY_SCRAPERS_CONDITIONAL_ENABLED = True
@@ -14,16 +14,33 @@ BOT_NAME = "city_scrapers"
 SPIDER_MODULES = ["city_scrapers.spiders"]
 NEWSPIDER_MODULE = "city_scrapers.spiders"
 
+# List and load spiders from city_scrapers/spiders/manifest.json so commands only
+# import the spiders they run. Update it with "scrapy manifest" when adding spiders.
+SPIDER_LOADER_CLASS = "city_scrapers.spiderloader.ManifestSpiderLoader"
+
 # Crawl responsibly by identifying yourself (and your website) on the user-agent
 USER_AGENT = "City Scrapers [development mode]. Learn more and say hello at https://www.citybureau.org/city-scrapers/"  # noqa
 
 # Obey robots.txt rules
 ROBOTSTXT_OBEY = True
 
+# robots.txt files and resolved DNS addresses are stored in SQLite files relative to the
+# .scrapy directory so that runs of other spiders don't fetch or resolve them again.
+# robots.txt files are kept for as long as their cache headers allow, up to the TTL.
+CITY_SCRAPERS_ROBOTSTXT_DB = "robotstxt.db"
+CITY_SCRAPERS_ROBOTSTXT_TTL = int(
+    os.getenv("CITY_SCRAPERS_ROBOTSTXT_TTL", 24 * 60 * 60)
+)
+DNS_RESOLVER = "city_scrapers.resolver.PersistentCachingResolver"
+CITY_SCRAPERS_DNSCACHE_DB = "dns.db"
+CITY_SCRAPERS_DNSCACHE_TTL = int(os.getenv("CITY_SCRAPERS_DNSCACHE_TTL", 60 * 60))
+
 # Disable cookies (enabled by default)
 COOKIES_ENABLED = False
 
-# Throttle results by default
+# Throttle results by default. HostThrottle replaces AutoThrottle, using the start and
+# max delays but learning each host's concurrency and delay separately, so the target
+# concurrency only applies if AutoThrottle is enabled instead.
 AUTOTHROTTLE_ENABLED = True
 AUTOTHROTTLE_START_DELAY = float(os.getenv("AUTOTHROTTLE_START_DELAY", 1.0))
 AUTOTHROTTLE_MAX_DELAY = float(os.getenv("AUTOTHROTTLE_MAX_DELAY", 30.0))
@@ -31,6 +48,19 @@ AUTOTHROTTLE_TARGET_CONCURRENCY = float(
     os.getenv("AUTOTHROTTLE_TARGET_CONCURRENCY", 1.0)
 )
 
+# Target latency in seconds and concurrency bounds for each host used by HostThrottle,
+# with "*" used for hosts that aren't listed. Learned limits are stored in an SQLite
+# file relative to the .scrapy directory and reused by runs within the TTL.
+CITY_SCRAPERS_HOST_THROTTLE = {
+    "*": {"target_latency": 2.0, "min_concurrency": 1, "max_concurrency": 4},
+    # PrimeGov's JSON API is fast
+    "lacity.primegov.com": {"target_latency": 1.0, "max_concurrency": 8},
+    # County CMS pages are slow to render
+    "bos.lacounty.gov": {"target_latency": 5.0, "max_concurrency": 2},
+}
+CITY_SCRAPERS_HOST_THROTTLE_DB = "throttle.db"
+CITY_SCRAPERS_HOST_THROTTLE_TTL = 14 * 24 * 60 * 60
+
 # Configure item pipelines
 ITEM_PIPELINES = {
     "city_scrapers_core.pipelines.MeetingPipeline": 200,
@@ -39,16 +69,116 @@ ITEM_PIPELINES = {
 # Enable or disable downloader middlewares
 # See http://scrapy.readthedocs.org/en/latest/topics/downloader-middleware.html
 DOWNLOADER_MIDDLEWARES = {
-    "scrapy.downloadermiddlewares.robotstxt.RobotsTxtMiddleware": 543,
+    "scrapy.downloadermiddlewares.robotstxt.RobotsTxtMiddleware": None,
+    "city_scrapers.middleware.CachedRobotsTxtMiddleware": 543,
+    "city_scrapers.middleware.ConditionalRequestMiddleware": 585,
+    # Above RedirectMiddleware, so redirect responses reach it before they're followed
+    "city_scrapers.middleware.CircuitBreakerMiddleware": 610,
+    "city_scrapers.middleware.SharedResponseMiddleware": 890,
+    "city_scrapers.middleware.ProcessConcurrencyMiddleware": 950,
+}
+
+# Stop requesting a host and close the spider once too many of the host's last `window`
+# requests failed with an error, a 429 or 5xx status or a latency over `max_latency`
+# seconds, with "*" used for hosts that aren't listed. Hosts left open are stored in an
+# SQLite file relative to the .scrapy directory and retried with one request next run.
+CITY_SCRAPERS_CIRCUIT_BREAKER_ENABLED = True
+CITY_SCRAPERS_CIRCUIT_BREAKER = {
+    "*": {"window": 20, "min_requests": 5, "failure_rate": 0.5, "max_latency": 30.0},
+}
+CITY_SCRAPERS_CIRCUIT_BREAKER_DB = "circuit.db"
+
+# Caps on concurrent requests shared by every spider in the process when running them
+# together with `scrapy crawlall`. 0 disables the cap.
+CITY_SCRAPERS_MAX_CONCURRENT_REQUESTS = int(
+    os.getenv("CITY_SCRAPERS_MAX_CONCURRENT_REQUESTS", 0)
+)
+CITY_SCRAPERS_MAX_CONCURRENT_REQUESTS_PER_DOMAIN = int(
+    os.getenv("CITY_SCRAPERS_MAX_CONCURRENT_REQUESTS_PER_DOMAIN", 0)
+)
+
+# Number of responses kept by SharedResponseMiddleware for requests with
+# `share_response` set in their meta, dropping the least recently used ones first
+CITY_SCRAPERS_SHARED_RESPONSE_MAX = 50
+
+# Load archived PrimeGov meetings for all committees with one request per year rather
+# than one request per committee per year. Enabled by `scrapy crawlall` when more than
+# one PrimeGov committee spider is run.
+CITY_SCRAPERS_PRIMEGOV_ARCHIVE_BY_YEAR = False
+
+# Maximum concurrent year requests when backfilling PrimeGov spiders with `-a since=`
+CITY_SCRAPERS_PRIMEGOV_BACKFILL_CONCURRENCY = int(
+    os.getenv("CITY_SCRAPERS_PRIMEGOV_BACKFILL_CONCURRENCY", 4)
+)
+
+# Decode PrimeGov API responses one meeting at a time, skipping invalid meetings,
+# rather than loading the whole response before parsing it.
+CITY_SCRAPERS_PRIMEGOV_STREAM_JSON = True
+
+SPIDER_MIDDLEWARES = {
+    "city_scrapers.middleware.CachedItemsMiddleware": 950,
+}
+
+# Send conditional requests based on the previous run's responses, and emit the
+# previous run's items without parsing if a response hasn't changed. Validators and
+# items are stored in an SQLite file relative to the project's .scrapy directory.
+CITY_SCRAPERS_CONDITIONAL_ENABLED = False
+CITY_SCRAPERS_CONDITIONAL_DB = "conditional.db"
+
+# Build meeting locations and links as compact records, sharing locations between
+# meetings, to reduce memory use in large backfills. They're converted to dicts when
+# items are exported.
+CITY_SCRAPERS_COMPACT_ITEMS = False
+
+# Number of worker processes that parse responses for callbacks decorated with
+# in_process_pool, keeping CPU-heavy parsing off the reactor. Parsed in-process if 0.
+CITY_SCRAPERS_PROCESS_POOL_WORKERS = 0
+
+# SQLite store of scraped meetings used by LocalDiffPipeline, relative to the .scrapy
+# directory
+CITY_SCRAPERS_DIFF_DB = "diff.db"
+
+# Wayback Machine archiving with CityScrapersWaybackMiddleware, used in the archive
+# settings. URLs are submitted in the background and URLs archived within the TTL are
+# skipped, which is tracked in an SQLite file relative to the .scrapy directory. URLs
+# failing with server errors are dropped after CITY_SCRAPERS_WAYBACK_MAX_ATTEMPTS.
+CITY_SCRAPERS_WAYBACK_ENDPOINT = "https://web.archive.org/save/{url}"
+CITY_SCRAPERS_WAYBACK_DB = "wayback.db"
+CITY_SCRAPERS_WAYBACK_CONCURRENCY = 2
+CITY_SCRAPERS_WAYBACK_DELAY = 5.0
+CITY_SCRAPERS_WAYBACK_BATCH_SIZE = 50
+CITY_SCRAPERS_WAYBACK_TTL = 7 * 24 * 60 * 60
+CITY_SCRAPERS_WAYBACK_MAX_ATTEMPTS = 3
+CITY_SCRAPERS_WAYBACK_DRAIN_TIMEOUT = 120
+
+# HTTP cache used by `scrapy crawl --record` and `--replay`. Bodies are stored gzipped
+# and deduplicated under .scrapy/httpcache, and entries are evicted after the expiration
+# or once the cache is over the size cap.
+HTTPCACHE_STORAGE = "city_scrapers.httpcache.CompressedCacheStorage"
+HTTPCACHE_EXPIRATION_SECS = int(os.getenv("HTTPCACHE_EXPIRATION_SECS", 24 * 60 * 60))
+CITY_SCRAPERS_HTTPCACHE_MAX_MB = int(os.getenv("CITY_SCRAPERS_HTTPCACHE_MAX_MB", 500))
+
+# Columnar feed formats for meeting archives, which require pyarrow. Batches are
+# written as items are scraped, and daily files can be merged into a dataset
+# partitioned by spider and year with `scrapy compactfeeds`.
+FEED_EXPORTERS = {
+    "parquet": "city_scrapers.exporters.ParquetItemExporter",
+    "arrow": "city_scrapers.exporters.ArrowItemExporter",
 }
 
-SPIDER_MIDDLEWARES = {}
+# Use project commands, which include the commands from city_scrapers_core package
 
-# Use commands from city_scrapers_core package
+COMMANDS_MODULE = "city_scrapers.commands"
 
-COMMANDS_MODULE = "city_scrapers_core.commands"
+# Add histograms of time spent in spider parse methods, date parsing, item pipelines and
+# downloads to each spider's stats as timing/*
+CITY_SCRAPERS_TIMING_ENABLED = False
 
 EXTENSIONS = {
+    "scrapy.extensions.throttle.AutoThrottle": None,
+    "city_scrapers.extensions.HostThrottle": 0,
+    "city_scrapers.extensions.DateParserStatsExtension": 500,
+    "city_scrapers.extensions.TimingStatsExtension": 500,
     "scrapy.extensions.closespider.CloseSpider": None,
 }
 
@@ -0,0 +1,40 @@
+import os
+
+from .base import *  # noqa
+
+# Settings for load testing crawls against the local mock agency server started with
+# `python -m benchmarks.mock_agency`, which serves every spider's pages from the test
+# fixtures. Every request is sent through the server as a proxy, so nothing reaches the
+# agencies' sites, and a load report is logged when the crawl finishes.
+CITY_SCRAPERS_MOCK_AGENCY_URL = os.getenv(
+    "CITY_SCRAPERS_MOCK_AGENCY_URL", "http://127.0.0.1:8600"
+)
+# Load report JSON file written when the crawl finishes, if set
+CITY_SCRAPERS_MOCK_AGENCY_REPORT = os.getenv("CITY_SCRAPERS_MOCK_AGENCY_REPORT")
+
+DOWNLOADER_MIDDLEWARES = {
+    **DOWNLOADER_MIDDLEWARES,  # noqa
+    # Before robots.txt is requested, so it's requested from the server too
+    "city_scrapers.middleware.MockAgencyMiddleware": 50,
+}
+
+EXTENSIONS = {
+    **EXTENSIONS,  # noqa
+    "city_scrapers.extensions.LoadReportExtension": 0,
+}
+
+# Keep learned limits, robots.txt files and other state from load tests apart from
+# real runs, in a directory relative to the .scrapy directory
+CITY_SCRAPERS_MOCK_AGENCY_DIR = os.getenv("CITY_SCRAPERS_MOCK_AGENCY_DIR", "mock")
+CITY_SCRAPERS_HOST_THROTTLE_DB = os.path.join(
+    CITY_SCRAPERS_MOCK_AGENCY_DIR, "throttle.db"
+)
+CITY_SCRAPERS_ROBOTSTXT_DB = os.path.join(CITY_SCRAPERS_MOCK_AGENCY_DIR, "robotstxt.db")
+CITY_SCRAPERS_DNSCACHE_DB = os.path.join(CITY_SCRAPERS_MOCK_AGENCY_DIR, "dns.db")
+CITY_SCRAPERS_CIRCUIT_BREAKER_DB = os.path.join(
+    CITY_SCRAPERS_MOCK_AGENCY_DIR, "circuit.db"
+)
+CITY_SCRAPERS_CONDITIONAL_DB = os.path.join(
+    CITY_SCRAPERS_MOCK_AGENCY_DIR, "conditional.db"
+)
+CITY_SCRAPERS_DIFF_DB = os.path.join(CITY_SCRAPERS_MOCK_AGENCY_DIR, "diff.db")
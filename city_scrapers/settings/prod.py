@@ -13,8 +13,11 @@ ITEM_PIPELINES = {
     # "city_scrapers_core.pipelines.S3DiffPipeline": 200,
     # "city_scrapers_core.pipelines.AzureDiffPipeline": 200,
     # "city_scrapers_core.pipelines.GCSDiffPipeline": 200,
+    # Or enable this to only output new, changed and cancelled meetings based on the
+    # previous runs stored locally in .scrapy/diff.db
+    # "city_scrapers.pipelines.LocalDiffPipeline": 350,
     "city_scrapers_core.pipelines.MeetingPipeline": 300,
-    "city_scrapers_core.pipelines.OpenCivicDataPipeline": 400,
+    "city_scrapers.pipelines.OpenCivicDataPipeline": 400,
 }
 
 # Uncomment one of the StatusExtension classes to write an SVG badge of each scraper's
@@ -27,17 +30,27 @@ ITEM_PIPELINES = {
 
 SENTRY_DSN = os.getenv("SENTRY_DSN")
 
+# Skip parsing responses that haven't changed since the last run, emitting the items
+# from the last run instead. The .scrapy directory is cached between workflow runs.
+CITY_SCRAPERS_CONDITIONAL_ENABLED = True
+
 EXTENSIONS = {
     # "city_scrapers_core.extensions.AzureBlobStatusExtension": 100,
     # "city_scrapers_core.extensions.S3StatusExtension": 100,
     # "city_scrapers_core.extensions.GCSStatusExtension": 100,
     "scrapy_sentry_errors.extensions.Errors": 10,
+    "scrapy.extensions.throttle.AutoThrottle": None,
+    "city_scrapers.extensions.HostThrottle": 0,
+    "city_scrapers.extensions.DateParserStatsExtension": 500,
+    "city_scrapers.extensions.TimingStatsExtension": 500,
     "scrapy.extensions.closespider.CloseSpider": None,
 }
 
 FEED_EXPORTERS = {
     "json": "scrapy.exporters.JsonItemExporter",
     "jsonlines": "scrapy.exporters.JsonLinesItemExporter",
+    "parquet": "city_scrapers.exporters.ParquetItemExporter",
+    "arrow": "city_scrapers.exporters.ArrowItemExporter",
 }
 
 FEED_FORMAT = "jsonlines"
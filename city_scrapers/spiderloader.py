@@ -0,0 +1,148 @@
+import json
+import os
+import warnings
+from importlib import import_module
+from importlib.util import find_spec
+from typing import Dict, List, Optional, Type
+from urllib.parse import urlparse
+
+from scrapy import Request, Spider
+from scrapy.crawler import Crawler
+from scrapy.interfaces import ISpiderLoader
+from scrapy.settings import BaseSettings, Settings
+from scrapy.spiderloader import SpiderLoader
+from scrapy.utils.url import url_is_from_any_domain
+from zope.interface import implementer
+
+MANIFEST_FILE = "manifest.json"
+
+
+def get_manifest_path(spider_module: str) -> Optional[str]:
+    """Path of the manifest in a spider package, found without importing it"""
+    spec = find_spec(spider_module)
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    return os.path.join(list(spec.submodule_search_locations)[0], MANIFEST_FILE)
+
+
+def get_spider_domains(spidercls: Type[Spider]) -> List[str]:
+    """Domains a spider crawls, from its allowed_domains or otherwise the hosts of the
+    requests it starts with under the default settings
+    """
+    if getattr(spidercls, "allowed_domains", None):
+        return sorted(set(spidercls.allowed_domains))
+    spider = spidercls.from_crawler(Crawler(spidercls, Settings()))
+    return sorted(
+        {urlparse(request.url).hostname for request in spider.start_requests()} - {None}
+    )
+
+
+def build_manifest(spider_module: str) -> Dict[str, Dict]:
+    """Import every spider in a package and describe each one by name"""
+    from scrapy.utils.misc import walk_modules
+    from scrapy.utils.spider import iter_spider_classes
+
+    manifest = {}
+    for module in walk_modules(spider_module):
+        for spidercls in iter_spider_classes(module):
+            manifest[spidercls.name] = {
+                "module": module.__name__,
+                "class": spidercls.__name__,
+                "agency": getattr(spidercls, "agency", None),
+                "domains": get_spider_domains(spidercls),
+            }
+    return dict(sorted(manifest.items()))
+
+
+def update_manifest(spider_module: str, check: bool = False) -> bool:
+    """Rebuild the manifest of a spider package, returning whether it was out of date.
+    The file is only written if it changed and ``check`` is False.
+    """
+    manifest_path = get_manifest_path(spider_module)
+    if manifest_path is None:
+        raise ValueError(f"{spider_module} is not a package")
+    content = json.dumps(build_manifest(spider_module), indent=2) + "\n"
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            if f.read() == content:
+                return False
+    if not check:
+        with open(manifest_path, "w") as f:
+            f.write(content)
+    return True
+
+
+@implementer(ISpiderLoader)
+class ManifestSpiderLoader:
+    """Spider loader listing spiders from the manifest.json in each package in
+    SPIDER_MODULES, so only the module of a spider that's loaded is imported rather
+    than every spider in the project.
+
+    Manifests are written by ``scrapy manifest``. If a package doesn't have one, every
+    spider is imported with Scrapy's SpiderLoader instead.
+    """
+
+    def __init__(self, settings: BaseSettings):
+        self.spider_modules: List[str] = settings.getlist("SPIDER_MODULES")
+        self.manifest: Dict[str, Dict] = {}
+        self._spiders: Dict[str, Type[Spider]] = {}
+        self._fallback: Optional[SpiderLoader] = None
+        for spider_module in self.spider_modules:
+            manifest_path = get_manifest_path(spider_module)
+            if manifest_path is None or not os.path.exists(manifest_path):
+                warnings.warn(
+                    f"No spider manifest found for {spider_module}, importing every "
+                    "spider instead. Run 'scrapy manifest' to create one.",
+                    category=RuntimeWarning,
+                )
+                self._fallback = SpiderLoader(settings)
+                return
+            with open(manifest_path) as f:
+                self.manifest.update(json.load(f))
+
+    @classmethod
+    def from_settings(cls, settings: BaseSettings) -> "ManifestSpiderLoader":
+        return cls(settings)
+
+    def load(self, spider_name: str) -> Type[Spider]:
+        """Import and return the spider class with a name, raising KeyError if it
+        isn't in the manifest
+        """
+        if self._fallback is not None:
+            return self._fallback.load(spider_name)
+        if spider_name not in self._spiders:
+            if spider_name not in self.manifest:
+                raise KeyError(f"Spider not found: {spider_name}")
+            entry = self.manifest[spider_name]
+            try:
+                module = import_module(entry["module"])
+            except ModuleNotFoundError as e:
+                if e.name != entry["module"]:
+                    raise
+                module = None
+            spidercls = getattr(module, entry["class"], None)
+            if getattr(spidercls, "name", None) != spider_name:
+                raise KeyError(
+                    f"Spider not found: {spider_name} (the spider manifest is out of "
+                    "date, run 'scrapy manifest' to update it)"
+                )
+            self._spiders[spider_name] = spidercls
+        return self._spiders[spider_name]
+
+    def find_by_request(self, request: Request) -> List[str]:
+        """Names of spiders that can handle a request, matching it against each
+        spider's name and domains like Spider.handles_request, with the hosts of its
+        start requests standing in for allowed_domains when it doesn't set them
+        """
+        if self._fallback is not None:
+            return self._fallback.find_by_request(request)
+        return [
+            name
+            for name, entry in self.manifest.items()
+            if url_is_from_any_domain(request.url, [name, *entry["domains"]])
+        ]
+
+    def list(self) -> List[str]:
+        if self._fallback is not None:
+            return self._fallback.list()
+        return list(self.manifest)
@@ -1,28 +1,48 @@
 from city_scrapers_core.constants import BOARD
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
-from dateutil.parser import parse
 
+from city_scrapers.dates import DateParser
+from city_scrapers.extract import RowExtractor
+from city_scrapers.mixins import CompactItemsMixin, DerivedFieldsMixin
+from city_scrapers.pool import in_process_pool
 
-class LoscaBoardOfSupervisorsSpider(CityScrapersSpider):
+
+class LoscaBoardOfSupervisorsSpider(
+    CompactItemsMixin, DerivedFieldsMixin, CityScrapersSpider
+):
     name = "losca_Board_of_Supervisors"
     agency = "Los Angeles County Board of Supervisors"
     timezone = "America/Los_Angeles"
     start_urls = ["https://bos.lacounty.gov/board-meeting-agendas/"]
+    # => 'Tuesday, September 17, 2024 09:30 AM'
+    date_parser = DateParser("%A, %B %d, %Y %I:%M %p")
+    # ".card" returns duplicates bc page has ".card"s inside .card elements
+    # ".upcoming-meeting" returns the correct number of meetings even though
+    # some of the meetings already happened and are not "upcoming"
+    meeting_extractor = RowExtractor(
+        {
+            "title": ".card-title::text",
+            "date": ".calendar-date time::text",
+            "time": ".clock-time time::text",
+            "links": (
+                "a",
+                RowExtractor({"title": "span::text", "href": "::attr(href)"}),
+            ),
+        },
+        row=".upcoming-meeting",
+    )
 
+    @in_process_pool
     def parse(self, response):
         """Parse meeting items from agency website."""
-        location = {
-            "name": "Kenneth Hahn Hall of Administration",
-            "address": "500 West Temple Street, Room 381B, Los Angeles",
-        }
-        # ".card" returns duplicates bc page has ".card"s inside .card elements
-        # ".upcoming-meeting" returns the correct number of meetings even though
-        # some of the meetings already happened and are not "upcoming"
-        for item in response.css(".upcoming-meeting"):
-            title = item.css(".card-title::text").get()
+        location = self._location(
+            name="Kenneth Hahn Hall of Administration",
+            address="500 West Temple Street, Room 381B, Los Angeles",
+        )
+        for item in self.meeting_extractor.extract_rows(response):
             meeting = Meeting(
-                title=title,
+                title=item["title"],
                 description="",
                 classification=BOARD,
                 start=self._parse_start(item),
@@ -47,12 +67,12 @@ class LoscaBoardOfSupervisorsSpider(CityScrapersSpider):
         Do not hardcode time when parsing.
         """
         # => 'Tuesday, September 17, 2024'
-        date = item.css(".calendar-date time::text").get()
+        date = item["date"]
 
         # => '09:30 AM\n            PST'
-        time = item.css(".clock-time time::text").get().split("\n")[0]
+        time = item["time"].split("\n")[0]
 
-        datetime = parse(f"{date} {time}")
+        datetime = self.date_parser(f"{date} {time}")
         return datetime
 
     def _parse_links(self, item):
@@ -63,15 +83,13 @@ class LoscaBoardOfSupervisorsSpider(CityScrapersSpider):
         Add all if found.
         """
         out = []
-        links = item.css("a")
         previous_title = None
-        for link in links:
-            title = link.css("span::text").get()
+        for link in item["links"]:
+            title = link["title"]
             # if the title is just PDF, use previous title and add PDF to it
             # becomes useful when there are multiple "PDF" links
             if title == "PDF":
                 title = f"{previous_title} PDF"
             previous_title = title
-            href = link.css("::attr(href)").get()
-            out.append({"title": title, "href": href})
+            out.append(self._link(href=link["href"], title=title))
         return out
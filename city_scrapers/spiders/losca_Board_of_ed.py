@@ -3,10 +3,12 @@ import re
 from city_scrapers_core.constants import BOARD
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
-from dateutil.parser import parse
 
+from city_scrapers.dates import DateParser
+from city_scrapers.mixins import DerivedFieldsMixin, FeedMixin
 
-class LoscaBoardOfEdSpider(CityScrapersSpider):
+
+class LoscaBoardOfEdSpider(FeedMixin, DerivedFieldsMixin, CityScrapersSpider):
     name = "losca_Board_of_ed"
     agency = "Los Angeles Unified School District Board of Education"
     timezone = "America/Los_Angeles"
@@ -15,101 +17,61 @@ class LoscaBoardOfEdSpider(CityScrapersSpider):
     start_urls = [
         "https://www.lausd.org/site/RSS.aspx?DomainID=1057&ModuleInstanceID=73805&PageID=18628&PMIID=0"  # noqa
     ]
+    # => '9/24/2024 1:00 PM'
+    date_parser = DateParser("%m/%d/%Y %I:%M %p")
+    # => '9/19/2024 10:00 AM - 1:00 PM Children... Early Education Committee'
+    title_re = re.compile(
+        r"(?P<date>\d{1,2}/\d{1,2}/\d{4})\s+(?P<start>\d{1,2}:\d{2}\s+[AP]M)\s+-\s+"
+        r"(?P<end>\d{1,2}:\d{2}\s+[AP]M)\s+(?P<title>.*)",
+        re.DOTALL,
+    )
 
-    def parse(self, response):
+    def parse_entry(self, entry, response):
         """
-        Parse meeting items from RSS feed.
+        Parse a meeting from an RSS feed item.
         """
-        location = {
-            "name": "LAUSD Headquarters",
-            "address": "333 South Beaudry Avenue, Board Room, Los Angeles, CA 90017",
-        }
-        for item in response.css("item"):
-            meeting = Meeting(
-                title=self._parse_title(item),
-                description="",
-                classification=BOARD,
-                start=self._parse_start(item),
-                end=self._parse_end(item),
-                all_day=False,
-                time_notes="",
-                location=location,
-                links=self._parse_links(item),
-                source=response.url,
-            )
-
-            meeting["status"] = self._get_status(meeting)
-            meeting["id"] = self._get_id(meeting)
-
-            yield meeting
-
-    def _parse_title(self, item):
-        """
-        Parse meeting title. RSS feed titles always start with timestamp.
-        Ex: '9/19/2024 10:00 AM - 1:00 PM Children... Early Education Committee'
-        Remove timestamp from string and return title.
-        Use regex and fallback to #split().
-        """
-        raw = item.css("title::text").get()
-        # Match everything after the timestamp pattern
-        match = re.search(
-            r"\d{1,2}/\d{1,2}/\d{4}\s+\d{1,2}:\d{2}\s+[AP]M\s+-\s+\d{1,2}:\d{2}\s+[AP]M\s+(.*)",  # noqa
-            raw,
+        title, start, end = self._parse_title_times(entry["title"])
+        return Meeting(
+            title=title,
+            description="",
+            classification=BOARD,
+            start=start,
+            end=end,
+            all_day=False,
+            time_notes="",
+            location=self._location(
+                name="LAUSD Headquarters",
+                address="333 South Beaudry Avenue, Board Room, Los Angeles, CA 90017",
+            ),
+            links=self._parse_links(entry),
+            source=response.url,
         )
-        if match:
-            return match.group(1).strip()
-        else:
-            # If pattern doesn't match, return original without first 6 words
-            return " ".join(raw.split()[6:])
 
-    def _parse_start(self, item):
+    def _parse_title_times(self, raw):
         """
-        Parse start datetime as a naive datetime object.
-        pubdate::text gives us GMT, which is 7 hours ahead of PST.
-        Get start date from title instead, since it is in the correct time zone.
+        Parse the meeting title and naive start and end datetimes from an RSS feed
+        title, which always starts with the date and times in the correct time zone
+        unlike pubDate, which is in GMT.
+        Ex: '9/19/2024 10:00 AM - 1:00 PM Children... Early Education Committee'
+        Falls back to splitting on whitespace if the pattern doesn't match.
         """
-        raw = item.css("title::text").get()
-        match = re.search(r"(\d{1,2}/\d{1,2}/\d{4}\s+\d{1,2}:\d{2}\s+[AP]M)", raw)
+        match = self.title_re.search(raw)
         if match:
-            return parse(match.group(1))
-        else:
-            # Fallback to the original method if regex doesn't match
-            return parse(" ".join(raw.split()[0:3]))
-
-    def _parse_end(self, item):
-        """
-        Parse end datetime as a naive datetime object.
-        End time is in title.
-        """
-        raw = item.css("title::text").get()
-        match = re.search(
-            r"\d{1,2}/\d{1,2}/\d{4}\s+\d{1,2}:\d{2}\s+[AP]M\s+-\s+(\d{1,2}:\d{2}\s+[AP]M)",  # noqa
-            raw,
+            date = match.group("date")
+            return (
+                match.group("title").strip(),
+                self.date_parser(f"{date} {match.group('start')}"),
+                self.date_parser(f"{date} {match.group('end')}"),
+            )
+        raw_split = raw.split()
+        return (
+            " ".join(raw_split[6:]),
+            self.date_parser(" ".join(raw_split[0:3])),
+            self.date_parser(f"{raw_split[0]} {' '.join(raw_split[4:6])}"),
         )
-        if match:
-            date = raw.split()[0]
-            time = match.group(1)
-            return parse(f"{date} {time}")
-        else:
-            # Fallback to the original method if regex doesn't match
-            raw_split = raw.split()
-            return parse(f"{raw_split[0]} {' '.join(raw_split[4:6])}")
 
-    def _parse_links(self, item):
+    def _parse_links(self, entry):
         """
-        Parse links. item.get() returns
-        '...</title><link>https://www.lausd.org...EventDateID=73502<pubdate>...'
-        This string does not have a closing </link> tag even though the source
-        response does. This causes item.css('link') to return an empty tag.
-        We must parse link another way. Try regex with split as fallback.
+        Parse link to the meeting details.
         """
-        raw = item.get()
-        match = re.search(r"<link>(.*?)<", raw, re.DOTALL)
-        if match:
-            link = match.group(1).strip()
-        else:
-            # Fallback to double split if regex doesn't match
-            split = raw.split("<link>")[1]
-            link = split.split("<pubdate>")[0].strip()
-
-        return [{"title": "Meeting Details", "href": link}]
+        return [self._link(href=entry["link"], title="Meeting Details")]
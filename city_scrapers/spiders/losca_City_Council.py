@@ -1,41 +1,47 @@
 from city_scrapers_core.constants import CITY_COUNCIL
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
-from dateutil.parser import parse
 
+from city_scrapers.dates import DateParser
+from city_scrapers.mixins import DerivedFieldsMixin, PrimeGovMixin
 
-class LoscaCityCouncilSpider(CityScrapersSpider):
+
+class LoscaCityCouncilSpider(PrimeGovMixin, DerivedFieldsMixin, CityScrapersSpider):
     name = "losca_City_Council"
     agency = "Los Angeles City Council"
     timezone = "America/Los_Angeles"
+    date_parser = DateParser(iso=True)
     # original URL https://clerk.lacity.gov/calendar
     # data is shown from an iframe https://lacity.primegov.com/public/portal
     # iframe loads data from API. "scrape" API instead for upcoming
-    # archived: lacity.primegov.com/api/v2/PublicPortal/ListArchivedMeetings?year=2024
-    start_urls = [
-        "https://lacity.primegov.com/api/v2/PublicPortal/ListUpcomingMeetings?_=1726255032697"  # noqa
-    ]
 
-    def parse(self, response):
+    def start_requests(self):
         """
-        Parse API response of upcoming meetings only.
+        Request upcoming meetings, or archived meetings by year with
+        `-a since=YEAR` to backfill.
         """
+        if self.since:
+            yield from self.backfill_requests()
+            return
+        yield self.upcoming_request()
 
-        # convert response to json
-        data = response.json()
+    def parse(self, response):
+        """
+        Parse API response of upcoming or archived meetings.
+        """
 
         # hardcode location
-        location = {
-            "name": "Office of the City Clerk",
-            "address": "200 N Spring St, Room 360, Los Angeles, CA 90012",
-        }
+        location = self._location(
+            name="Office of the City Clerk",
+            address="200 N Spring St, Room 360, Los Angeles, CA 90012",
+        )
 
-        for obj in data:
+        for obj in self.parse_primegov_meetings(response):
             meeting = Meeting(
                 title=obj["title"],
                 description="",
                 classification=CITY_COUNCIL,
-                start=parse(obj["dateTime"]),
+                start=self.date_parser(obj["dateTime"]),
                 end=None,
                 all_day=False,
                 time_notes="",
@@ -51,7 +57,4 @@ class LoscaCityCouncilSpider(CityScrapersSpider):
 
     def _parse_links(self, obj):
         """Parse links based on given video URL."""
-        links = []
-        if obj.get("videoUrl"):
-            links.append({"title": "video", "href": obj["videoUrl"]})
-        return links
+        return self._parse_video_links(obj, "video")
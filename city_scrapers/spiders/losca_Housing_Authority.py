@@ -3,80 +3,144 @@ from datetime import datetime
 from city_scrapers_core.constants import BOARD
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
-from dateutil.parser import parse
 from dateutil.relativedelta import relativedelta
+from lxml import etree
 
+from city_scrapers.dates import DateParser
+from city_scrapers.extract import RowExtractor
+from city_scrapers.mixins import CompactItemsMixin, DerivedFieldsMixin
+from city_scrapers.pool import in_process_pool
 
-class LoscaHousingAuthoritySpider(CityScrapersSpider):
+link_extractor = RowExtractor({"title": "::text", "href": "::attr(href)"})
+
+
+class LoscaHousingAuthoritySpider(
+    CompactItemsMixin, DerivedFieldsMixin, CityScrapersSpider
+):
     name = "losca_Housing_Authority"
     agency = "Housing Authority of the City of Los Angeles"
     timezone = "America/Los_Angeles"
     start_urls = ["https://www.hacla.org/en/bocfiles"]
+    # Parse the page incrementally, stopping once rows are past the cutoff. Can be
+    # disabled with `-a stream=false` to parse the full page with selectors instead.
+    stream = True
+    chunk_size = 64 * 1024
+    # => '01/09/2025 9am'
+    date_parser = DateParser("%m/%d/%Y %I%p")
+    # The title has the date needed to check the cutoff, so it's extracted separately
+    # from the rest of the row
+    title_extractor = RowExtractor(
+        # ex: '01/09/2025 BOC Regular Meeting'
+        {"title": ".views-field-title .field-content::text"},
+        row=".views-element-container .views-row",
+    )
+    links_extractor = RowExtractor(
+        {
+            "minutes": (".views-field-field-action-minutes a", link_extractor),
+            "audio": (".views-field-field-audio a", link_extractor),
+        }
+    )
 
+    @in_process_pool
     def parse(self, response):
         """
         Parse meetings from the meetings section.
+        Rows are sorted newest first, so when streaming, stop at the first one past
+        the cutoff.
         """
         # location from https://www.hacla.org/en/about-us/contact-us
-        location = {
-            "name": "HACLA",
-            "address": "2600 Wilshire Blvd. Los Angeles, CA 90057",
-        }
-        for item in response.css(".views-element-container .views-row"):
-            start_date = self._parse_start(item)
-            cutoff = datetime.now() - relativedelta(months=6)
-            if start_date and start_date > cutoff:
-                meeting = Meeting(
-                    title=self._parse_title(item),
-                    description="",
-                    classification=BOARD,
-                    start=self._parse_start(item),
-                    end=None,
-                    all_day=False,
-                    time_notes="",
-                    location=location,
-                    links=self._parse_links(item),
-                    source=self._parse_source(response),
-                )
+        location = self._location(
+            name="HACLA", address="2600 Wilshire Blvd. Los Angeles, CA 90057"
+        )
+        cutoff = datetime.now() - relativedelta(months=6)
+        stream = str(self.stream).lower() not in ["false", "0"]
+        if stream:
+            rows = self._iter_rows(response)
+        else:
+            rows = self.title_extractor.rows(response)
+        for row in rows:
+            text = self.title_extractor.extract(row)["title"]
+            start_date = self._parse_start(text)
+            if not start_date:
+                continue
+            if start_date <= cutoff:
+                if stream:
+                    break
+                continue
+            meeting = Meeting(
+                title=self._parse_title(text),
+                description="",
+                classification=BOARD,
+                start=start_date,
+                end=None,
+                all_day=False,
+                time_notes="",
+                location=location,
+                links=self._parse_links(self.links_extractor.extract(row)),
+                source=self._parse_source(response),
+            )
 
-                meeting["status"] = self._get_status(meeting)
-                meeting["id"] = self._get_id(meeting)
+            meeting["status"] = self._get_status(meeting)
+            meeting["id"] = self._get_id(meeting)
 
-                yield meeting
+            yield meeting
 
-    def _parse_title(self, item):
+    def _iter_rows(self, response):
+        """
+        Yield meeting row elements in document order while feeding the page to lxml
+        in chunks, so the rest of the page isn't parsed once iteration stops.
+        Rows are cleared once they've been handled to keep the tree small.
+        """
+        parser = etree.HTMLPullParser(events=("end",), encoding=response.encoding)
+        body = response.body
+        for offset in range(0, len(body), self.chunk_size):
+            parser.feed(body[offset : offset + self.chunk_size])
+            yield from self._read_rows(parser)
+        # Closing the parser flushes rows still in its buffer after the last chunk
+        parser.close()
+        yield from self._read_rows(parser)
+
+    def _read_rows(self, parser):
+        """Yield rows from the parser's pending events, then clear them"""
+        for _, element in parser.read_events():
+            if self._is_row(element):
+                yield element
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+
+    def _is_row(self, element):
+        """Check if an element is a .views-row in .views-element-container"""
+        if "views-row" not in (element.get("class") or "").split():
+            return False
+        return any(
+            "views-element-container" in (ancestor.get("class") or "").split()
+            for ancestor in element.iterancestors()
+        )
+
+    def _parse_title(self, text):
         """Parse or generate meeting title."""
-        text = item.css(".views-field-title .field-content::text").get()
         title = " ".join(text.split()[1:])
         return title
 
-    def _parse_start(self, item):
+    def _parse_start(self, text):
         """
         Parse start datetime as a naive datetime object.
         Website says "meetings indicated herein begin at 9:00 a.m"
         """
-        text = item.css(".views-field-title .field-content::text").get()
         if text:
             date = text.split()[0]
-            return parse(f"{date} 9am")
+            return self.date_parser(f"{date} 9am")
         else:
             return None
 
     def _parse_links(self, item):
         """Parse or generate links."""
-        links = []
-        # add minutes links if any
-        for link in item.css(".views-field-field-action-minutes a"):
-            title = link.css("::text").get()
-            href = link.css("::attr(href)").get()
-            links.append({"title": title, "href": href})
-        # add audio links if any
-        for link in item.css(".views-field-field-audio a"):
-            title = link.css("::text").get()
-            href = link.css("::attr(href)").get()
-            links.append({"title": title, "href": href})
-
-        return links
+        # add minutes links if any, followed by audio links if any
+        return [
+            self._link(href=link["href"], title=link["title"])
+            for link in item["minutes"] + item["audio"]
+        ]
 
     def _parse_source(self, response):
         """Parse or generate source."""
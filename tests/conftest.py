@@ -0,0 +1,87 @@
+"""Shared fixtures for loading and parsing the files in tests/files.
+
+Responses and parsed items are cached for the whole session, so test modules using
+the same fixture file don't parse it again.
+Nothing is parsed while tests are collected, and time is only frozen while a spider is
+parsing, so modules don't depend on each other or on the order tests run in.
+"""
+
+from copy import deepcopy
+from functools import lru_cache
+from os.path import dirname, join
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+import pytest
+from city_scrapers_core.items import Meeting
+from city_scrapers_core.utils import file_response
+from freezegun import freeze_time
+from scrapy import Spider
+from scrapy.http import Response
+from scrapy.utils.test import get_crawler
+
+FILES_DIR = join(dirname(__file__), "files")
+
+
+def pytest_configure(config):
+    """Install the default reactor before any crawler is created, which Scrapy 2.13+
+    requires of crawlers built with ``get_crawler``
+    """
+    from twisted.internet import reactor  # noqa: F401
+
+
+@lru_cache(maxsize=None)
+def load_response(file_name: str, url: str) -> Response:
+    """Load a file from tests/files as a response, cached for the session"""
+    return file_response(join(FILES_DIR, file_name), url=url)
+
+
+@lru_cache(maxsize=None)
+def _parse_cached(
+    spidercls: Type[Spider],
+    file_name: str,
+    url: str,
+    frozen_date: str,
+    settings: Tuple[Tuple[str, Any], ...],
+    spider_kwargs: Tuple[Tuple[str, Any], ...],
+) -> Tuple[Meeting, ...]:
+    crawler = get_crawler(spidercls, settings_dict=dict(settings))
+    spider = spidercls.from_crawler(crawler, **dict(spider_kwargs))
+    response = load_response(file_name, url)
+    with freeze_time(frozen_date):
+        return tuple(spider.parse(response))
+
+
+def parse_file(
+    spidercls: Type[Spider],
+    file_name: str,
+    url: str,
+    frozen_date: str,
+    settings: Optional[Dict[str, Any]] = None,
+    **spider_kwargs,
+) -> List[Meeting]:
+    """Parse a file from tests/files with a spider while time is frozen at a date.
+
+    Files are parsed once for the session and the items deep copied for each caller,
+    so changes made by one test don't affect others.
+    """
+    items = _parse_cached(
+        spidercls,
+        file_name,
+        url,
+        frozen_date,
+        tuple(sorted((settings or {}).items())),
+        tuple(sorted(spider_kwargs.items())),
+    )
+    return [deepcopy(item) for item in items]
+
+
+@pytest.fixture(scope="session")
+def parse_fixture() -> Callable[..., List[Meeting]]:
+    """Fixture for ``parse_file``"""
+    return parse_file
+
+
+@pytest.fixture(scope="session")
+def fixture_response() -> Callable[[str, str], Response]:
+    """Fixture for ``load_response``"""
+    return load_response
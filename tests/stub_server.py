@@ -0,0 +1,114 @@
+"""Local HTTP server for tests, responding to every path with a configurable status
+after a configurable delay, optionally redirecting each path to /redirected/<path>
+first. Run as a module to crawl it in a new process, printing the
+crawl's stats and the number of requests the server received as JSON::
+
+    python -m tests.stub_server --status 500 --delay 0.1 --requests 20 --db circuit.db
+"""
+
+import argparse
+import json
+
+import scrapy
+from scrapy.crawler import CrawlerProcess
+from twisted.internet import reactor
+from twisted.web.resource import Resource
+from twisted.web.server import NOT_DONE_YET, Site
+
+
+class StubResource(Resource):
+    isLeaf = True
+
+    def __init__(self, status=200, delay=0.0, body=b"ok", redirect=False):
+        super().__init__()
+        self.status = status
+        self.delay = delay
+        self.body = body
+        self.redirect = redirect
+        self.requests = 0
+
+    def render_GET(self, request):
+        self.requests += 1
+        reactor.callLater(self.delay, self._respond, request)
+        return NOT_DONE_YET
+
+    def _respond(self, request):
+        if request.finished or request.channel is None:
+            return
+        if self.redirect and not request.path.startswith(b"/redirected/"):
+            request.setResponseCode(301)
+            request.setHeader(b"Location", b"/redirected" + request.path)
+            request.finish()
+            return
+        request.setResponseCode(self.status)
+        request.write(self.body)
+        request.finish()
+
+
+class StubSpider(scrapy.Spider):
+    name = "stub"
+
+    def __init__(self, url, requests, **kwargs):
+        super().__init__(**kwargs)
+        self.url = url
+        self.requests = requests
+
+    def start_requests(self):
+        for idx in range(self.requests):
+            yield scrapy.Request(f"{self.url}/{idx}")
+
+    def parse(self, response):
+        yield {"url": response.url}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--status", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.0)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--db", required=True, help="Circuit breaker SQLite file")
+    parser.add_argument("--max-latency", type=float, default=30.0)
+    parser.add_argument("--redirect", action="store_true")
+    args = parser.parse_args()
+
+    resource = StubResource(args.status, args.delay, redirect=args.redirect)
+    port = reactor.listenTCP(0, Site(resource), interface="127.0.0.1")
+    process = CrawlerProcess(
+        {
+            "LOG_LEVEL": "WARNING",
+            "REQUEST_FINGERPRINTER_IMPLEMENTATION": "2.7",
+            # The server already runs on the default reactor imported above
+            "TWISTED_REACTOR": None,
+            "RETRY_TIMES": 2,
+            "DOWNLOADER_MIDDLEWARES": {
+                "city_scrapers.middleware.CircuitBreakerMiddleware": 610
+            },
+            "CITY_SCRAPERS_CIRCUIT_BREAKER_ENABLED": True,
+            "CITY_SCRAPERS_CIRCUIT_BREAKER_DB": args.db,
+            "CITY_SCRAPERS_CIRCUIT_BREAKER": {
+                "*": {
+                    "window": 10,
+                    "min_requests": 5,
+                    "failure_rate": 0.5,
+                    "max_latency": args.max_latency,
+                }
+            },
+        }
+    )
+    crawler = process.create_crawler(StubSpider)
+    process.crawl(
+        crawler,
+        url=f"http://127.0.0.1:{port.getHost().port}",
+        requests=args.requests,
+    )
+    process.start()
+    print(
+        json.dumps(
+            {"stats": crawler.stats.get_stats(), "server_requests": resource.requests},
+            default=str,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
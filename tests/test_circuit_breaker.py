@@ -0,0 +1,195 @@
+import json
+import subprocess
+import sys
+from os.path import dirname
+from types import SimpleNamespace
+
+import pytest
+from scrapy.exceptions import IgnoreRequest
+from scrapy.http import Request, Response
+from scrapy.utils.test import get_crawler
+from twisted.internet.error import TimeoutError
+
+from city_scrapers.middleware import CircuitBreakerMiddleware
+from city_scrapers.spiders.losca_Housing_Authority import LoscaHousingAuthoritySpider
+
+URL = "https://www.hacla.org/en/about-hacla/board-of-commissioners"
+HOST = "www.hacla.org"
+
+
+@pytest.fixture(autouse=True)
+def clear_connections():
+    yield
+    CircuitBreakerMiddleware._connections.clear()
+
+
+def get_middleware(tmp_path):
+    crawler = get_crawler(
+        LoscaHousingAuthoritySpider,
+        settings_dict={
+            "CITY_SCRAPERS_CIRCUIT_BREAKER_ENABLED": True,
+            "CITY_SCRAPERS_CIRCUIT_BREAKER_DB": str(tmp_path / "circuit.db"),
+            "CITY_SCRAPERS_CIRCUIT_BREAKER": {
+                "*": {"window": 4, "min_requests": 3, "failure_rate": 0.5},
+                HOST: {"max_latency": 10.0},
+            },
+        },
+    )
+    spider = crawler._create_spider()
+    crawler.stats.open_spider(spider)
+    closed = []
+    crawler.engine = SimpleNamespace(
+        close_spider=lambda spider, reason: closed.append(reason)
+    )
+    return CircuitBreakerMiddleware.from_crawler(crawler), spider, closed
+
+
+def download(middleware, spider, status=200, latency=1.0):
+    request = Request(URL)
+    result = middleware.process_request(request, spider)
+    if result is not None:
+        return result
+    respond(middleware, spider, request, status, latency)
+
+
+def respond(middleware, spider, request, status=200, latency=1.0):
+    if status is None:
+        middleware.process_exception(request, TimeoutError(), spider)
+    else:
+        request.meta["download_latency"] = latency
+        middleware.process_response(
+            request, Response(URL, status=status, request=request), spider
+        )
+
+
+def test_opens_on_failure_rate(tmp_path):
+    middleware, spider, closed = get_middleware(tmp_path)
+    download(middleware, spider)
+    download(middleware, spider, status=503)
+    # Needs the minimum number of requests
+    download(middleware, spider, status=None)
+    assert closed == ["circuit_breaker_open"]
+    with pytest.raises(IgnoreRequest):
+        download(middleware, spider)
+    stats = middleware.stats
+    assert stats.get_value("circuit_breaker/ignored") == 1
+    middleware._spider_closed(spider)
+    assert stats.get_value(f"circuit_breaker/{HOST}/state") == "open"
+    assert stats.get_value(f"circuit_breaker/{HOST}/failure_rate") == 0.667
+    assert stats.get_value(f"circuit_breaker/{HOST}/latency_avg") == 1.0
+
+
+def test_window_and_latency(tmp_path):
+    middleware, spider, closed = get_middleware(tmp_path)
+    for status in [500, 200, 200, 200, 200, 404]:
+        download(middleware, spider, status=status)
+    assert closed == []
+    # Slow responses count as failures
+    download(middleware, spider, latency=12.0)
+    assert closed == []
+    download(middleware, spider, latency=15.0)
+    assert closed == ["circuit_breaker_open"]
+
+
+def test_half_open_next_run(tmp_path):
+    middleware, spider, _ = get_middleware(tmp_path)
+    for _ in range(3):
+        download(middleware, spider, status=500)
+
+    middleware, spider, closed = get_middleware(tmp_path)
+    probe = Request(URL)
+    assert middleware.process_request(probe, spider) is None
+    waiting = [download(middleware, spider) for _ in range(2)]
+    assert all(not dfd.called for dfd in waiting)
+    respond(middleware, spider, probe, status=500)
+    assert closed == ["circuit_breaker_open"]
+    for dfd in waiting:
+        assert dfd.result.check(IgnoreRequest)
+        dfd.addErrback(lambda failure: None)
+
+    middleware, spider, closed = get_middleware(tmp_path)
+    probe = Request(URL)
+    middleware.process_request(probe, spider)
+    waiting = download(middleware, spider)
+    respond(middleware, spider, probe)
+    assert waiting.called and waiting.result is None
+    assert middleware.stats.get_value("circuit_breaker/probes") == 1
+
+    middleware, spider, closed = get_middleware(tmp_path)
+    assert middleware.process_request(Request(URL), spider) is None
+    assert middleware.stats.get_value("circuit_breaker/probes") is None
+
+
+def test_probe_released_if_not_downloaded(tmp_path):
+    middleware, spider, _ = get_middleware(tmp_path)
+    for _ in range(3):
+        download(middleware, spider, status=500)
+
+    middleware, spider, _ = get_middleware(tmp_path)
+    probe = Request(URL)
+    middleware.process_request(probe, spider)
+    waiting = download(middleware, spider)
+    middleware.process_exception(probe, IgnoreRequest(), spider)
+    # The waiting request is sent as the new probe
+    assert waiting.called and waiting.result is None
+
+
+def test_redirected_probe_closes(tmp_path):
+    middleware, spider, _ = get_middleware(tmp_path)
+    for _ in range(3):
+        download(middleware, spider, status=500)
+
+    middleware, spider, closed = get_middleware(tmp_path)
+    probe = Request(URL)
+    middleware.process_request(probe, spider)
+    waiting = download(middleware, spider)
+    respond(middleware, spider, probe, status=301)
+    assert closed == []
+    assert waiting.called and waiting.result is None
+    # The redirected request isn't held back
+    assert middleware.process_request(probe.replace(url=URL + "/"), spider) is None
+
+
+def crawl_stub_server(db, *args):
+    """Crawl a stub server in a new process, returning its stats and request count"""
+    output = subprocess.run(
+        [sys.executable, "-m", "tests.stub_server", "--db", str(db), *args],
+        cwd=dirname(dirname(__file__)),
+        capture_output=True,
+        check=True,
+        text=True,
+        timeout=60,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    return result["stats"], result["server_requests"]
+
+
+def test_stub_server_crawls(tmp_path):
+    db = tmp_path / "circuit.db"
+    stats, _ = crawl_stub_server(db, "--delay", "0.2", "--max-latency", "0.1")
+    assert stats["finish_reason"] == "circuit_breaker_open"
+    assert stats["circuit_breaker/127.0.0.1/state"] == "open"
+    assert stats["circuit_breaker/127.0.0.1/latency_avg"] >= 0.2
+
+    stats, server_requests = crawl_stub_server(db, "--status", "500")
+    assert stats["finish_reason"] == "circuit_breaker_open"
+    assert stats["circuit_breaker/probes"] == 1
+    assert server_requests == 1
+
+    stats, server_requests = crawl_stub_server(db)
+    assert stats["finish_reason"] == "finished"
+    assert stats["circuit_breaker/127.0.0.1/state"] == "closed"
+    assert stats["item_scraped_count"] == server_requests == 20
+
+
+def test_stub_server_redirected_probe(tmp_path):
+    db = tmp_path / "circuit.db"
+    stats, _ = crawl_stub_server(db, "--status", "500")
+    assert stats["finish_reason"] == "circuit_breaker_open"
+
+    stats, server_requests = crawl_stub_server(db, "--redirect")
+    assert stats["finish_reason"] == "finished"
+    assert stats["circuit_breaker/probes"] == 1
+    assert stats["circuit_breaker/127.0.0.1/state"] == "closed"
+    assert stats["item_scraped_count"] == 20
+    assert server_requests == 40
@@ -0,0 +1,101 @@
+import json
+import pickle
+from io import BytesIO
+
+import pytest
+from itemadapter import ItemAdapter
+from scrapy.exporters import JsonLinesItemExporter
+
+from city_scrapers.items import Link, Location, get_location
+from city_scrapers.spiders.losca_Board_of_ed import LoscaBoardOfEdSpider
+from city_scrapers.spiders.losca_Board_of_Supervisors import (
+    LoscaBoardOfSupervisorsSpider,
+)
+from city_scrapers.spiders.losca_City_Council import LoscaCityCouncilSpider
+from city_scrapers.spiders.losca_Health_Commission import LoscaHealthCommissionSpider
+from city_scrapers.spiders.losca_Housing_Authority import LoscaHousingAuthoritySpider
+
+CASES = [
+    (
+        LoscaBoardOfSupervisorsSpider,
+        "losca_Board_of_Supervisors.html",
+        "https://bos.lacounty.gov/board-meeting-agendas/",
+        "2024-09-17",
+    ),
+    (
+        LoscaBoardOfEdSpider,
+        "losca_Board_of_ed.html",
+        "https://www.lausd.org/site/RSS.aspx?DomainID=1057&ModuleInstanceID=73805&PageID=18628&PMIID=0",  # noqa
+        "2024-09-19",
+    ),
+    (
+        LoscaCityCouncilSpider,
+        "losca_City_Council.json",
+        "https://lacity.primegov.com/api/v2/PublicPortal/ListUpcomingMeetings",
+        "2024-09-30",
+    ),
+    (
+        LoscaHealthCommissionSpider,
+        "losca_Health_Commission.json",
+        "https://lacity.primegov.com/api/v2/PublicPortal/ListArchivedMeetings?year=2024",  # noqa
+        "2024-10-22",
+    ),
+    (
+        LoscaHousingAuthoritySpider,
+        "losca_Housing_Authority.html",
+        "https://www.hacla.org/en/bocfiles",
+        "2025-01-08",
+    ),
+]
+
+
+@pytest.mark.parametrize("spidercls,file_name,url,frozen_date", CASES)
+def test_compact_matches_dicts(parse_fixture, spidercls, file_name, url, frozen_date):
+    items = parse_fixture(spidercls, file_name, url, frozen_date)
+    compact_items = parse_fixture(
+        spidercls,
+        file_name,
+        url,
+        frozen_date,
+        settings={"CITY_SCRAPERS_COMPACT_ITEMS": True},
+    )
+    assert compact_items == items
+    assert [ItemAdapter(item).asdict() for item in compact_items] == [
+        dict(item) for item in items
+    ]
+    assert isinstance(compact_items[0]["location"], Location)
+    assert all(
+        isinstance(link, Link) for item in compact_items for link in item["links"]
+    )
+    # Locations are shared between meetings
+    assert len({id(item["location"]) for item in compact_items}) == 1
+
+
+def test_records():
+    link = Link("https://example.com", title="Agenda")
+    assert link == {"href": "https://example.com", "title": "Agenda"}
+    assert link.get("title") == "Agenda"
+    with pytest.raises(KeyError):
+        link["name"]
+    with pytest.raises(AttributeError):
+        link.title = "Minutes"
+    assert pickle.loads(pickle.dumps(link)) == link
+
+    location = get_location("City Hall", "200 N Spring St")
+    assert location is get_location("City Hall", "200 N Spring St")
+    assert pickle.loads(pickle.dumps(location)) is location
+
+
+def test_export(parse_fixture):
+    items = parse_fixture(*CASES[2])
+    compact_items = parse_fixture(
+        *CASES[2], settings={"CITY_SCRAPERS_COMPACT_ITEMS": True}
+    )
+    outputs = []
+    for exported_items in [items, compact_items]:
+        output = BytesIO()
+        exporter = JsonLinesItemExporter(output)
+        for item in exported_items:
+            exporter.export_item(item)
+        outputs.append([json.loads(line) for line in output.getvalue().splitlines()])
+    assert outputs[0] == outputs[1]
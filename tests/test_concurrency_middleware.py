@@ -0,0 +1,59 @@
+import pytest
+from scrapy import Request, Spider
+from scrapy.http import Response
+from twisted.internet.defer import ensureDeferred
+
+from city_scrapers.middleware import ProcessConcurrencyMiddleware
+
+spider = Spider(name="test")
+
+
+@pytest.fixture(autouse=True)
+def reset_semaphores():
+    yield
+    ProcessConcurrencyMiddleware._semaphores.clear()
+
+
+def start(middleware, url):
+    request = Request(url)
+    return request, ensureDeferred(middleware.process_request(request, spider))
+
+
+def test_global_cap_shared_between_crawlers():
+    first = ProcessConcurrencyMiddleware(max_requests=2)
+    second = ProcessConcurrencyMiddleware(max_requests=2)
+    req_1, d_1 = start(first, "https://example.com/1")
+    req_2, d_2 = start(second, "https://example.org/2")
+    req_3, d_3 = start(second, "https://example.net/3")
+    assert d_1.called and d_2.called
+    assert not d_3.called
+
+    first.process_response(req_1, Response(req_1.url), spider)
+    assert d_3.called
+    second.process_exception(req_2, Exception(), spider)
+    second.process_response(req_3, Response(req_3.url), spider)
+
+
+def test_domain_cap():
+    middleware = ProcessConcurrencyMiddleware(max_requests_per_domain=1)
+    req_1, d_1 = start(middleware, "https://lacity.primegov.com/1")
+    req_2, d_2 = start(middleware, "https://lacity.primegov.com/2")
+    req_3, d_3 = start(middleware, "https://www.hacla.org/en/bocfiles")
+    assert d_1.called and d_3.called
+    assert not d_2.called
+
+    middleware.process_response(req_1, Response(req_1.url), spider)
+    assert d_2.called
+    for request in [req_2, req_3]:
+        middleware.process_response(request, Response(request.url), spider)
+
+
+def test_release_once():
+    middleware = ProcessConcurrencyMiddleware(max_requests=1)
+    request, _ = start(middleware, "https://example.com/once")
+    middleware.process_response(request, Response(request.url), spider)
+    middleware.process_response(request, Response(request.url), spider)
+    _, d_1 = start(middleware, "https://example.com/1")
+    _, d_2 = start(middleware, "https://example.com/2")
+    assert d_1.called
+    assert not d_2.called
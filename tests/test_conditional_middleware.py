@@ -0,0 +1,94 @@
+from datetime import datetime
+from os.path import dirname, join
+
+import pytest
+from city_scrapers_core.utils import file_response
+from freezegun import freeze_time
+from scrapy.http import Request, TextResponse
+from scrapy.utils.test import get_crawler
+
+from city_scrapers.middleware import CachedItemsMiddleware, ConditionalRequestMiddleware
+from city_scrapers.middleware.conditional import ValidatorStore
+from city_scrapers.spiders.losca_City_Council import LoscaCityCouncilSpider
+
+URL = "https://lacity.primegov.com/api/v2/PublicPortal/ListUpcomingMeetings"
+
+fixture_response = file_response(
+    join(dirname(__file__), "files", "losca_City_Council.json"), url=URL
+)
+
+
+@pytest.fixture
+def crawler(tmp_path):
+    crawler = get_crawler(
+        LoscaCityCouncilSpider,
+        settings_dict={
+            "CITY_SCRAPERS_CONDITIONAL_ENABLED": True,
+            "CITY_SCRAPERS_CONDITIONAL_DB": str(tmp_path / "conditional.db"),
+        },
+    )
+    crawler.spider = crawler._create_spider()
+    crawler.stats.open_spider(crawler.spider)
+    yield crawler
+    ValidatorStore._stores.clear()
+
+
+def crawl(crawler, status=200, body=fixture_response.body, headers=None):
+    """Pass a request through both middlewares, returning the request and items"""
+    spider = crawler.spider
+    downloader_mw = ConditionalRequestMiddleware.from_crawler(crawler)
+    spider_mw = CachedItemsMiddleware.from_crawler(crawler)
+    request = Request(URL)
+    downloader_mw.process_request(request, spider)
+    response = TextResponse(
+        URL, status=status, body=body, headers=headers, request=request
+    )
+    response = downloader_mw.process_response(request, response, spider)
+    parsed = []
+
+    def result():
+        for item in spider.parse(response):
+            parsed.append(item)
+            yield item
+
+    items = list(spider_mw.process_spider_output(response, result(), spider))
+    return request, items, parsed
+
+
+@freeze_time("2024-09-30")
+def test_not_modified(crawler):
+    request, items, parsed = crawl(crawler, headers={"ETag": '"abc"'})
+    assert "If-None-Match" not in request.headers
+    assert len(items) == len(parsed) == 13
+
+    request, replayed, parsed = crawl(crawler, status=304, body=b"")
+    assert request.headers["If-None-Match"] == b'"abc"'
+    assert 304 in request.meta["handle_httpstatus_list"]
+    assert parsed == []
+    assert [dict(item) for item in replayed] == [dict(item) for item in items]
+    assert crawler.stats.get_value("conditional/miss") == 1
+    assert crawler.stats.get_value("conditional/hit") == 1
+    assert crawler.stats.get_value("conditional/items_replayed") == 13
+
+
+def test_identical_body_refreshes_status(crawler):
+    with freeze_time("2024-09-30"):
+        _, items, _ = crawl(crawler)
+    assert items[0]["status"] == "tentative"
+    with freeze_time("2024-10-30"):
+        _, replayed, parsed = crawl(crawler)
+    assert parsed == []
+    assert replayed[0]["start"] == datetime(2024, 10, 1, 8, 30)
+    assert replayed[0]["status"] == "passed"
+    assert crawler.stats.get_value("conditional/identical") == 1
+
+
+@freeze_time("2024-09-30")
+def test_changed_body(crawler):
+    crawl(crawler)
+    _, items, parsed = crawl(crawler, body=b"[]")
+    assert items == parsed == []
+    _, items, parsed = crawl(crawler, body=b"[]")
+    assert parsed == []
+    assert crawler.stats.get_value("conditional/miss") == 2
+    assert crawler.stats.get_value("conditional/hit") == 1
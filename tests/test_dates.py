@@ -0,0 +1,35 @@
+from datetime import datetime
+
+import pytest
+
+from city_scrapers.dates import DateParser
+
+
+def test_formats():
+    parser = DateParser("%m/%d/%Y %I:%M %p", "%A, %B %d, %Y %I:%M %p")
+    assert parser("9/24/2024 1:00 PM") == datetime(2024, 9, 24, 13, 0)
+    assert parser("Tuesday, September 17, 2024 09:30 AM") == datetime(
+        2024, 9, 17, 9, 30
+    )
+    assert parser.stats == {"fast": 2}
+
+
+def test_iso():
+    parser = DateParser(iso=True)
+    assert parser("2024-10-01T08:30:00") == datetime(2024, 10, 1, 8, 30)
+    assert parser.stats == {"fast": 1}
+
+
+def test_cached():
+    parser = DateParser(iso=True)
+    for _ in range(3):
+        parser("2024-10-01T08:30:00")
+    assert parser.stats == {"fast": 1, "cached": 2}
+
+
+def test_fallback():
+    parser = DateParser("%m/%d/%Y %I:%M %p")
+    assert parser("Sept 24 2024 1pm") == datetime(2024, 9, 24, 13, 0)
+    assert parser.stats == {"fallback": 1}
+    with pytest.raises(ValueError):
+        parser("not a date")
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+
+import pytest
+from city_scrapers_core.constants import CANCELLED, PASSED
+from city_scrapers_core.pipelines import MeetingPipeline
+from city_scrapers_core.pipelines import OpenCivicDataPipeline as BaseOCDPipeline
+from city_scrapers_core.spiders import CityScrapersSpider
+from freezegun import freeze_time
+from pytz import timezone
+
+from city_scrapers.derived import get_derived, local_isoformat
+from city_scrapers.pipelines import OpenCivicDataPipeline
+from city_scrapers.spiders.losca_City_Council import LoscaCityCouncilSpider
+
+URL = "https://lacity.primegov.com/api/v2/PublicPortal/ListUpcomingMeetings"
+spider = LoscaCityCouncilSpider()
+
+
+@pytest.fixture(scope="module")
+def parsed_items(parse_fixture):
+    return parse_fixture(
+        LoscaCityCouncilSpider, "losca_City_Council.json", URL, "2024-09-30"
+    )
+
+
+def test_get_derived_cached(parsed_items):
+    item = parsed_items[0].copy()
+    expected = item["title"].upper()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return item["title"].upper()
+
+    assert get_derived(item, "upper", compute, item["title"]) == expected
+    assert get_derived(item, "upper", compute, item["title"]) == expected
+    assert len(calls) == 1
+    item["title"] = "Special Meeting"
+    assert get_derived(item, "upper", compute, item["title"]) == "SPECIAL MEETING"
+    assert len(calls) == 2
+    # Dicts don't cache values
+    assert get_derived(dict(item), "upper", compute) == "SPECIAL MEETING"
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize(
+    "tz_name", ["America/Los_Angeles", "America/Havana", "Australia/Lord_Howe"]
+)
+def test_local_isoformat(tz_name):
+    # Noon every day over a year, and every half hour on days around DST transitions
+    tz = timezone(tz_name)
+    for day in range(365):
+        noon = datetime(2023, 1, 1, 12) + timedelta(days=day)
+        if tz.utcoffset(noon) == tz.utcoffset(noon + timedelta(days=1)):
+            times = [timedelta(0)]
+        else:
+            times = [timedelta(minutes=30 * idx) for idx in range(-48, 96)]
+        for time in times:
+            value = noon + time
+            assert local_isoformat(tz_name, value) == tz.localize(value).isoformat(
+                timespec="seconds"
+            )
+
+
+def test_id_and_status_match_base(parsed_items):
+    for item in parsed_items:
+        item = item.copy()
+        with freeze_time("2024-09-30"):
+            assert spider._get_status(item) == CityScrapersSpider._get_status(
+                spider, item
+            )
+        assert spider._get_id(item) == CityScrapersSpider._get_id(spider, item)
+        assert spider._get_id(item, "1") == CityScrapersSpider._get_id(
+            spider, item, "1"
+        )
+
+
+def test_status_cache(parsed_items):
+    item = parsed_items[0].copy()
+    with freeze_time("2024-09-30"):
+        assert spider._get_status(item, text="") != CANCELLED
+    # Whether a meeting has passed isn't cached
+    with freeze_time("2030-01-01"):
+        assert spider._get_status(item) == PASSED
+    assert spider._get_status(item, text="Cancelled") == CANCELLED
+    item["title"] = "Cancelled: " + item["title"]
+    assert spider._get_status(item) == CANCELLED
+
+
+def test_ocd_pipeline_matches_base(parsed_items):
+    meeting_pipeline = MeetingPipeline()
+    pipeline = OpenCivicDataPipeline()
+    base_pipeline = BaseOCDPipeline()
+    with freeze_time("2024-09-30"):
+        for item in parsed_items:
+            item = meeting_pipeline.process_item(item.copy(), spider)
+            event = pipeline.process_item(item, spider)
+            base_event = base_pipeline.process_item(item, spider)
+            assert event.pop("_id") != base_event.pop("_id")
+            assert event == base_event
+            event["location"]["name"] = ""
+            assert pipeline.process_item(item, spider)[
+                "location"
+            ] == base_pipeline.create_location(item)
@@ -0,0 +1,184 @@
+import sqlite3
+from os.path import dirname, join
+from types import SimpleNamespace
+
+import pytest
+from city_scrapers_core.constants import CANCELLED, PASSED
+from city_scrapers_core.utils import file_response
+from freezegun import freeze_time
+from scrapy.exceptions import DontCloseSpider, DropItem
+from scrapy.http import Response
+from scrapy.utils.test import get_crawler
+
+from city_scrapers.pipelines import LocalDiffPipeline
+from city_scrapers.spiders.losca_City_Council import LoscaCityCouncilSpider
+
+test_response = file_response(
+    join(dirname(__file__), "files", "losca_City_Council.json"),
+    url="https://lacity.primegov.com/api/v2/PublicPortal/ListUpcomingMeetings",
+)
+
+
+@pytest.fixture
+def spider():
+    with freeze_time("2024-09-30"):
+        return get_crawler(LoscaCityCouncilSpider)._create_spider()
+
+
+@pytest.fixture
+def items(spider):
+    with freeze_time("2024-09-30"):
+        return list(spider.parse(test_response))
+
+
+def run(tmp_path, spider, items, time, stats=None):
+    """Pass items through a new pipeline, returning the pipeline, emitted items and
+    any meetings emitted as cancelled once idle
+    """
+    crawler = get_crawler(
+        LoscaCityCouncilSpider,
+        settings_dict={"CITY_SCRAPERS_DIFF_DB": str(tmp_path / "diff.db")},
+    )
+    crawler.stats.open_spider(spider)
+    for key, value in (stats or {}).items():
+        crawler.stats.set_value(key, value)
+    requests = []
+    crawler.engine = SimpleNamespace(crawl=requests.append)
+    pipeline = LocalDiffPipeline.from_crawler(crawler)
+    with freeze_time(time):
+        pipeline.open_spider(spider)
+        emitted = []
+        for item in items:
+            try:
+                emitted.append(pipeline.process_item(item.copy(), spider))
+            except DropItem:
+                pass
+        try:
+            pipeline.spider_idle(spider)
+        except DontCloseSpider:
+            pass
+        cancelled = []
+        for request in requests:
+            cancelled.extend(
+                request.callback(Response(request.url), **request.cb_kwargs)
+            )
+        # Meetings emitted as cancelled go through the pipeline like other items
+        for meeting in cancelled:
+            pipeline.process_item(meeting.copy(), spider)
+    pipeline.close_spider(spider)
+    return pipeline, emitted, cancelled
+
+
+def query(tmp_path, sql, *args):
+    conn = sqlite3.connect(tmp_path / "diff.db")
+    try:
+        return conn.execute(sql, args).fetchall()
+    finally:
+        conn.close()
+
+
+def test_first_run(tmp_path, spider, items):
+    pipeline, emitted, cancelled = run(tmp_path, spider, items, "2024-09-30 01:00")
+    assert len(emitted) == 13
+    assert cancelled == []
+    assert pipeline.crawler.stats.get_value("diff/new") == 13
+
+
+def test_unchanged_and_duplicates(tmp_path, spider, items):
+    run(tmp_path, spider, items, "2024-09-30 01:00")
+    pipeline, emitted, cancelled = run(
+        tmp_path, spider, items + items[:1], "2024-09-30 02:00"
+    )
+    assert emitted == []
+    assert cancelled == []
+    assert pipeline.crawler.stats.get_value("diff/unchanged") == 13
+
+
+def test_changed(tmp_path, spider, items):
+    run(tmp_path, spider, items, "2024-09-30 01:00")
+    changed = items[0].copy()
+    changed["title"] = "New title"
+    pipeline, emitted, _ = run(
+        tmp_path, spider, [changed] + items[1:], "2024-09-30 02:00"
+    )
+    assert emitted == [changed]
+    assert query(
+        tmp_path, "SELECT id, change, fields FROM changelog WHERE run = ?", pipeline.run
+    ) == [(changed["id"], "changed", "title")]
+
+
+def test_passed_unchanged(tmp_path, spider, items):
+    run(tmp_path, spider, items, "2024-09-30 01:00")
+    passed = [item.copy() for item in items]
+    for item in passed:
+        item["status"] = PASSED
+    pipeline, emitted, _ = run(tmp_path, spider, passed, "2024-12-01")
+    assert emitted == []
+    assert pipeline.crawler.stats.get_value("diff/unchanged") == 13
+    assert query(tmp_path, "SELECT DISTINCT status FROM meetings") == [(PASSED,)]
+
+    # Cancellations are still emitted, and so are meetings no longer cancelled
+    cancelled = passed[0].copy()
+    cancelled["status"] = CANCELLED
+    _, emitted, _ = run(tmp_path, spider, [cancelled], "2024-12-02")
+    assert emitted == [cancelled]
+    pipeline, emitted, _ = run(tmp_path, spider, passed[:1], "2024-12-03")
+    assert emitted == passed[:1]
+    assert query(tmp_path, "SELECT change, fields FROM changelog WHERE run > 1") == [
+        ("cancelled", "status"),
+        ("changed", "status"),
+    ]
+
+
+def test_old_hashes_updated(tmp_path, spider, items):
+    run(tmp_path, spider, items, "2024-09-30 01:00")
+    # Stores from before statuses were left out of the hash
+    conn = sqlite3.connect(tmp_path / "diff.db")
+    with conn:
+        conn.execute("UPDATE meetings SET hash = 'old'")
+        conn.execute("PRAGMA user_version = 0")
+    conn.close()
+    _, emitted, _ = run(tmp_path, spider, items, "2024-09-30 02:00")
+    assert emitted == []
+
+
+def test_missing_cancelled(tmp_path, spider, items):
+    run(tmp_path, spider, items, "2024-09-30 01:00")
+    pipeline, emitted, cancelled = run(tmp_path, spider, items[1:], "2024-09-30 02:00")
+    assert emitted == []
+    assert [meeting["id"] for meeting in cancelled] == [items[0]["id"]]
+    assert cancelled[0]["status"] == CANCELLED
+    assert cancelled[0]["start"] == items[0]["start"]
+    # Emitted cancelled meetings are recorded as cancellations
+    assert pipeline.crawler.stats.get_value("diff/cancelled") == 1
+    # And aren't cancelled again
+    _, _, cancelled = run(tmp_path, spider, items[1:], "2024-09-30 03:00")
+    assert cancelled == []
+
+
+def test_missing_not_cancelled_without_items(tmp_path, spider, items):
+    run(tmp_path, spider, items, "2024-09-30 01:00")
+    _, _, cancelled = run(tmp_path, spider, [], "2024-09-30 02:00")
+    assert cancelled == []
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        "downloader/exception_count",
+        "httperror/response_ignored_count",
+        "spider_exceptions/KeyError",
+    ],
+)
+def test_missing_not_cancelled_after_errors(tmp_path, spider, items, key):
+    run(tmp_path, spider, items, "2024-09-30 01:00")
+    _, _, cancelled = run(tmp_path, spider, items[1:], "2024-09-30 02:00", {key: 1})
+    assert cancelled == []
+
+
+def test_runs_numbered(tmp_path, spider, items):
+    first, _, _ = run(tmp_path, spider, items, "2024-09-30 01:00")
+    # Runs started in the same second are still separate
+    second, emitted, _ = run(tmp_path, spider, items, "2024-09-30 01:00")
+    assert second.run == first.run + 1
+    assert emitted == []
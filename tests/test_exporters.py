@@ -0,0 +1,127 @@
+from argparse import Namespace
+from datetime import datetime
+
+import pytest
+from city_scrapers_core.pipelines import MeetingPipeline, OpenCivicDataPipeline
+from scrapy.utils.test import get_crawler
+
+from city_scrapers.commands.compactfeeds import Command
+from city_scrapers.exporters import ArrowItemExporter, ParquetItemExporter
+from city_scrapers.spiders.losca_City_Council import LoscaCityCouncilSpider
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+URL = "https://lacity.primegov.com/api/v2/PublicPortal/ListUpcomingMeetings"
+spider = LoscaCityCouncilSpider()
+
+
+@pytest.fixture(scope="module")
+def parsed_items(parse_fixture):
+    return parse_fixture(
+        LoscaCityCouncilSpider, "losca_City_Council.json", URL, "2024-09-30"
+    )
+
+
+def export(exporter_cls, path, items, **kwargs):
+    with open(path, "wb") as f:
+        exporter = exporter_cls(f, **kwargs)
+        exporter.start_exporting()
+        for item in items:
+            exporter.export_item(item)
+        exporter.finish_exporting()
+
+
+def test_parquet_row_groups(tmp_path, parsed_items):
+    path = tmp_path / "meetings.parquet"
+    export(ParquetItemExporter, path, parsed_items, batch_size=5)
+    parquet_file = pq.ParquetFile(path)
+    assert parquet_file.metadata.num_rows == 13
+    assert parquet_file.metadata.num_row_groups == 3
+    row = parquet_file.read().to_pylist()[0]
+    item = parsed_items[0]
+    assert row["id"] == item["id"]
+    assert row["spider"] == "losca_City_Council"
+    assert row["start"] == item["start"]
+    assert row["location_address"] == item["location"]["address"]
+    assert row["links"] == item["links"]
+
+
+def test_agency_from_spider(tmp_path, parsed_items):
+    crawler = get_crawler(LoscaCityCouncilSpider)
+    crawler.spider = spider
+    path = tmp_path / "meetings.parquet"
+    with open(path, "wb") as f:
+        exporter = ParquetItemExporter.from_crawler(crawler, f)
+        exporter.start_exporting()
+        exporter.export_item(parsed_items[0])
+        exporter.finish_exporting()
+    assert pq.read_table(path).to_pylist()[0]["agency"] == spider.agency
+
+
+def test_append_rejected(tmp_path, parsed_items):
+    path = tmp_path / "meetings.parquet"
+    export(ParquetItemExporter, path, parsed_items)
+    size = path.stat().st_size
+    with open(path, "ab") as f:
+        with pytest.raises(ValueError):
+            ParquetItemExporter(f).start_exporting()
+    assert path.stat().st_size == size
+    assert pq.read_table(path).num_rows == 13
+
+
+def test_arrow_ocd_items(tmp_path, parsed_items):
+    meeting_pipeline = MeetingPipeline()
+    ocd_pipeline = OpenCivicDataPipeline()
+    items = [
+        ocd_pipeline.process_item(
+            meeting_pipeline.process_item(item.copy(), spider), spider
+        )
+        for item in parsed_items
+    ]
+    path = tmp_path / "meetings.arrow"
+    export(ArrowItemExporter, path, items)
+    with pa.ipc.open_file(path) as reader:
+        table = reader.read_all()
+    row = table.to_pylist()[0]
+    item = parsed_items[0]
+    assert table.schema == ParquetItemExporter(None).schema
+    assert row["id"] == item["id"]
+    assert row["agency"] == spider.agency
+    assert row["start"] == item["start"]
+    assert row["title"] == item["title"]
+    assert row["links"] == item["links"]
+    assert row["source"] == item["source"]
+
+
+def test_compactfeeds(tmp_path, parsed_items):
+    feeds = tmp_path / "feeds"
+    feeds.mkdir()
+    export(ParquetItemExporter, feeds / "2024-09-29.parquet", parsed_items[:10])
+    changed = parsed_items[0].copy()
+    changed["title"] = "New title"
+    older = parsed_items[0].copy()
+    older["id"] = older["id"].replace("2024", "2023")
+    older["start"] = datetime(2023, 1, 1)
+    export(ArrowItemExporter, feeds / "2024-09-30.arrow", [changed, older])
+
+    output = tmp_path / "dataset"
+    opts = Namespace(output=str(output))
+    Command().run([str(feeds)], opts)
+    Command().run([str(feeds / "2024-09-30.arrow")], opts)
+
+    dataset_path = output / "spider=losca_City_Council"
+    assert sorted(path.name for path in dataset_path.iterdir()) == [
+        "year=2023",
+        "year=2024",
+    ]
+    table = pq.read_table(dataset_path / "year=2024")
+    assert table.num_rows == 10
+    rows = {row["id"]: row for row in table.to_pylist()}
+    assert rows[changed["id"]]["title"] == "New title"
+
+
+def test_compactfeeds_dedupe():
+    table = pa.table({"id": ["a", None, "a", None], "title": ["1", "2", "3", "4"]})
+    deduped = Command().dedupe(table)
+    assert deduped["title"].to_pylist() == ["2", "3", "4"]
@@ -0,0 +1,62 @@
+from scrapy.http import HtmlResponse
+
+from city_scrapers.extract import RowExtractor, compile_css
+
+response = HtmlResponse(
+    url="https://example.com",
+    body=b"""
+    <div class="row">
+      <h2 class="title">First <b>meeting</b></h2>
+      <a href="/a"><span>Agenda</span></a>
+      <a href="/b">Minutes</a>
+    </div>
+    <div class="row"><a href="/c"></a></div>
+    """,
+)
+
+extractor = RowExtractor(
+    {
+        "title": ".title::text",
+        "title_parts": [".title ::text"],
+        "links": ("a", RowExtractor({"title": "::text", "href": "::attr(href)"})),
+        "missing": ".missing::text",
+    },
+    row=".row",
+)
+
+
+def test_matches_css():
+    for row, data in zip(response.css(".row"), extractor.extract_rows(response)):
+        assert data["title"] == row.css(".title::text").get()
+        assert data["title_parts"] == row.css(".title ::text").getall()
+        assert data["missing"] is None
+        assert data["links"] == [
+            {
+                "title": link.css("::text").get(),
+                "href": link.css("::attr(href)").get(),
+            }
+            for link in row.css("a")
+        ]
+
+
+def test_extract_selector_or_element():
+    row = response.css(".row")[0]
+    assert extractor.extract(row) == extractor.extract(row.root)
+    assert extractor.extract(row)["links"][0] == {"title": "Agenda", "href": "/a"}
+
+
+def test_compiled_once():
+    assert compile_css(".title::text") is compile_css(".title::text")
+
+
+def test_element_serialized_as_html():
+    element_response = HtmlResponse(
+        url="https://example.com",
+        body=b'<div class="row"><p>Room 1<br>City Hall</p><a href="/c"></a></div>',
+    )
+    element_extractor = RowExtractor({"html": "p", "links": ["a"]}, row=".row")
+    row = element_response.css(".row")[0]
+    assert element_extractor.extract(row) == {
+        "html": row.css("p").get(),
+        "links": row.css("a").getall(),
+    }
@@ -0,0 +1,113 @@
+from datetime import datetime
+
+from city_scrapers_core.constants import NOT_CLASSIFIED
+from city_scrapers_core.items import Meeting
+from city_scrapers_core.spiders import CityScrapersSpider
+from freezegun import freeze_time
+from scrapy.http import XmlResponse
+
+from city_scrapers.mixins import DerivedFieldsMixin, FeedMixin
+
+ATOM_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Calendar</title>
+  <entry>
+    <title>Regular Meeting</title>
+    <link rel="self" href="https://example.com/feed/1"/>
+    <link href="https://example.com/events/1"/>
+    <id>urn:event:1</id>
+    <published>2024-10-01T18:00:00-07:00</published>
+    <summary>Council Chambers</summary>
+  </entry>
+  <!-- Comments are skipped -->
+  <entry>
+    <title>Special Meeting</title>
+    <updated>2024-10-08T18:00:00-07:00</updated>
+  </entry>
+</feed>
+"""
+
+
+def rss_feed(items):
+    item = (
+        "<item><title>Meeting {idx}</title><link>https://example.com/{idx}?a=1&amp;b=2"
+        "</link><pubDate>2024-10-01T18:00:00</pubDate><guid>{idx}</guid></item>"
+    )
+    return XmlResponse(
+        "https://example.com/rss",
+        body=(
+            '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+            "<title>Calendar</title>"
+            + "".join(item.format(idx=idx) for idx in range(items))
+            + "</channel></rss>"
+        ).encode(),
+    )
+
+
+class FeedSpider(FeedMixin, DerivedFieldsMixin, CityScrapersSpider):
+    name = "feed"
+    agency = "Test Agency"
+    timezone = "America/Los_Angeles"
+    chunk_size = 256
+
+    def parse_entry(self, entry, response):
+        if entry["title"] == "Special Meeting":
+            return None
+        return Meeting(
+            title=entry["title"],
+            description=entry["description"],
+            classification=NOT_CLASSIFIED,
+            start=datetime.fromisoformat(entry["pubDate"][:19]),
+            end=None,
+            all_day=False,
+            time_notes="",
+            location=self._location(name="", address=""),
+            links=[self._link(href=entry["link"], title="Details")],
+            source=response.url,
+        )
+
+
+def test_rss_entries():
+    spider = FeedSpider()
+    entries = list(spider.iter_entries(rss_feed(3)))
+    assert entries[0] == {
+        "title": "Meeting 0",
+        "link": "https://example.com/0?a=1&b=2",
+        "pubDate": "2024-10-01T18:00:00",
+        "guid": "0",
+        "description": "",
+    }
+    assert [entry["guid"] for entry in entries] == ["0", "1", "2"]
+
+
+def test_atom_entries():
+    spider = FeedSpider()
+    response = XmlResponse("https://example.com/atom", body=ATOM_FEED)
+    entries = list(spider.iter_entries(response))
+    assert len(entries) == 2
+    assert entries[0]["link"] == "https://example.com/events/1"
+    assert entries[0]["description"] == "Council Chambers"
+    assert entries[0]["pubDate"] == "2024-10-01T18:00:00-07:00"
+    assert entries[0]["guid"] == "urn:event:1"
+    assert entries[1]["pubDate"] == "2024-10-08T18:00:00-07:00"
+    assert entries[1]["link"] == ""
+
+    with freeze_time("2024-09-30"):
+        meetings = list(spider.parse(response))
+    assert len(meetings) == 1
+    assert meetings[0]["status"] == "tentative"
+    assert meetings[0]["id"] == "feed/202410011800/x/regular_meeting"
+
+
+def test_entries_removed_from_tree():
+    sizes = []
+
+    class SizeFeedSpider(FeedSpider):
+        def _get_entry(self, element):
+            sizes.append(len(element.getparent()))
+            return super()._get_entry(element)
+
+    spider = SizeFeedSpider()
+    assert len(list(spider.iter_entries(rss_feed(1000)))) == 1000
+    # Only entries parsed from the same chunk are kept, rather than the whole feed
+    assert max(sizes) < 10
@@ -0,0 +1,132 @@
+from types import SimpleNamespace
+
+import pytest
+from scrapy import Request
+from scrapy.core.downloader import Slot
+from scrapy.http import Response
+from scrapy.utils.test import get_crawler
+
+from city_scrapers.extensions import HostThrottle
+from city_scrapers.spiders.losca_City_Council import LoscaCityCouncilSpider
+
+HOST = "lacity.primegov.com"
+URL = f"https://{HOST}/api/v2/PublicPortal/ListUpcomingMeetings"
+
+
+@pytest.fixture(autouse=True)
+def clear_connections():
+    yield
+    HostThrottle._connections.clear()
+
+
+def get_throttle(tmp_path, slot, settings=None):
+    crawler = get_crawler(
+        LoscaCityCouncilSpider,
+        settings_dict={
+            "CITY_SCRAPERS_HOST_THROTTLE_DB": str(tmp_path / "throttle.db"),
+            "CITY_SCRAPERS_HOST_THROTTLE_TTL": 60 * 60,
+            "CITY_SCRAPERS_HOST_THROTTLE": {
+                "*": {"target_latency": 2.0, "min_concurrency": 1, "max_concurrency": 4}
+            },
+            "AUTOTHROTTLE_ENABLED": True,
+            "AUTOTHROTTLE_START_DELAY": 1.0,
+            "AUTOTHROTTLE_MAX_DELAY": 30.0,
+            **(settings or {}),
+        },
+    )
+    spider = crawler._create_spider()
+    crawler.stats.open_spider(spider)
+    crawler.engine = SimpleNamespace(
+        downloader=SimpleNamespace(slots={HOST: slot, "backfill": slot})
+    )
+    throttle = HostThrottle.from_crawler(crawler)
+    throttle._spider_opened(spider)
+    return throttle, spider
+
+
+def download(throttle, spider, latency, status=200, headers=None, slot_key=HOST):
+    request = Request(URL, meta={"download_slot": slot_key})
+    throttle._request_reached_downloader(request, spider)
+    request.meta["download_latency"] = latency
+    response = Response(URL, status=status, headers=headers, request=request)
+    throttle._response_downloaded(response, request, spider)
+
+
+def test_ramps_up_fast_host(tmp_path):
+    slot = Slot(8, 1.0, False)
+    throttle, spider = get_throttle(tmp_path, slot)
+    download(throttle, spider, 0.1)
+    # Starts at the minimum concurrency
+    assert (slot.concurrency, slot.delay) == (2, 0.5)
+    for _ in range(40):
+        download(throttle, spider, 0.1)
+    assert slot.concurrency == 4
+    assert slot.delay < 0.01
+
+
+def test_slows_down(tmp_path):
+    slot = Slot(8, 1.0, False)
+    throttle, spider = get_throttle(tmp_path, slot)
+    for _ in range(3):
+        download(throttle, spider, 0.1)
+    assert slot.concurrency == 3
+    download(throttle, spider, 4.0)
+    assert slot.concurrency == 2
+    assert slot.delay == 2.0
+    download(throttle, spider, 0.1, status=429, headers={"Retry-After": "10"})
+    assert slot.concurrency == 1
+    assert slot.delay == 10.0
+    assert throttle.crawler.stats.get_value("throttle/throttled") == 1
+
+
+def test_host_settings(tmp_path):
+    slot = Slot(8, 1.0, False)
+    throttle, spider = get_throttle(
+        tmp_path,
+        slot,
+        settings={
+            "CITY_SCRAPERS_HOST_THROTTLE": {
+                "*": {"target_latency": 2.0},
+                HOST: {"target_latency": 0.5, "min_concurrency": 2},
+            }
+        },
+    )
+    download(throttle, spider, 1.0)
+    assert slot.concurrency == 2
+    assert slot.delay == 0.75
+
+
+def test_persisted(tmp_path):
+    slot = Slot(8, 1.0, False)
+    throttle, spider = get_throttle(tmp_path, slot)
+    for _ in range(10):
+        download(throttle, spider, 0.1)
+    limits = (slot.concurrency, slot.delay)
+    throttle._spider_closed(spider)
+    assert throttle.crawler.stats.get_value(f"throttle/{HOST}/concurrency") == 4
+
+    # The next run starts from the saved limits
+    slot = Slot(8, 1.0, False)
+    throttle, spider = get_throttle(tmp_path, slot)
+    throttle._request_reached_downloader(
+        Request(URL, meta={"download_slot": HOST}), spider
+    )
+    assert (slot.concurrency, slot.delay) == limits
+
+    # Unless they've expired
+    slot = Slot(8, 1.0, False)
+    throttle, spider = get_throttle(
+        tmp_path, slot, settings={"CITY_SCRAPERS_HOST_THROTTLE_TTL": -1}
+    )
+    throttle._request_reached_downloader(
+        Request(URL, meta={"download_slot": HOST}), spider
+    )
+    assert (slot.concurrency, slot.delay) == (1, 1.0)
+
+
+def test_custom_slot_ignored(tmp_path):
+    slot = Slot(6, 0, False)
+    throttle, spider = get_throttle(tmp_path, slot)
+    download(throttle, spider, 10.0, slot_key="backfill")
+    assert (slot.concurrency, slot.delay) == (6, 0)
+    assert throttle.limits == {}
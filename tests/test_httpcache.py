@@ -0,0 +1,99 @@
+import os
+from argparse import Namespace
+
+import pytest
+from scrapy import Request
+from scrapy.http import HtmlResponse
+from scrapy.settings import Settings
+from scrapy.utils.test import get_crawler
+
+from city_scrapers.commands._httpcache import set_cache_mode
+from city_scrapers.httpcache import CompressedCacheStorage
+from city_scrapers.spiders.losca_Housing_Authority import LoscaHousingAuthoritySpider
+
+
+@pytest.fixture
+def spider():
+    return get_crawler(LoscaHousingAuthoritySpider)._create_spider()
+
+
+def get_storage(spider, tmp_path, **settings):
+    crawler = get_crawler(
+        LoscaHousingAuthoritySpider,
+        settings_dict={"HTTPCACHE_DIR": str(tmp_path), **settings},
+    )
+    storage = CompressedCacheStorage(crawler.settings)
+    storage.open_spider(spider)
+    return storage
+
+
+def store(storage, spider, url, body):
+    request = Request(url)
+    response = HtmlResponse(
+        url=url, body=body, headers={"Content-Type": "text/html; charset=utf-8"}
+    )
+    storage.store_response(spider, request, response)
+    return request
+
+
+def object_files(tmp_path):
+    return [
+        filename
+        for _, _, filenames in os.walk(tmp_path / "objects")
+        for filename in filenames
+    ]
+
+
+def test_store_retrieve(spider, tmp_path):
+    storage = get_storage(spider, tmp_path)
+    request = store(storage, spider, "https://example.com/a", b"<p>a</p>")
+    response = storage.retrieve_response(spider, request)
+    assert isinstance(response, HtmlResponse)
+    assert response.body == b"<p>a</p>"
+    assert response.headers["Content-Type"] == b"text/html; charset=utf-8"
+    assert storage.retrieve_response(spider, Request("https://example.com/b")) is None
+
+
+def test_identical_bodies_stored_once(spider, tmp_path):
+    storage = get_storage(spider, tmp_path)
+    store(storage, spider, "https://example.com/a", b"<p>a</p>")
+    store(storage, spider, "https://example.com/b", b"<p>a</p>")
+    assert len(object_files(tmp_path)) == 1
+
+
+def test_expiration(spider, tmp_path):
+    storage = get_storage(spider, tmp_path, HTTPCACHE_EXPIRATION_SECS=60)
+    request = store(storage, spider, "https://example.com/a", b"<p>a</p>")
+    storage.conn.execute("UPDATE responses SET timestamp = timestamp - 120")
+    assert storage.retrieve_response(spider, request) is None
+    storage.close_spider(spider)
+    assert object_files(tmp_path) == []
+
+
+def test_size_cap(spider, tmp_path):
+    storage = get_storage(spider, tmp_path, CITY_SCRAPERS_HTTPCACHE_MAX_MB=1)
+    # Random bodies since they're compressed
+    old = store(storage, spider, "https://example.com/a", os.urandom(600 * 1024))
+    new = store(storage, spider, "https://example.com/b", os.urandom(600 * 1024))
+    storage.conn.execute("UPDATE responses SET timestamp = 0 WHERE url LIKE '%/a'")
+    storage.evict()
+    assert storage.retrieve_response(spider, old) is None
+    assert storage.retrieve_response(spider, new) is not None
+    assert len(object_files(tmp_path)) == 1
+
+
+@pytest.mark.parametrize("record,replay", [(True, False), (False, True)])
+def test_cache_modes(record, replay):
+    settings = Settings(
+        {
+            "CITY_SCRAPERS_CONDITIONAL_ENABLED": True,
+            "CITY_SCRAPERS_CIRCUIT_BREAKER_ENABLED": True,
+            "HTTPCACHE_IGNORE_HTTP_CODES": [503],
+        }
+    )
+    set_cache_mode(settings, Namespace(record=record, replay=replay))
+    assert settings.getbool("HTTPCACHE_ENABLED")
+    assert not settings.getbool("CITY_SCRAPERS_CONDITIONAL_ENABLED")
+    assert settings.getlist("HTTPCACHE_IGNORE_HTTP_CODES") == [304, 503]
+    assert settings.getbool("CITY_SCRAPERS_CIRCUIT_BREAKER_ENABLED") == record
+    assert settings.getbool("HTTPCACHE_IGNORE_MISSING") == replay
@@ -1,30 +1,23 @@
 from datetime import datetime
-from os.path import dirname, join
 
 import pytest
 from city_scrapers_core.constants import BOARD
-from city_scrapers_core.utils import file_response
-from freezegun import freeze_time
 
 from city_scrapers.spiders.losca_Board_of_Supervisors import (
     LoscaBoardOfSupervisorsSpider,
 )
 
-test_response = file_response(
-    join(dirname(__file__), "files", "losca_Board_of_Supervisors.html"),
-    url="https://bos.lacounty.gov/board-meeting-agendas/",
-)
-spider = LoscaBoardOfSupervisorsSpider()
-
-freezer = freeze_time("2024-09-17")
-freezer.start()
+FILE_NAME = "losca_Board_of_Supervisors.html"
+URL = "https://bos.lacounty.gov/board-meeting-agendas/"
+FROZEN_DATE = "2024-09-17"
 
-parsed_items = [item for item in spider.parse(test_response)]
 
-freezer.stop()
+@pytest.fixture(scope="module")
+def parsed_items(parse_fixture):
+    return parse_fixture(LoscaBoardOfSupervisorsSpider, FILE_NAME, URL, FROZEN_DATE)
 
 
-def test_count():
+def test_count(parsed_items):
     assert len(parsed_items) == 10
 
 
@@ -43,11 +36,11 @@ def test_count():
         (9, "Policy Presentations Meeting"),
     ],
 )
-def test_title(index, expected_title):
+def test_title(index, expected_title, parsed_items):
     assert parsed_items[index]["title"] == expected_title
 
 
-def test_description():
+def test_description(parsed_items):
     assert parsed_items[0]["description"] == ""
 
 
@@ -66,19 +59,19 @@ def test_description():
         (9, datetime(2024, 6, 18, 9, 30)),
     ],
 )
-def test_start(index, expected_start):
+def test_start(index, expected_start, parsed_items):
     assert parsed_items[index]["start"] == expected_start
 
 
-def test_end():
+def test_end(parsed_items):
     assert parsed_items[0]["end"] is None
 
 
-def test_time_notes():
+def test_time_notes(parsed_items):
     assert parsed_items[0]["time_notes"] == ""
 
 
-def test_id():
+def test_id(parsed_items):
     assert (
         parsed_items[0]["id"]
         == "losca_Board_of_Supervisors/202409170930/x/policy_presentations_and_public_hearing_meeting"  # noqa
@@ -100,24 +93,24 @@ def test_id():
         (9, "passed"),
     ],
 )
-def test_status(index, expected_status):
+def test_status(index, expected_status, parsed_items):
     assert parsed_items[index]["status"] == expected_status
 
 
-def test_location():
+def test_location(parsed_items):
     assert parsed_items[0]["location"] == {
         "name": "Kenneth Hahn Hall of Administration",
         "address": "500 West Temple Street, Room 381B, Los Angeles",
     }
 
 
-def test_source():
+def test_source(parsed_items):
     assert (
         parsed_items[0]["source"] == "https://bos.lacounty.gov/board-meeting-agendas/"
     )
 
 
-def test_links():
+def test_links(parsed_items):
     assert parsed_items[0]["links"] == [
         {
             "title": "Agenda",
@@ -148,10 +141,10 @@ def test_links():
     ]
 
 
-def test_classification():
+def test_classification(parsed_items):
     assert parsed_items[0]["classification"] == BOARD
 
 
-@pytest.mark.parametrize("item", parsed_items)
-def test_all_day(item):
-    assert item["all_day"] is False
+def test_all_day(parsed_items):
+    for item in parsed_items:
+        assert item["all_day"] is False
@@ -1,96 +1,89 @@
 from datetime import datetime
-from os.path import dirname, join
 
 import pytest
 from city_scrapers_core.constants import BOARD
-from city_scrapers_core.utils import file_response
-from freezegun import freeze_time
 
 from city_scrapers.spiders.losca_Board_of_ed import LoscaBoardOfEdSpider
 
-test_response = file_response(
-    join(dirname(__file__), "files", "losca_Board_of_ed.html"),
-    url="https://www.lausd.org/site/RSS.aspx?DomainID=1057&ModuleInstanceID=73805&PageID=18628&PMIID=0",  # noqa
-)
-spider = LoscaBoardOfEdSpider()
+FILE_NAME = "losca_Board_of_ed.html"
+URL = "https://www.lausd.org/site/RSS.aspx?DomainID=1057&ModuleInstanceID=73805&PageID=18628&PMIID=0"  # noqa
+FROZEN_DATE = "2024-09-19"
 
-freezer = freeze_time("2024-09-19")
-freezer.start()
 
-parsed_items = [item for item in spider.parse(test_response)]
+@pytest.fixture(scope="module")
+def parsed_items(parse_fixture):
+    return parse_fixture(LoscaBoardOfEdSpider, FILE_NAME, URL, FROZEN_DATE)
 
-freezer.stop()
 
-
-def test_count():
+def test_count(parsed_items):
     assert len(parsed_items) == 12
 
 
-def test_title():
+def test_title(parsed_items):
     assert parsed_items[0]["title"] == "Greening Schools & Climate Resilience Committee"
     assert parsed_items[1]["title"] == "Curriculum and Instruction Committee"
 
 
-def test_description():
+def test_description(parsed_items):
     assert parsed_items[0]["description"] == ""
 
 
-def test_start():
+def test_start(parsed_items):
     assert parsed_items[0]["start"] == datetime(2024, 9, 24, 13, 0)
 
 
-def test_end():
+def test_end(parsed_items):
     assert parsed_items[0]["end"] == datetime(2024, 9, 24, 16, 0)
 
 
-def test_time_notes():
+def test_time_notes(parsed_items):
     assert parsed_items[0]["time_notes"] == ""
 
 
-def test_id():
+def test_id(parsed_items):
     assert (
         parsed_items[0]["id"]
         == "losca_Board_of_ed/202409241300/x/greening_schools_climate_resilience_committee"  # noqa
     )
 
 
-def test_status():
+def test_status(parsed_items):
     assert parsed_items[0]["status"] == "tentative"
 
 
-def test_location():
+def test_location(parsed_items):
     assert parsed_items[0]["location"] == {
         "name": "LAUSD Headquarters",
         "address": "333 South Beaudry Avenue, Board Room, Los Angeles, CA 90017",
     }
 
 
-def test_source():
+def test_source(parsed_items):
     assert (
         parsed_items[0]["source"]
         == "https://www.lausd.org/site/RSS.aspx?DomainID=1057&ModuleInstanceID=73805&PageID=18628&PMIID=0"  # noqa
     )
 
 
-def test_links():
+def test_links(parsed_items):
     assert parsed_items[0]["links"] == [
         {
             "title": "Meeting Details",
-            "href": "https://www.lausd.org/site/Default.aspx?PageID=18628&amp;PageType=17&amp;DomainID=1057&amp;ModuleInstanceID=73805&amp;EventDateID=73502",  # noqa
+            "href": "https://www.lausd.org/site/Default.aspx?PageID=18628&PageType=17&DomainID=1057&ModuleInstanceID=73805&EventDateID=73502",  # noqa
         }
     ]
     assert parsed_items[1]["links"] == [
         {
             "title": "Meeting Details",
-            "href": "https://www.lausd.org/site/Default.aspx?PageID=18628&amp;PageType=17&amp;DomainID=1057&amp;ModuleInstanceID=73805&amp;EventDateID=71879",  # noqa
+            "href": "https://www.lausd.org/site/Default.aspx?PageID=18628&PageType=17&DomainID=1057&ModuleInstanceID=73805&EventDateID=71879",  # noqa
         }
     ]
 
 
-def test_classification():
+def test_classification(parsed_items):
     assert parsed_items[0]["classification"] == BOARD
 
 
-@pytest.mark.parametrize("item", parsed_items)
-def test_all_day(item):
-    assert item["all_day"] is False
+def test_all_day(parsed_items):
+    for item in parsed_items:
+        assert item["all_day"] is False
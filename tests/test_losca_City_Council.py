@@ -1,77 +1,70 @@
 from datetime import datetime
-from os.path import dirname, join
 
 import pytest
 from city_scrapers_core.constants import CITY_COUNCIL
-from city_scrapers_core.utils import file_response
-from freezegun import freeze_time
 
 from city_scrapers.spiders.losca_City_Council import LoscaCityCouncilSpider
 
-test_response = file_response(
-    join(dirname(__file__), "files", "losca_City_Council.json"),
-    url="https://lacity.primegov.com/api/v2/PublicPortal/ListUpcomingMeetings?_=1726255032697",  # noqa
-)
-spider = LoscaCityCouncilSpider()
+FILE_NAME = "losca_City_Council.json"
+URL = "https://lacity.primegov.com/api/v2/PublicPortal/ListUpcomingMeetings?_=1726255032697"  # noqa
+FROZEN_DATE = "2024-09-30"
 
-freezer = freeze_time("2024-09-30")
-freezer.start()
 
-parsed_items = [item for item in spider.parse(test_response)]
+@pytest.fixture(scope="module")
+def parsed_items(parse_fixture):
+    return parse_fixture(LoscaCityCouncilSpider, FILE_NAME, URL, FROZEN_DATE)
 
-freezer.stop()
 
-
-def test_count():
+def test_count(parsed_items):
     assert len(parsed_items) == 13
 
 
-def test_title():
+def test_title(parsed_items):
     assert parsed_items[0]["title"] == "Personnel, Audits, and Hiring Committee"
     assert parsed_items[1]["title"] == "SAP - Personnel, Audits, and Hiring Committee"
 
 
-def test_description():
+def test_description(parsed_items):
     assert parsed_items[0]["description"] == ""
 
 
-def test_start():
+def test_start(parsed_items):
     assert parsed_items[0]["start"] == datetime(2024, 10, 1, 8, 30)
     assert parsed_items[1]["start"] == datetime(2024, 10, 1, 8, 30)
     assert parsed_items[2]["start"] == datetime(2024, 10, 1, 10, 0)
 
 
-def test_end():
+def test_end(parsed_items):
     assert parsed_items[0]["end"] is None
 
 
-def test_time_notes():
+def test_time_notes(parsed_items):
     assert parsed_items[0]["time_notes"] == ""
 
 
-def test_id():
+def test_id(parsed_items):
     assert (
         parsed_items[0]["id"]
         == "losca_City_Council/202410010830/x/personnel_audits_and_hiring_committee"
     )
 
 
-def test_status():
+def test_status(parsed_items):
     assert parsed_items[0]["status"] == "tentative"
 
 
-def test_location():
+def test_location(parsed_items):
     assert parsed_items[0]["location"] == {
         "name": "Office of the City Clerk",
         "address": "200 N Spring St, Room 360, Los Angeles, CA 90012",
     }
 
 
-def test_source():
+def test_source(parsed_items):
     assert parsed_items[0]["source"] == "https://clerk.lacity.gov/calendar"
 
 
-def test_links():
+def test_links(parsed_items):
     assert parsed_items[0]["links"] == [
         {"title": "video", "href": "https://youtube.com/watch?v=ewD_li_BkgU"}
     ]
@@ -81,10 +74,10 @@ def test_links():
     assert parsed_items[2]["links"] == []
 
 
-def test_classification():
+def test_classification(parsed_items):
     assert parsed_items[0]["classification"] == CITY_COUNCIL
 
 
-@pytest.mark.parametrize("item", parsed_items)
-def test_all_day(item):
-    assert item["all_day"] is False
+def test_all_day(parsed_items):
+    for item in parsed_items:
+        assert item["all_day"] is False
@@ -1,77 +1,70 @@
 from datetime import datetime
-from os.path import dirname, join
 
 import pytest
 from city_scrapers_core.constants import COMMISSION
-from city_scrapers_core.utils import file_response
-from freezegun import freeze_time
 
 from city_scrapers.spiders.losca_Health_Commission import LoscaHealthCommissionSpider
 
-test_response = file_response(
-    join(dirname(__file__), "files", "losca_Health_Commission.json"),
-    url="https://clerk.lacity.gov/clerk-services/council-and-public-services/city-health-commission/commission-meetings",  # noqa
-)
-spider = LoscaHealthCommissionSpider()
+FILE_NAME = "losca_Health_Commission.json"
+URL = "https://clerk.lacity.gov/clerk-services/council-and-public-services/city-health-commission/commission-meetings"  # noqa
+FROZEN_DATE = "2024-10-22"
 
-freezer = freeze_time("2024-10-22")
-freezer.start()
 
-parsed_items = [item for item in spider.parse(test_response)]
+@pytest.fixture(scope="module")
+def parsed_items(parse_fixture):
+    return parse_fixture(LoscaHealthCommissionSpider, FILE_NAME, URL, FROZEN_DATE)
 
-freezer.stop()
 
-
-def test_count():
+def test_count(parsed_items):
     assert len(parsed_items) == 10
 
 
-def test_title():
+def test_title(parsed_items):
     assert parsed_items[0]["title"] == "Los Angeles City Health Commission"
 
 
-def test_description():
+def test_description(parsed_items):
     assert parsed_items[0]["description"] == ""
 
 
-def test_start():
+def test_start(parsed_items):
     assert parsed_items[0]["start"] == datetime(2024, 1, 8, 18, 0)
 
 
-def test_end():
+def test_end(parsed_items):
     assert parsed_items[0]["end"] is None
 
 
-def test_time_notes():
+def test_time_notes(parsed_items):
     assert parsed_items[0]["time_notes"] == ""
 
 
-def test_id():
+def test_id(parsed_items):
     assert (
         parsed_items[0]["id"]
         == "losca_Health_Commission/202401081800/x/los_angeles_city_health_commission"
     )
 
 
-def test_status():
+def test_status(parsed_items):
     assert parsed_items[0]["status"] == "passed"
 
 
-def test_location():
+def test_location(parsed_items):
     assert parsed_items[0]["location"] == {
         "name": "Los Angeles City Health Commission",
         "address": "Room 340 (CITY HALL), 200 N Spring St, Los Angeles, CA 90012",
     }
 
 
-def test_source():
+def test_source(parsed_items):
     assert (
         parsed_items[0]["source"]
         == "https://clerk.lacity.gov/clerk-services/council-and-public-services/city-health-commission/commission-meetings"  # noqa
     )
 
 
-def test_links():
+def test_links(parsed_items):
     assert parsed_items[0]["links"] == [
         {"href": "https://youtube.com/watch?v=aWd67e6sxTg", "title": "Video Link"},
         {
@@ -85,10 +78,10 @@ def test_links():
     ]
 
 
-def test_classification():
+def test_classification(parsed_items):
     assert parsed_items[0]["classification"] == COMMISSION
 
 
-@pytest.mark.parametrize("item", parsed_items)
-def test_all_day(item):
-    assert item["all_day"] is False
+def test_all_day(parsed_items):
+    for item in parsed_items:
+        assert item["all_day"] is False
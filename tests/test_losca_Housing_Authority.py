@@ -1,78 +1,86 @@
 from datetime import datetime
-from os.path import dirname, join
 
 import pytest
 from city_scrapers_core.constants import BOARD
-from city_scrapers_core.utils import file_response
 from freezegun import freeze_time
+from scrapy.http import HtmlResponse
 
 from city_scrapers.spiders.losca_Housing_Authority import LoscaHousingAuthoritySpider
 
-test_response = file_response(
-    join(dirname(__file__), "files", "losca_Housing_Authority.html"),
-    url="https://www.hacla.org/en/bocfiles",
-)
-spider = LoscaHousingAuthoritySpider()
+FILE_NAME = "losca_Housing_Authority.html"
+URL = "https://www.hacla.org/en/bocfiles"
+FROZEN_DATE = "2025-01-08"
 
-freezer = freeze_time("2025-01-08")
-freezer.start()
 
-parsed_items = [item for item in spider.parse(test_response)]
+@pytest.fixture(scope="module")
+def parsed_items(parse_fixture):
+    return parse_fixture(LoscaHousingAuthoritySpider, FILE_NAME, URL, FROZEN_DATE)
 
-freezer.stop()
+
+@pytest.fixture(scope="module")
+def selector_items(parse_fixture):
+    return parse_fixture(
+        LoscaHousingAuthoritySpider, FILE_NAME, URL, FROZEN_DATE, stream="false"
+    )
 
 
-def test_count():
+def test_count(parsed_items):
     assert len(parsed_items) == 22
 
 
-def test_title():
+def test_stream_matches_selector(parsed_items, selector_items):
+    assert [dict(item) for item in parsed_items] == [
+        dict(item) for item in selector_items
+    ]
+
+
+def test_title(parsed_items):
     assert parsed_items[0]["title"] == "BOC Regular Meeting"
     assert parsed_items[1]["title"] == "Board of Directors Special Meeting"
     assert parsed_items[20]["title"] == "BOC Regular Meeting"
     assert parsed_items[21]["title"] == "Board of Directors Special Meeting"
 
 
-def test_description():
+def test_description(parsed_items):
     assert parsed_items[0]["description"] == ""
 
 
-def test_start():
+def test_start(parsed_items):
     assert parsed_items[0]["start"] == datetime(2025, 1, 9, 9, 0)
     assert parsed_items[21]["start"] == datetime(2024, 7, 11, 9, 0)
 
 
-def test_end():
+def test_end(parsed_items):
     assert parsed_items[0]["end"] is None
 
 
-def test_time_notes():
+def test_time_notes(parsed_items):
     assert parsed_items[0]["time_notes"] == ""
 
 
-def test_id():
+def test_id(parsed_items):
     assert parsed_items[0]["id"] == (
         "losca_Housing_Authority/202501090900/x/boc_regular_meeting"
     )
 
 
-def test_status():
+def test_status(parsed_items):
     assert parsed_items[0]["status"] == "tentative"
     assert parsed_items[21]["status"] == "passed"
 
 
-def test_location():
+def test_location(parsed_items):
     assert parsed_items[0]["location"] == {
         "name": "HACLA",
         "address": "2600 Wilshire Blvd. Los Angeles, CA 90057",
     }
 
 
-def test_source():
+def test_source(parsed_items):
     assert parsed_items[0]["source"] == "https://www.hacla.org/en/bocfiles"
 
 
-def test_links():
+def test_links(parsed_items):
     assert parsed_items[0]["links"] == []
     assert parsed_items[3]["links"] == [
         {
@@ -95,10 +103,38 @@ def test_links():
     ]
 
 
-def test_classification():
+def test_classification(parsed_items):
     assert parsed_items[0]["classification"] == BOARD
 
 
-@pytest.mark.parametrize("item", parsed_items)
-def test_all_day(item):
-    assert item["all_day"] is False
+def test_all_day(parsed_items):
+    for item in parsed_items:
+        assert item["all_day"] is False
+
+
+ROWS_HTML = """<html><body><div class="views-element-container">
+<div class="views-row"><span class="views-field-title">
+<span class="field-content">01/09/2025 BOC Regular Meeting</span></span></div>
+<div class="views-row"><span class="views-field-title">
+<span class="field-content">01/09/2020 BOC Regular Meeting</span></span></div>
+<div class="views-row"><span class="views-field-title">
+<span class="field-content">02/13/2025 BOC Regular Meeting"""
+
+
+def rows_response():
+    return HtmlResponse(URL, body=ROWS_HTML.encode(), encoding="utf-8")
+
+
+def test_stream_last_row():
+    # The page is cut off inside the last row, which is only flushed on close
+    spider = LoscaHousingAuthoritySpider()
+    rows = list(spider._iter_rows(rows_response()))
+    assert len(rows) == 3
+
+
+@pytest.mark.parametrize("stream,count", [("true", 1), ("false", 2)])
+def test_cutoff(stream, count):
+    # Only the stream stops at the first row past the cutoff
+    spider = LoscaHousingAuthoritySpider(stream=stream)
+    with freeze_time(FROZEN_DATE):
+        assert len(list(spider.parse(rows_response()))) == count
@@ -0,0 +1,212 @@
+import json
+
+import pytest
+from scrapy import Spider, signals
+from scrapy.exceptions import NotConfigured
+from scrapy.http import Request
+from scrapy.utils.test import get_crawler
+from twisted.internet import task
+from twisted.web.test.requesthelper import DummyRequest
+
+from benchmarks.mock_agency import (
+    ROBOTS_TXT,
+    SEND_INTERVAL,
+    MockAgencyResource,
+    get_routes,
+)
+from city_scrapers.extensions import LoadReportExtension
+from city_scrapers.extensions.load_report import LoadReport
+from city_scrapers.middleware import MockAgencyMiddleware
+from city_scrapers.spiderloader import build_manifest
+
+HTML = b"text/html; charset=utf-8"
+ROUTES = {("www.hacla.org", "/en/bocfiles"): (HTML, b"<html>meetings</html>")}
+SERVER_URL = "http://127.0.0.1:8600"
+
+
+class MockRequest(DummyRequest):
+    """Request received by the server with a connected client and a Host header"""
+
+    def __init__(self, uri: bytes, host: bytes = b"127.0.0.1"):
+        super().__init__([b""])
+        self.uri = uri
+        self.host_name = host
+        self.channel = object()
+
+    def getRequestHostname(self):
+        return self.host_name
+
+
+class FakeReactor(task.Clock):
+    """Clock recording the startup and shutdown callbacks a reactor would run"""
+
+    def __init__(self):
+        super().__init__()
+        self.startup = []
+        self.shutdown = []
+
+    def callWhenRunning(self, func, *args):
+        self.startup.append(func)
+
+    def addSystemEventTrigger(self, phase, event, func, *args):
+        self.shutdown.append(func)
+
+
+@pytest.fixture
+def clock():
+    return task.Clock()
+
+
+def render(resource, clock, uri, host=b"127.0.0.1", seconds=0):
+    request = MockRequest(uri, host)
+    resource.render(request)
+    clock.advance(seconds)
+    return request
+
+
+@pytest.mark.parametrize(
+    "uri,host",
+    [
+        # Sent as a proxy, with the query string ignored
+        (b"http://www.hacla.org/en/bocfiles?page=1", b"127.0.0.1"),
+        # Sent as a server
+        (b"/en/bocfiles", b"www.hacla.org"),
+    ],
+)
+def test_routes(clock, uri, host):
+    resource = MockAgencyResource(ROUTES, clock=clock)
+    request = render(resource, clock, uri, host)
+    assert request.responseCode == 200
+    assert request.responseHeaders.getRawHeaders(b"Content-Type") == [HTML]
+    assert b"".join(request.written) == b"<html>meetings</html>"
+    assert request.finished
+
+
+def test_robots_and_not_found(clock):
+    resource = MockAgencyResource(ROUTES, clock=clock)
+    request = render(resource, clock, b"http://www.hacla.org/robots.txt")
+    assert b"".join(request.written) == ROBOTS_TXT
+    request = render(resource, clock, b"http://www.hacla.org/missing")
+    assert request.responseCode == 404
+    assert resource.stats == {
+        "requests": 2,
+        "errors": 0,
+        "not_found": 1,
+        "bytes": len(ROBOTS_TXT),
+    }
+
+
+def test_spider_routes():
+    # Every spider's start requests are served
+    routes = get_routes()
+    hosts = {host for host, _ in routes}
+    for entry in build_manifest("city_scrapers.spiders").values():
+        assert set(entry["domains"]) <= hosts
+
+
+@pytest.mark.parametrize("error_rate,errors", [(0.0, 0), (1.0, 10)])
+def test_error_rate(clock, error_rate, errors):
+    resource = MockAgencyResource(
+        ROUTES, error_rate=error_rate, error_status=500, clock=clock
+    )
+    requests = [
+        render(resource, clock, b"http://www.hacla.org/en/bocfiles") for _ in range(10)
+    ]
+    assert resource.stats["errors"] == errors
+    assert sum(request.responseCode == 500 for request in requests) == errors
+
+
+def test_latency_and_bandwidth(clock):
+    # 100 bytes per second is sent in chunks of 5 bytes
+    resource = MockAgencyResource(ROUTES, latency=1.0, bandwidth=100, clock=clock)
+    request = render(resource, clock, b"http://www.hacla.org/en/bocfiles")
+    assert request.written == []
+    clock.advance(1.0)
+    assert request.written == [b"<html"]
+    clock.pump([SEND_INTERVAL] * 3)
+    assert request.written == [b"<html", b">meet", b"ings<", b"/html"]
+    assert not request.finished
+    clock.advance(SEND_INTERVAL)
+    assert request.written[-1] == b">"
+    assert request.finished
+    assert resource.stats["bytes"] == len(b"<html>meetings</html>")
+
+
+def test_client_disconnected(clock):
+    resource = MockAgencyResource(ROUTES, latency=1.0, clock=clock)
+    request = render(resource, clock, b"http://www.hacla.org/en/bocfiles")
+    request.channel = None
+    clock.advance(1.0)
+    assert request.written == []
+
+
+def test_middleware():
+    crawler = get_crawler(
+        Spider, settings_dict={"CITY_SCRAPERS_MOCK_AGENCY_URL": SERVER_URL}
+    )
+    spider = crawler._create_spider("mock")
+    mw = MockAgencyMiddleware.from_crawler(crawler)
+    # HTTPS requests are sent again over HTTP, which is proxied
+    replaced = mw.process_request(Request("https://www.hacla.org/en/bocfiles"), spider)
+    assert replaced.url == "http://www.hacla.org/en/bocfiles"
+    assert mw.process_request(replaced, spider) is None
+    assert replaced.meta["proxy"] == SERVER_URL
+
+    with pytest.raises(NotConfigured):
+        MockAgencyMiddleware.from_crawler(get_crawler(Spider))
+
+
+def test_load_report(tmp_path):
+    reactor = FakeReactor()
+    report = LoadReport(str(tmp_path / "report.json"), reactor=reactor)
+    crawler = get_crawler(Spider)
+    crawler.spider = crawler._create_spider("mock")
+    crawler.stats.set_value("item_scraped_count", 30)
+    crawler.stats.set_value("downloader/request_count", 4)
+    report.crawlers.append(crawler)
+    reactor.advance(5)
+    # Time before the reactor starts isn't counted
+    for func in reactor.startup:
+        func()
+    for _ in range(3):
+        report.request_reached_downloader()
+    report.request_left_downloader()
+    report.request_reached_downloader()
+    reactor.advance(10)
+    for func in reactor.shutdown:
+        func()
+    with open(tmp_path / "report.json") as f:
+        data = json.load(f)
+    assert data["seconds"] == 10
+    assert data["items"] == 30
+    assert data["requests"] == 4
+    assert data["items_per_sec"] == 3.0
+    assert data["max_concurrency"] == 3
+    assert data["reactor_idle_seconds"] is None
+    assert data["spiders"] == {"mock": {"finish_reason": None, "items": 30}}
+
+
+def test_load_report_extension(monkeypatch):
+    with pytest.raises(NotConfigured):
+        LoadReportExtension.from_crawler(get_crawler(Spider))
+
+    report = LoadReport(None, reactor=FakeReactor())
+    monkeypatch.setattr(LoadReportExtension, "report", report)
+    # Concurrency is counted across every crawler in the process
+    crawlers = [
+        get_crawler(Spider, settings_dict={"CITY_SCRAPERS_MOCK_AGENCY_URL": SERVER_URL})
+        for _ in range(2)
+    ]
+    for crawler in crawlers:
+        LoadReportExtension.from_crawler(crawler)
+    request = Request("http://www.hacla.org/en/bocfiles")
+    for crawler in crawlers:
+        crawler.signals.send_catch_log(
+            signals.request_reached_downloader, request=request, spider=None
+        )
+    crawlers[0].signals.send_catch_log(
+        signals.request_left_downloader, request=request, spider=None
+    )
+    assert report.crawlers == crawlers
+    assert report.active == 1
+    assert report.max_active == 2
@@ -0,0 +1,276 @@
+import json
+from datetime import datetime
+from os.path import dirname, join
+
+import pytest
+from city_scrapers_core.utils import file_response
+from scrapy import signals
+from scrapy.crawler import Crawler
+from scrapy.exceptions import DropItem
+from scrapy.http import TextResponse
+from scrapy.statscollectors import MemoryStatsCollector
+from scrapy.utils.test import get_crawler
+
+from city_scrapers.middleware import CachedItemsMiddleware, ConditionalRequestMiddleware
+from city_scrapers.middleware.conditional import ValidatorStore
+from city_scrapers.spiders.losca_City_Council import LoscaCityCouncilSpider
+from city_scrapers.spiders.losca_Health_Commission import LoscaHealthCommissionSpider
+
+test_response = file_response(
+    join(dirname(__file__), "files", "losca_Health_Commission.json"),
+    url="https://lacity.primegov.com/api/v2/PublicPortal/ListArchivedMeetings?year=2024",  # noqa
+)
+
+
+def get_spider(spidercls, settings=None):
+    return get_crawler(spidercls, settings_dict=settings)._create_spider()
+
+
+def test_upcoming_request():
+    spider = get_spider(LoscaCityCouncilSpider)
+    request = next(spider.start_requests())
+    assert (
+        request.url
+        == "https://lacity.primegov.com/api/v2/PublicPortal/ListUpcomingMeetings"
+    )
+    assert request.meta["share_response"] is True
+
+
+def test_archive_request_by_committee():
+    spider = get_spider(LoscaHealthCommissionSpider)
+    assert spider.archive_request(2024).url == (
+        "https://lacity.primegov.com/api/v2/PublicPortal/"
+        "ListArchivedMeetingsByCommitteeId?year=2024&committeeId=6"
+    )
+
+
+def test_archive_request_by_year():
+    spider = get_spider(
+        LoscaHealthCommissionSpider, {"CITY_SCRAPERS_PRIMEGOV_ARCHIVE_BY_YEAR": True}
+    )
+    assert spider.archive_request(2024).url == (
+        "https://lacity.primegov.com/api/v2/PublicPortal/ListArchivedMeetings?year=2024"
+    )
+
+
+def test_committee_filter():
+    body = (
+        b'[{"committeeId": 6, "title": "a", "dateTime": "2024-10-01T10:00:00"},'
+        b'{"committeeId": 1, "title": "b", "dateTime": "2024-10-01T10:00:00"}]'
+    )
+    response = TextResponse(url=test_response.url, body=body, encoding="utf-8")
+    health_spider = LoscaHealthCommissionSpider()
+    council_spider = LoscaCityCouncilSpider()
+    assert [
+        item["title"] for item in health_spider.parse_primegov_meetings(response)
+    ] == ["a"]
+    assert [
+        item["title"] for item in council_spider.parse_primegov_meetings(response)
+    ] == ["a", "b"]
+
+
+def test_parse_meetings():
+    spider = LoscaHealthCommissionSpider()
+    assert len(list(spider.parse_primegov_meetings(test_response))) == 10
+
+
+@pytest.mark.parametrize(
+    "spidercls,file_name",
+    [
+        (LoscaCityCouncilSpider, "losca_City_Council.json"),
+        (LoscaHealthCommissionSpider, "losca_Health_Commission.json"),
+    ],
+)
+def test_stream_matches_full_decode(parse_fixture, spidercls, file_name):
+    streamed, loaded = [
+        parse_fixture(
+            spidercls,
+            file_name,
+            test_response.url,
+            "2024-10-01",
+            settings={"CITY_SCRAPERS_PRIMEGOV_STREAM_JSON": stream},
+        )
+        for stream in [True, False]
+    ]
+    assert len(streamed) > 0
+    assert streamed == loaded
+
+
+def stream_items(body, stream=True):
+    spider = get_spider(
+        LoscaCityCouncilSpider, {"CITY_SCRAPERS_PRIMEGOV_STREAM_JSON": stream}
+    )
+    spider.crawler.stats.open_spider(spider)
+    response = TextResponse(url=test_response.url, body=body, encoding="utf-8")
+    return spider, list(spider.parse_primegov_meetings(response))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 1000])
+def test_stream_chunks(monkeypatch, chunk_size):
+    monkeypatch.setattr(LoscaCityCouncilSpider, "json_chunk_size", chunk_size)
+    response = test_response.replace(body=b"\xef\xbb\xbf" + test_response.body + b" \n")
+    spider = get_spider(LoscaCityCouncilSpider)
+    items = list(spider._stream_primegov_items(response))
+    assert items == json.loads(test_response.body)
+    # The body isn't decoded to text all at once
+    assert response._cached_ubody is None
+
+
+def test_stream_split_values(monkeypatch):
+    monkeypatch.setattr(LoscaCityCouncilSpider, "json_chunk_size", 1)
+    response = TextResponse(
+        url=test_response.url, body='[12345, true, "é"]'.encode(), encoding="utf-8"
+    )
+    spider = get_spider(LoscaCityCouncilSpider)
+    assert list(spider._iter_json_array(response)) == [12345, True, "é"]
+
+
+@pytest.mark.parametrize("stream", [True, False])
+def test_invalid_items(caplog, stream):
+    spider, items = stream_items(
+        b' [ {"id": 1, "title": null, "dateTime": "2024-10-01T10:00:00"},\n'
+        b'{"id": 2, "title": "a"}, [], {"id": 3, "title": "b", "dateTime": 1},'
+        b'{"id": 4, "title": "c", "dateTime": "2024-10-02T10:00:00"} ]\n',
+        stream=stream,
+    )
+    assert [item["id"] for item in items] == [1, 4]
+    stats = spider.crawler.stats
+    assert stats.get_value("primegov/invalid_items") == 3
+    assert "Skipping PrimeGov item with id 2" in caplog.text
+
+
+@pytest.mark.parametrize(
+    "body,count,error",
+    [
+        (b"[]", 0, None),
+        (b"", 0, "Failed to parse JSON response"),
+        (b'{"title": "a"}', 0, "Expected list of items, got <class 'dict'>"),
+        (b'[{"title": "a", "dateTime": ""}, {"title"', 1, "Failed to parse JSON"),
+        (b'[{"title": "a", "dateTime": ""} {}]', 1, "Expecting ',' delimiter"),
+        (b'[{"title": "a", "dateTime": ""}] []', 1, "Extra data"),
+    ],
+)
+def test_stream_errors(caplog, body, count, error):
+    spider, items = stream_items(body)
+    assert len(items) == count
+    assert spider.crawler.stats.get_value("primegov/decode_ms") >= 0
+    assert spider.crawler.stats.get_value("primegov/process_peak_rss_mb") > 0
+    if error is None:
+        assert not caplog.records
+    else:
+        assert error in caplog.text
+
+
+def get_backfill_spider(spidercls, tmp_path, settings=None, **kwargs):
+    crawler = Crawler(spidercls, settings)
+    return crawler._create_spider(
+        checkpoint=str(tmp_path / "checkpoint.json"), **kwargs
+    )
+
+
+def test_backfill_requests(tmp_path):
+    spider = get_backfill_spider(
+        LoscaHealthCommissionSpider, tmp_path, since="2010", until="2012"
+    )
+    requests = list(spider.start_requests())
+    assert [request.meta["primegov_year"] for request in requests] == [
+        2010,
+        2011,
+        2012,
+    ]
+    assert all(
+        request.meta["download_slot"] == "primegov-backfill" for request in requests
+    )
+    assert requests[0].url.endswith("year=2010&committeeId=6")
+
+
+def test_backfill_settings(tmp_path):
+    spider = get_backfill_spider(
+        LoscaCityCouncilSpider, tmp_path, since="2010", backfill_concurrency="6"
+    )
+    settings = spider.crawler.settings
+    assert settings.getdict("DOWNLOAD_SLOTS")["primegov-backfill"] == {
+        "concurrency": 6,
+        "delay": 0,
+    }
+    assert spider.backfill_years()[-1] == datetime.now().year
+
+
+def test_backfill_checkpoint(tmp_path):
+    spider = get_backfill_spider(
+        LoscaCityCouncilSpider, tmp_path, since="2023", until="2024"
+    )
+    request = next(spider.start_requests())
+    response = file_response(
+        join(dirname(__file__), "files", "losca_Health_Commission.json"),
+        url=request.url,
+    )
+    response.request = request
+    items = list(request.callback(response))
+    assert len(items) == 10
+    # Years are only finished once their items have been through the pipelines
+    assert spider._load_checkpoint() == set()
+    for item in items[:-1]:
+        spider.crawler.signals.send_catch_log(
+            signals.item_scraped, item=item, response=response, spider=spider
+        )
+    assert spider._load_checkpoint() == set()
+    spider.crawler.signals.send_catch_log(
+        signals.item_dropped,
+        item=items[-1],
+        response=response,
+        exception=DropItem("dropped"),
+        spider=spider,
+    )
+    assert spider._load_checkpoint() == {2023}
+
+    resumed = get_backfill_spider(
+        LoscaCityCouncilSpider, tmp_path, since="2023", until="2024"
+    )
+    requests = list(resumed.start_requests())
+    assert [request.meta["primegov_year"] for request in requests] == [2024]
+
+    resumed._close_backfill(resumed, "finished")
+    assert (tmp_path / "checkpoint.json").exists()
+    resumed._save_checkpoint({2023, 2024})
+    resumed._close_backfill(resumed, "finished")
+    assert not (tmp_path / "checkpoint.json").exists()
+
+
+def test_backfill_conditional(tmp_path):
+    settings = {
+        "CITY_SCRAPERS_CONDITIONAL_ENABLED": True,
+        "CITY_SCRAPERS_CONDITIONAL_DB": str(tmp_path / "conditional.db"),
+    }
+    # The first run stops before its items reach the pipelines, so the year is
+    # requested again with conditional requests enabled
+    for _ in range(2):
+        spider = get_backfill_spider(
+            LoscaCityCouncilSpider, tmp_path, settings, since="2023", until="2023"
+        )
+        spider.crawler.stats = MemoryStatsCollector(spider.crawler)
+        downloader_mw = ConditionalRequestMiddleware.from_crawler(spider.crawler)
+        spider_mw = CachedItemsMiddleware.from_crawler(spider.crawler)
+        request = next(spider.start_requests())
+        downloader_mw.process_request(request, spider)
+        not_modified = "If-None-Match" in request.headers
+        response = TextResponse(
+            request.url,
+            status=304 if not_modified else 200,
+            body=b"" if not_modified else test_response.body,
+            headers={"ETag": '"abc"'},
+            request=request,
+        )
+        response = downloader_mw.process_response(request, response, spider)
+        items = list(
+            spider_mw.process_spider_output(
+                response, request.callback(response), spider
+            )
+        )
+    ValidatorStore._stores.clear()
+    assert len(items) == 10
+    for item in items:
+        spider.crawler.signals.send_catch_log(
+            signals.item_scraped, item=item, response=response, spider=spider
+        )
+    assert spider._load_checkpoint() == {2023}
@@ -0,0 +1,109 @@
+import types
+from collections import Counter
+
+import pytest
+from scrapy import Request
+from scrapy.utils.test import get_crawler
+from twisted.internet import defer
+
+from city_scrapers import pool
+from city_scrapers.extensions import TimingStatsExtension
+from city_scrapers.middleware.conditional import UNCHANGED_META_KEY
+from city_scrapers.pool import (
+    get_response_args,
+    get_spider_state,
+    load_output,
+    load_results,
+    parse_in_worker,
+)
+from city_scrapers.spiders.losca_Board_of_Supervisors import (
+    LoscaBoardOfSupervisorsSpider,
+)
+
+FILE_NAME = "losca_Board_of_Supervisors.html"
+URL = "https://bos.lacounty.gov/board-meeting-agendas/"
+
+
+@pytest.fixture
+def spider():
+    crawler = get_crawler(
+        LoscaBoardOfSupervisorsSpider,
+        settings_dict={
+            "CITY_SCRAPERS_PROCESS_POOL_WORKERS": 1,
+            "CITY_SCRAPERS_COMPACT_ITEMS": True,
+        },
+    )
+    spider = crawler._create_spider()
+    crawler.stats.open_spider(spider)
+    return spider
+
+
+def test_parse_in_worker(spider, fixture_response):
+    response = fixture_response(FILE_NAME, URL)
+    results, date_counts, samples = parse_in_worker(
+        type(spider),
+        get_spider_state(spider),
+        "parse",
+        get_response_args(response),
+        {},
+        timed=True,
+    )
+    assert results == [
+        (False, item) for item in LoscaBoardOfSupervisorsSpider().parse(response)
+    ]
+    # Spider arguments and settings stored on the spider are copied
+    assert get_spider_state(spider)["compact_items"] is True
+    assert sum(date_counts["date_parser"].values()) == 10
+    assert len(samples["dates/date_parser"]) == 10
+    # The callback is timed in the original process
+    assert "spider/parse" not in samples
+
+
+def test_output_loaded(spider):
+    timing = TimingStatsExtension(spider.crawler, spider.crawler.stats)
+    parser = type(spider).date_parser
+    fallback = parser.stats["fallback"]
+    output = ([(False, {"id": 1})], {"date_parser": Counter(fallback=2)}, {"a": [1.0]})
+    assert list(load_output(spider, output, timing)) == [{"id": 1}]
+    assert parser.stats["fallback"] == fallback + 2
+    assert timing.samples["a"] == [1.0]
+
+
+def test_requests_loaded(spider):
+    request = Request("https://example.com", callback=spider.parse, cb_kwargs={"a": 1})
+    [loaded] = load_results(spider, [(True, request.to_dict(spider=spider))])
+    assert loaded.callback == spider.parse
+    assert loaded.cb_kwargs == {"a": 1}
+
+
+def test_callback_returns_deferred(spider, fixture_response, monkeypatch):
+    # Run the callback in this process, since the reactor isn't running
+    def submit(func, *args, **kwargs):
+        return types.SimpleNamespace(result=lambda: func(*args, **kwargs))
+
+    monkeypatch.setattr(
+        pool, "get_executor", lambda workers: types.SimpleNamespace(submit=submit)
+    )
+    monkeypatch.setattr(
+        pool, "future_to_deferred", lambda future: defer.succeed(future.result())
+    )
+    response = fixture_response(FILE_NAME, URL)
+    dfd = spider.parse(response)
+    assert isinstance(dfd, defer.Deferred)
+    assert dfd.result == list(LoscaBoardOfSupervisorsSpider().parse(response))
+    assert spider.crawler.stats.get_value("process_pool/response_count") == 1
+
+
+def test_unchanged_inline(spider, fixture_response, monkeypatch):
+    monkeypatch.setattr(pool, "get_executor", None)
+    response = fixture_response(FILE_NAME, URL)
+    response.request = Request(URL, meta={UNCHANGED_META_KEY: True})
+    assert len(list(spider.parse(response))) == 10
+    assert spider.crawler.stats.get_value("process_pool/response_count") is None
+
+
+def test_disabled_inline(fixture_response):
+    spider = LoscaBoardOfSupervisorsSpider.from_crawler(
+        get_crawler(LoscaBoardOfSupervisorsSpider)
+    )
+    assert len(list(spider.parse(fixture_response(FILE_NAME, URL)))) == 10
@@ -0,0 +1,55 @@
+import pytest
+from scrapy.resolver import dnscache
+from scrapy.utils.test import get_crawler
+from twisted.internet import defer, reactor
+from twisted.internet.base import ThreadedResolver
+
+from city_scrapers.resolver import PersistentCachingResolver
+from city_scrapers.spiders.losca_City_Council import LoscaCityCouncilSpider
+
+HOST = "lacity.primegov.com"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    dnscache.clear()
+    yield
+    dnscache.clear()
+    PersistentCachingResolver._connections.clear()
+
+
+def get_resolver(tmp_path, ttl=60 * 60):
+    crawler = get_crawler(
+        LoscaCityCouncilSpider,
+        settings_dict={
+            "CITY_SCRAPERS_DNSCACHE_DB": str(tmp_path / "dns.db"),
+            "CITY_SCRAPERS_DNSCACHE_TTL": ttl,
+        },
+    )
+    return PersistentCachingResolver.from_crawler(crawler, reactor)
+
+
+def test_addresses_stored(tmp_path):
+    resolver = get_resolver(tmp_path)
+    assert resolver._cache_result("192.0.2.1", HOST) == "192.0.2.1"
+    # A new process starts with an empty in-memory cache
+    dnscache.clear()
+    resolved = get_resolver(tmp_path).getHostByName(HOST)
+    # Returned without resolving in a thread
+    assert resolved.result == "192.0.2.1"
+
+
+def test_expired_addresses_resolved(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        ThreadedResolver,
+        "getHostByName",
+        lambda self, name, timeout: defer.succeed("192.0.2.2"),
+    )
+    resolver = get_resolver(tmp_path)
+    resolver._cache_result("192.0.2.1", HOST)
+    with resolver.conn:
+        resolver.conn.execute("UPDATE hosts SET timestamp = 0")
+    dnscache.clear()
+    assert get_resolver(tmp_path).getHostByName(HOST).result == "192.0.2.2"
+    dnscache.clear()
+    assert get_resolver(tmp_path).getHostByName(HOST).result == "192.0.2.2"
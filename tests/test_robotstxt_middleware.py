@@ -0,0 +1,108 @@
+from types import SimpleNamespace
+
+import pytest
+from scrapy.exceptions import IgnoreRequest
+from scrapy.http import Request, TextResponse
+from scrapy.utils.test import get_crawler
+from twisted.internet import defer
+from twisted.python.failure import Failure
+
+from city_scrapers.middleware import CachedRobotsTxtMiddleware
+from city_scrapers.middleware.robotstxt import RobotsTxtStore
+from city_scrapers.spiders.losca_Housing_Authority import LoscaHousingAuthoritySpider
+
+URL = "https://www.hacla.org/en/about-hacla/board-of-commissioners"
+ROBOTS_URL = "https://www.hacla.org/robots.txt"
+ROBOTS = b"User-agent: *\nDisallow: /admin/\n"
+
+
+@pytest.fixture(autouse=True)
+def clear_stores():
+    yield
+    RobotsTxtStore._stores.clear()
+
+
+def get_middleware(tmp_path, status=200, headers=None):
+    """Middleware for a new crawler, recording the robots.txt requests it downloads"""
+    crawler = get_crawler(
+        LoscaHousingAuthoritySpider,
+        settings_dict={
+            "ROBOTSTXT_OBEY": True,
+            "CITY_SCRAPERS_ROBOTSTXT_DB": str(tmp_path / "robotstxt.db"),
+            "CITY_SCRAPERS_ROBOTSTXT_TTL": 60 * 60,
+        },
+    )
+    spider = crawler._create_spider()
+    crawler.stats.open_spider(spider)
+    downloaded = []
+
+    def download(request):
+        downloaded.append(request.url)
+        return defer.succeed(
+            TextResponse(request.url, status=status, body=ROBOTS, headers=headers or {})
+        )
+
+    crawler.engine = SimpleNamespace(download=download)
+    return CachedRobotsTxtMiddleware.from_crawler(crawler), spider, downloaded
+
+
+def allowed(middleware, spider, url):
+    result = middleware.process_request(Request(url), spider).result
+    if isinstance(result, Failure):
+        assert result.check(IgnoreRequest)
+        return False
+    return True
+
+
+def test_robots_cached_across_runs(tmp_path):
+    middleware, spider, downloaded = get_middleware(tmp_path)
+    assert allowed(middleware, spider, URL)
+    assert not allowed(middleware, spider, "https://www.hacla.org/admin/")
+    assert downloaded == [ROBOTS_URL]
+
+    middleware, spider, downloaded = get_middleware(tmp_path)
+    assert allowed(middleware, spider, URL)
+    assert not allowed(middleware, spider, "https://www.hacla.org/admin/")
+    assert downloaded == []
+    stats = middleware.crawler.stats
+    assert stats.get_value("robotstxt/cache_hit") == 1
+    assert stats.get_value("robotstxt/request_count") is None
+
+
+@pytest.mark.parametrize(
+    "status,headers",
+    [
+        (503, {}),
+        (200, {"Cache-Control": "no-store"}),
+        (200, {"Cache-Control": "max-age=60", "Age": "120"}),
+        (200, {"Expires": "0"}),
+    ],
+)
+def test_robots_not_cached(tmp_path, status, headers):
+    middleware, spider, downloaded = get_middleware(tmp_path, status, headers)
+    allowed(middleware, spider, URL)
+    middleware, spider, downloaded = get_middleware(tmp_path, status, headers)
+    allowed(middleware, spider, URL)
+    assert downloaded == [ROBOTS_URL]
+
+
+@pytest.mark.parametrize(
+    "headers,lifetime",
+    [
+        ({}, 3600),
+        ({"Cache-Control": "public, max-age=600"}, 600),
+        ({"Cache-Control": "max-age=600, s-maxage=300", "Age": "100"}, 200),
+        ({"Cache-Control": "max-age=86400"}, 3600),
+        (
+            {
+                "Date": "Mon, 14 Oct 2024 12:00:00 GMT",
+                "Expires": "Mon, 14 Oct 2024 12:30:00 GMT",
+            },
+            1800,
+        ),
+    ],
+)
+def test_lifetime(tmp_path, headers, lifetime):
+    middleware, _, _ = get_middleware(tmp_path)
+    response = TextResponse(ROBOTS_URL, body=ROBOTS, headers=headers)
+    assert middleware.get_lifetime(response) == lifetime
@@ -0,0 +1,107 @@
+import pytest
+from scrapy import Request, Spider
+from scrapy.http import Response
+from scrapy.utils.test import get_crawler
+from twisted.internet.defer import ensureDeferred
+
+from city_scrapers.middleware import SharedResponseMiddleware
+
+URL = "https://lacity.primegov.com/api/v2/PublicPortal/ListArchivedMeetings?year=2024"
+
+
+@pytest.fixture(autouse=True)
+def reset_responses():
+    yield
+    SharedResponseMiddleware._responses.clear()
+    SharedResponseMiddleware._waiters.clear()
+    SharedResponseMiddleware._open_crawlers.clear()
+
+
+def get_middleware(max_responses=50):
+    crawler = get_crawler(
+        Spider, settings_dict={"CITY_SCRAPERS_SHARED_RESPONSE_MAX": max_responses}
+    )
+    crawler.stats.open_spider(None)
+    return SharedResponseMiddleware.from_crawler(crawler), crawler.stats
+
+
+def start(middleware, url=URL, share=True):
+    request = Request(url, meta={"share_response": share})
+    return request, ensureDeferred(middleware.process_request(request, None))
+
+
+def test_shared_between_crawlers():
+    first, first_stats = get_middleware()
+    second, second_stats = get_middleware()
+    owner, owner_d = start(first)
+    waiter, waiter_d = start(second)
+    assert owner_d.result is None
+    assert not waiter_d.called
+
+    first.process_response(owner, Response(URL, body=b"[]"), None)
+    assert waiter_d.result.body == b"[]"
+    assert waiter_d.result.request is waiter
+
+    _, later_d = start(second)
+    assert later_d.result.body == b"[]"
+    assert first_stats.get_value("shared_response/miss") == 1
+    assert second_stats.get_value("shared_response/hit") == 2
+
+
+def test_failed_download_falls_through():
+    middleware, stats = get_middleware()
+    owner, _ = start(middleware)
+    _, waiter_d = start(middleware)
+    middleware.process_response(owner, Response(URL, status=503), None)
+    assert waiter_d.result is None
+    assert stats.get_value("shared_response/fallback") == 1
+
+    _, retry_d = start(middleware)
+    assert retry_d.result is None
+    assert stats.get_value("shared_response/miss") == 2
+
+
+def test_ignores_unshared():
+    middleware, stats = get_middleware()
+    _, first_d = start(middleware, share=False)
+    _, second_d = start(middleware, share=False)
+    assert first_d.result is None and second_d.result is None
+    assert stats.get_value("shared_response/miss") is None
+
+
+def test_least_recently_used_dropped():
+    middleware, stats = get_middleware(max_responses=2)
+    urls = [f"{URL[:-4]}{year}" for year in range(2022, 2025)]
+    for url in urls[:2]:
+        owner, _ = start(middleware, url)
+        middleware.process_response(owner, Response(url, body=b"[]"), None)
+    start(middleware, urls[0])
+    owner, _ = start(middleware, urls[2])
+    middleware.process_response(owner, Response(urls[2], body=b"[]"), None)
+
+    assert list(SharedResponseMiddleware._responses) == [
+        middleware._get_key(Request(url)) for url in [urls[0], urls[2]]
+    ]
+    _, evicted_d = start(middleware, urls[1])
+    assert evicted_d.result is None
+    assert stats.get_value("shared_response/miss") == 4
+
+
+def test_dropped_after_crawl():
+    first, _ = get_middleware()
+    second, second_stats = get_middleware()
+    first.spider_opened(None)
+    second.spider_opened(None)
+    owner, _ = start(first)
+    first.process_response(owner, Response(URL, body=b"[]"), None)
+
+    first.spider_closed(None)
+    _, hit_d = start(second)
+    assert hit_d.result.body == b"[]"
+    second.spider_closed(None)
+    assert not SharedResponseMiddleware._responses
+
+    later, later_stats = get_middleware()
+    _, later_d = start(later)
+    assert later_d.result is None
+    assert later_stats.get_value("shared_response/miss") == 1
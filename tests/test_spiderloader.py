@@ -0,0 +1,99 @@
+import sys
+
+import pytest
+from scrapy import Request
+from scrapy.settings import Settings
+from scrapy.spiderloader import SpiderLoader
+
+from city_scrapers.spiderloader import ManifestSpiderLoader, update_manifest
+
+SPIDER_SOURCE = """from city_scrapers_core.spiders import CityScrapersSpider
+
+
+class {classname}(CityScrapersSpider):
+    name = "{name}"
+    agency = "Test Agency"
+    timezone = "America/Los_Angeles"
+    allowed_domains = ["{name}.example.com"]
+"""
+
+
+@pytest.fixture
+def spider_package(tmp_path, monkeypatch):
+    """Package with two spiders, removed from sys.modules afterwards"""
+    package_dir = tmp_path / "manifest_spiders"
+    package_dir.mkdir()
+    (package_dir / "__init__.py").write_text("")
+    for name, classname in [("first", "FirstSpider"), ("second", "SecondSpider")]:
+        (package_dir / f"{name}.py").write_text(
+            SPIDER_SOURCE.format(name=name, classname=classname)
+        )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield package_dir
+    clear_modules()
+
+
+def clear_modules():
+    for module in list(sys.modules):
+        if module.startswith("manifest_spiders"):
+            del sys.modules[module]
+
+
+def get_loader():
+    return ManifestSpiderLoader(
+        Settings({"SPIDER_MODULES": ["city_scrapers.spiders", "manifest_spiders"]})
+    )
+
+
+def test_manifest_up_to_date():
+    assert not update_manifest("city_scrapers.spiders", check=True)
+
+
+def test_matches_spider_loader():
+    settings = Settings({"SPIDER_MODULES": ["city_scrapers.spiders"]})
+    loader = ManifestSpiderLoader(settings)
+    spider_loader = SpiderLoader(settings)
+    assert sorted(loader.list()) == sorted(spider_loader.list())
+    for name in spider_loader.list():
+        assert loader.load(name) is spider_loader.load(name)
+
+
+def test_domains_from_start_requests():
+    loader = ManifestSpiderLoader(
+        Settings({"SPIDER_MODULES": ["city_scrapers.spiders"]})
+    )
+    assert loader.find_by_request(Request("https://www.hacla.org/en/bocfiles")) == [
+        "losca_Housing_Authority"
+    ]
+    assert loader.find_by_request(
+        Request("https://lacity.primegov.com/api/v2/PublicPortal/ListUpcomingMeetings")
+    ) == ["losca_City_Council", "losca_Health_Commission"]
+
+
+def test_imports_loaded_spider(spider_package):
+    assert update_manifest("manifest_spiders")
+    clear_modules()
+    loader = get_loader()
+    assert {"first", "second"} <= set(loader.list())
+    assert "manifest_spiders.first" not in sys.modules
+    assert loader.load("first").name == "first"
+    assert "manifest_spiders.first" in sys.modules
+    assert "manifest_spiders.second" not in sys.modules
+    assert loader.find_by_request(Request("https://second.example.com/")) == ["second"]
+    with pytest.raises(KeyError):
+        loader.load("third")
+
+
+def test_stale_manifest(spider_package):
+    update_manifest("manifest_spiders")
+    clear_modules()
+    (spider_package / "second.py").unlink()
+    with pytest.raises(KeyError, match="out of date"):
+        get_loader().load("second")
+    assert update_manifest("manifest_spiders", check=True)
+
+
+def test_missing_manifest(spider_package):
+    with pytest.warns(RuntimeWarning, match="No spider manifest"):
+        loader = get_loader()
+    assert loader.load("second").name == "second"
@@ -0,0 +1,116 @@
+from os.path import dirname, join
+
+import pytest
+from city_scrapers_core.utils import file_response
+from freezegun import freeze_time
+from scrapy import Request
+from scrapy.exceptions import NotConfigured
+from scrapy.utils.test import get_crawler
+
+from city_scrapers.extensions import TimingStatsExtension, timing
+from city_scrapers.spiders.losca_City_Council import LoscaCityCouncilSpider
+
+fixture_response = file_response(
+    join(dirname(__file__), "files", "losca_City_Council.json"),
+    url="https://lacity.primegov.com/api/v2/PublicPortal/ListUpcomingMeetings",
+)
+
+
+@pytest.fixture
+def crawler():
+    crawler = get_crawler(
+        LoscaCityCouncilSpider, settings_dict={"CITY_SCRAPERS_TIMING_ENABLED": True}
+    )
+    crawler.spider = crawler._create_spider()
+    crawler.stats.open_spider(crawler.spider)
+    return crawler
+
+
+def test_disabled():
+    crawler = get_crawler(LoscaCityCouncilSpider)
+    with pytest.raises(NotConfigured):
+        TimingStatsExtension.from_crawler(crawler)
+
+
+@freeze_time("2024-09-30", tick=True)
+def test_spider_timing(crawler):
+    spider = crawler.spider
+    ext = TimingStatsExtension.from_crawler(crawler)
+    items = list(spider.parse(fixture_response))
+    assert len(items) == 13
+    ext.spider_closed(spider)
+
+    stats = crawler.stats.get_stats()
+    assert stats["timing/spider/parse/count"] == 1
+    assert stats["timing/spider/parse_primegov_meetings/count"] == 1
+    assert stats["timing/spider/_parse_links/count"] == 13
+    assert stats["timing/dates/date_parser/count"] == 13
+    assert (
+        stats["timing/spider/_parse_links/p50_ms"]
+        <= stats["timing/spider/_parse_links/p95_ms"]
+        <= stats["timing/spider/_parse_links/max_ms"]
+    )
+
+
+class FakeCounter:
+    """Stand-in for perf_counter advanced by the code being timed"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_generator_timing(crawler, monkeypatch):
+    counter = FakeCounter()
+    monkeypatch.setattr(timing, "perf_counter", counter)
+    ext = TimingStatsExtension(crawler, crawler.stats)
+
+    def run(seconds):
+        counter.now += seconds
+        return seconds
+
+    def generator_function():
+        yield run(1)
+        yield run(2)
+
+    def decorated():
+        # Not a generator function, but returns a generator like callbacks decorated
+        # with in_process_pool
+        run(0.5)
+        return (run(seconds) for seconds in [1, 2])
+
+    for name, func in [("gen", generator_function), ("decorated", decorated)]:
+        for _ in ext.timed(func, name)():
+            # Time suspended at a yield isn't counted
+            counter.now += 10
+    assert ext.samples == {"gen": [3], "decorated": [3.5]}
+
+
+def test_request_timing(crawler):
+    ext = TimingStatsExtension.from_crawler(crawler)
+    request = Request(fixture_response.url)
+    ext.request_reached_downloader(request, crawler.spider)
+    request.meta["download_latency"] = 0.5
+    ext.response_downloaded(fixture_response, request, crawler.spider)
+    ext.spider_closed(crawler.spider)
+
+    stats = crawler.stats.get_stats()
+    assert stats["timing/download/count"] == 1
+    assert stats["timing/download/max_ms"] == 500
+    assert stats["timing/download_wait/count"] == 1
+
+
+def test_percentile(crawler):
+    ext = TimingStatsExtension.from_crawler(crawler)
+    for value in range(1, 101):
+        ext.record("test", value / 1000)
+    ext.spider_closed(crawler.spider)
+
+    stats = crawler.stats.get_stats()
+    assert stats["timing/test/count"] == 100
+    assert stats["timing/test/p50_ms"] == 50
+    assert stats["timing/test/p95_ms"] == 95
+    assert stats["timing/test/max_ms"] == 100
+    assert stats["timing/test/total_ms"] == 5050
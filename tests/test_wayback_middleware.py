@@ -0,0 +1,142 @@
+from datetime import datetime
+
+import pytest
+from city_scrapers_core.items import Meeting
+from scrapy.http import Request, TextResponse
+from scrapy.utils.test import get_crawler
+from twisted.internet import defer, task
+
+from city_scrapers.middleware import CityScrapersWaybackMiddleware
+from city_scrapers.middleware.wayback import WaybackArchiver
+from city_scrapers.spiders.losca_City_Council import LoscaCityCouncilSpider
+
+URL = "https://lacity.primegov.com/api/v2/PublicPortal/ListUpcomingMeetings"
+
+
+class StubArchiver(WaybackArchiver):
+    """Archiver recording submissions instead of sending them"""
+
+    def __init__(self, *args, statuses=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.submitted = []
+        self.statuses = statuses or []
+
+    def submit(self, url):
+        self.submitted.append((url, self.clock.seconds()))
+        status = self.statuses.pop(0) if self.statuses else 200
+        if isinstance(status, Exception):
+            return defer.fail(status)
+        return defer.succeed(status)
+
+
+def get_archiver(tmp_path, clock, **kwargs):
+    kwargs = {"delay": 5, "batch_size": 2, **kwargs}
+    return StubArchiver(
+        str(tmp_path / "wayback.db"), "http://localhost/{url}", clock=clock, **kwargs
+    )
+
+
+@pytest.fixture
+def clock():
+    return task.Clock()
+
+
+def test_batches_and_rate_limit(tmp_path, clock):
+    archiver = get_archiver(tmp_path, clock)
+    assert archiver.add(["https://a.com"]) == 1
+    assert archiver.submitted == []
+    assert archiver.add(["https://a.com", "https://b.com"]) == 1
+    clock.advance(0)
+    assert archiver.submitted == [("https://a.com", 0)]
+    clock.advance(5)
+    assert archiver.submitted == [("https://a.com", 0), ("https://b.com", 5)]
+    assert archiver.in_flight == {}
+
+
+def test_dedupe_across_runs(tmp_path, clock):
+    archiver = get_archiver(tmp_path, clock)
+    archiver.add(["https://a.com", "https://b.com"])
+    clock.advance(5)
+    # The next run only queues URLs that weren't archived
+    archiver = get_archiver(tmp_path, clock)
+    assert archiver.add(["https://a.com", "https://c.com"]) == 1
+    # Expired URLs are queued again
+    archiver = get_archiver(tmp_path, clock, ttl=-1)
+    assert archiver.add(["https://a.com"]) == 1
+
+
+def test_pending_resumed(tmp_path, clock):
+    archiver = get_archiver(tmp_path, clock, statuses=[500])
+    archiver.add(["https://a.com", "https://b.com"])
+    clock.advance(5)
+    # Failed and unsubmitted URLs stay pending for the next run
+    archiver = get_archiver(tmp_path, clock)
+    assert archiver.batch == ["https://a.com"]
+    assert archiver.add(["https://a.com"]) == 0
+
+
+def test_client_errors_dropped(tmp_path, clock):
+    archiver = get_archiver(tmp_path, clock, statuses=[404], batch_size=1)
+    archiver.add(["https://a.com"])
+    clock.advance(0)
+    archiver = get_archiver(tmp_path, clock)
+    assert archiver.batch == []
+
+
+def test_failed_attempts_capped(tmp_path, clock):
+    statuses = [503, ConnectionError("refused"), 500]
+    for attempt, status in enumerate(statuses):
+        archiver = get_archiver(tmp_path, clock, statuses=[status])
+        if attempt == 0:
+            archiver.add(["https://a.com"])
+        # Resumed from the previous run until the last attempt fails
+        assert archiver.batch == ["https://a.com"]
+        archiver.drain(30)
+        clock.advance(0)
+        assert [url for url, _ in archiver.submitted] == ["https://a.com"]
+    archiver = get_archiver(tmp_path, clock)
+    assert archiver.batch == []
+
+
+def test_rate_limited(tmp_path, clock):
+    archiver = get_archiver(tmp_path, clock, statuses=[429], batch_size=1)
+    archiver.add(["https://a.com"])
+    clock.advance(0)
+    clock.advance(archiver.rate_limit_backoff)
+    assert archiver.submitted == [
+        ("https://a.com", 0),
+        ("https://a.com", archiver.rate_limit_backoff),
+    ]
+
+
+def test_drain_timeout(tmp_path, clock):
+    archiver = get_archiver(tmp_path, clock, delay=60)
+    archiver.add(["https://a.com"])
+    archiver.add(["https://b.com", "https://c.com"])
+    drained = archiver.drain(30)
+    clock.advance(0)
+    assert not drained.called
+    clock.advance(30)
+    assert drained.called
+    assert [url for url, _ in archiver.submitted] == ["https://a.com"]
+
+
+def test_middleware(tmp_path, clock):
+    crawler = get_crawler(LoscaCityCouncilSpider)
+    spider = crawler._create_spider()
+    crawler.stats.open_spider(spider)
+    archiver = get_archiver(tmp_path, clock, batch_size=10)
+    mw = CityScrapersWaybackMiddleware(archiver, crawler.stats, 30)
+    meeting = Meeting(
+        source=URL,
+        start=datetime(2024, 1, 1),
+        links=[{"href": "https://a.com"}, {"href": "https://web.archive.org/a"}],
+    )
+    response = TextResponse(URL, body=b"[]", request=Request(URL))
+    assert list(mw.process_spider_output(response, [meeting, meeting], spider)) == [
+        meeting,
+        meeting,
+    ]
+    assert archiver.batch == [URL, "https://a.com"]
+    assert crawler.stats.get_value("wayback/queued") == 2
+    assert crawler.stats.get_value("wayback/skipped") == 3